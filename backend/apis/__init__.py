@@ -1,7 +1,12 @@
 # apis/__init__.py
 
+from apis.admin_api import router as admin_router
 from apis.call_api import router as call_router
+from apis.export_api import router as export_router
+from apis.job_api import router as job_router
+from apis.search_api import router as search_router
 from apis.transcript_api import router as transcript_router
+from apis.usage_api import router as usage_router
 from config import loaded_config, ENVIRONMENT
 from fastapi import FastAPI
 
@@ -23,6 +28,41 @@ def register_routes(app: FastAPI):
         tags=["Calls"]
     )
 
+    # Include Search API endpoints
+    app.include_router(
+        search_router,
+        prefix=config.API_PREFIX + "/apis/search",
+        tags=["Search"]
+    )
+
+    # Include Processing Job API endpoints
+    app.include_router(
+        job_router,
+        prefix=config.API_PREFIX + "/apis/jobs",
+        tags=["Jobs"]
+    )
+
+    # Include Bulk Export API endpoints
+    app.include_router(
+        export_router,
+        prefix=config.API_PREFIX + "/apis/exports",
+        tags=["Exports"]
+    )
+
+    # Include LLM Usage (cost accounting) API endpoints
+    app.include_router(
+        usage_router,
+        prefix=config.API_PREFIX + "/apis/usage",
+        tags=["Usage"]
+    )
+
+    # Include Admin (read-only runtime settings) API endpoints
+    app.include_router(
+        admin_router,
+        prefix=config.API_PREFIX + "/apis/admin",
+        tags=["Admin"]
+    )
+
     @app.get("/health")
     def health_check():
         if ENVIRONMENT not in ["production", "staging", "development"]:
@@ -0,0 +1,13 @@
+# apis/admin_api.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from services import profile_service
+
+router = APIRouter()
+
+
+@router.get("/performance_profile")
+def get_performance_profile():
+    """Pool sizes, LLM limits, timeouts, batch and cache sizes in effect for this process (read-only)."""
+    return JSONResponse(content=profile_service.get_profile())
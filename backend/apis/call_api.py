@@ -1,87 +1,137 @@
 # apis/call_api.py
 
-from typing import List
-
-from database import get_db
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
-from models.entities.call import Call
-from services import call_service
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from config import loaded_config
+from constants.constants import MAX_TRANSCRIPTS_PER_CALL
+from database import get_db, get_read_db
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response
+from models.enums import CallStatus, JobClass
+from services import call_service, call_view_service, retry_service, similarity_service, summary_service
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 
+config = loaded_config
+
 
 @router.post("/upload_call")
 async def upload_call(
-        background_tasks: BackgroundTasks,
+        files: List[UploadFile] = File(...),
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+        job_class: JobClass = JobClass.INTERACTIVE,
+        db: Session = Depends(get_db)
+):
+    if len(files) > MAX_TRANSCRIPTS_PER_CALL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A call can have a maximum of {MAX_TRANSCRIPTS_PER_CALL} transcripts."
+        )
+
+    pipelined = config.PIPELINED_UPLOADS and config.PROCESSING_MODE != "worker"
+    if pipelined:
+        call_id, created = await call_service.create_call_pipelined(db, files, idempotency_key, job_class)
+    else:
+        call_id, created = await call_service.create_call_idempotent(db, files, idempotency_key)
+
+    if not created:
+        return JSONResponse(content={
+            "call_id": str(call_id),
+            "message": "Call already uploaded. Returning the existing call."
+        })
+
+    if not pipelined:
+        call_service.schedule_process_call(call_id, job_class)
+
+    return JSONResponse(content={
+        "call_id": str(call_id),
+        "message": "Call uploaded successfully. Processing in background."
+    })
+
+
+@router.post("/add_transcripts/{call_id}")
+async def add_transcripts(
+        call_id: str,
         files: List[UploadFile] = File(...),
         db: Session = Depends(get_db)
 ):
-    if len(files) > 4:
-        raise HTTPException(status_code=400, detail="A call can have a maximum of 4 transcripts.")
+    try:
+        call_uuid = UUID(call_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid call ID")
 
-    call = await call_service.create_call(db, files)
+    call = await call_service.add_transcripts(db, call_uuid, files)
 
-    background_tasks.add_task(call_service.setup_and_initiate_process_call, call.id)
+    call_service.schedule_process_call(call.id, JobClass.INTERACTIVE)
 
     return JSONResponse(content={
         "call_id": str(call.id),
-        "message": "Call uploaded successfully. Processing in background."
+        "transcript_count": len(call.transcripts),
+        "message": "Transcripts added successfully. Processing in background."
     })
 
 
 @router.get("/summaries")
-def get_summaries(db: Session = Depends(get_db)):
-    calls = db.query(Call).all()
-    # print(f"Found {len(calls)} calls in the database")
+def get_summaries(db: Session = Depends(get_read_db)):
+    # Pre-serialized per-call fragments, returned as-is without re-encoding
+    return Response(content=summary_service.get_summaries_json(db), media_type="application/json")
+
+
+@router.get("/list")
+def get_call_list(
+        limit: int = Query(50, ge=1, le=500),
+        status: Optional[CallStatus] = None,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
+        db: Session = Depends(get_read_db)
+):
+    """
+    Compact call list from the call_summary_view read model, newest first. Pass the
+    returned `next_before` and `next_before_id` as `before` and `before_id` for the next page.
+    """
+    return JSONResponse(content=call_view_service.get_call_list(db, limit, status, before, before_id))
+
 
-    summaries = []
-    for call in calls:
+@router.post("/reprocess_failed")
+async def reprocess_failed(
+        call_id: Optional[str] = None,
+        db: Session = Depends(get_db)
+):
+    """Re-run extraction for failed transcripts, of one call or of every call."""
+    call_uuid = None
+    if call_id:
         try:
-            transcripts_list = []
-            for transcript in call.transcripts:
-                insight_data = None
-                if transcript.insight:
-                    insight_data = {
-                        "payment_status": transcript.insight.payment_status.value,
-                        "payment_amount": str(transcript.insight.payment_amount),
-                        "payment_currency": transcript.insight.payment_currency.value,
-                        "payment_date": transcript.insight.payment_date.isoformat() if transcript.insight.payment_date else None,
-                        "payment_method": transcript.insight.payment_method.value,
-                        "comments": transcript.insight.comments,
-
-                        "ai_summary": transcript.insight.ai_summary,
-                        "user_summary": transcript.insight.user_summary,
-                        "refined_summary": transcript.insight.refined_summary,
-
-                        "llm_refinement_count": transcript.insight.llm_refinement_count,
-                        "llm_refinement_required": transcript.insight.llm_refinement_required
-                    }
-
-                transcripts_list.append({
-                    "transcript_id": str(transcript.id),
-                    "file_name": transcript.file_name,
-                    "file_content": transcript.file_content,
-                    "uploaded_at": transcript.uploaded_at.isoformat(),
-                    "processed_at": transcript.processed_at.isoformat() if transcript.processed_at else None,
-                    "insight": insight_data
-                })
-
-            summary_data = {
-                "call_id": str(call.id),
-                "call_status": call.call_status.value,
-                "raw_summary": call.raw_summary,
-                "ai_summary": call.ai_summary,
-                "ai_summary_updated_at": call.ai_summary_updated_at.isoformat() if call.ai_summary_updated_at else None,
-                "llm_refinement_required": call.llm_refinement_required,
-                "llm_refinement_count": call.llm_refinement_count,
-                "created_at": call.created_at.isoformat() if call.created_at else None,
-                "updated_at": call.updated_at.isoformat() if call.updated_at else None,
-                "transcripts": transcripts_list
-            }
-            summaries.append(summary_data)
-        except Exception as e:
-            print(f"Error processing call {call.id}: {str(e)}")
-
-    return JSONResponse(content={"summaries": summaries})
+            call_uuid = UUID(call_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid call ID")
+
+    result = retry_service.reprocess_failed(db, call_uuid)
+    return JSONResponse(content={
+        **result,
+        "message": "Failed transcripts scheduled for reprocessing."
+    })
+
+
+@router.get("/similar/{call_id}")
+def get_similar_calls(
+        call_id: str,
+        limit: int = 10,
+        db: Session = Depends(get_read_db)
+):
+    try:
+        call_uuid = UUID(call_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid call ID")
+
+    if not call_service.get_call(db, call_uuid):
+        raise HTTPException(status_code=404, detail="Call not found")
+
+    similar_calls = similarity_service.find_similar_calls(db, call_uuid, min(max(limit, 1), 50))
+
+    return JSONResponse(content={
+        "call_id": call_id,
+        "similar_calls": similar_calls
+    })
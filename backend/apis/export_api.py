@@ -0,0 +1,53 @@
+# apis/export_api.py
+
+import os
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from services import export_service
+from starlette.background import BackgroundTask
+
+router = APIRouter()
+
+
+@router.get("/insights")
+def export_insights(
+        format: str = Query("csv"),
+        since: Optional[datetime] = None
+):
+    """
+    Export one row per transcript with its call and insight fields. Pass the
+    X-Export-Watermark header of the previous export as `since` for an incremental export.
+    """
+    if format not in export_service.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+
+    watermark = export_service.start_export()
+    headers = {"X-Export-Watermark": watermark.isoformat()}
+
+    if format == "csv":
+        headers["Content-Disposition"] = "attachment; filename=insights.csv"
+        return StreamingResponse(export_service.stream_csv(since), media_type="text/csv", headers=headers)
+
+    # Parquet writes its footer last, so it is built in a temporary file and then streamed
+    handle, path = tempfile.mkstemp(suffix=".parquet")
+    try:
+        with os.fdopen(handle, "wb") as sink:
+            export_service.write_parquet(sink, since)
+    except ValueError as e:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        os.remove(path)
+        raise
+
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename="insights.parquet",
+        headers=headers,
+        background=BackgroundTask(os.remove, path)
+    )
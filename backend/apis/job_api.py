@@ -0,0 +1,32 @@
+# apis/job_api.py
+
+from clients import llm_client
+from database import get_read_db
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from services import admission_service, scheduler_service
+from sqlalchemy.orm import Session
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def get_job_stats():
+    return JSONResponse(content=scheduler_service.get_stats())
+
+
+@router.get("/worker_stats")
+def get_worker_stats(db: Session = Depends(get_read_db)):
+    return JSONResponse(content=scheduler_service.get_worker_stats(db))
+
+
+@router.get("/llm_health")
+def get_llm_health():
+    """Circuit breaker state and recent p95 latency per LLM method for this process."""
+    return JSONResponse(content=llm_client.get_health())
+
+
+@router.get("/admission")
+def get_admission_stats():
+    """Pending work against the upload admission limit, and uploads rejected by this process."""
+    return JSONResponse(content=admission_service.get_stats())
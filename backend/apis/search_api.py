@@ -0,0 +1,34 @@
+# apis/search_api.py
+
+from database import get_db, get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from services import search_service
+from sqlalchemy.orm import Session
+
+router = APIRouter()
+
+
+@router.get("/")
+def search(
+        q: str = Query(..., min_length=1),
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=search_service.MAX_PAGE_SIZE),
+        db: Session = Depends(get_read_db)
+):
+    try:
+        results = search_service.search(db, q, page, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return JSONResponse(content=results)
+
+
+@router.post("/rebuild_index")
+def rebuild_index(db: Session = Depends(get_db)):
+    count = search_service.rebuild_index(db)
+
+    return JSONResponse(content={
+        "message": "Search index rebuilt successfully.",
+        "indexed_transcripts": count
+    })
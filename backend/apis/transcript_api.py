@@ -1,12 +1,18 @@
 # apis/transcript_api.py
 
+import math
+from typing import List, Optional
 from uuid import UUID
 
 import services.transcript_service as transcript_service
+from clients.resilience import CircuitOpenError
 from database import get_db
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from fastapi.responses import JSONResponse
 from models.entities.insight import Insight
+from models.enums import JobClass, SpeakerRole
+from services import call_service, insight_service
+from services.insight_service import ConflictError
 from sqlalchemy.orm import Session
 
 router = APIRouter()
@@ -22,12 +28,24 @@ def update_user_summary(
     if not user_summary:
         raise HTTPException(status_code=400, detail="User summary is required")
 
+    # Optional: the insight version the client edited, to reject edits based on stale data
+    expected_version = request.get("version")
+    if expected_version is not None:
+        try:
+            if isinstance(expected_version, bool):
+                raise ValueError
+            expected_version = int(expected_version)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Version must be an integer")
+
     try:
         insight = db.query(Insight).filter(Insight.transcript_id == UUID(transcript_id)).first()
         if not insight:
             raise HTTPException(status_code=404, detail="No insight found for this transcript")
 
-        insight = transcript_service.update_user_summary(db, str(insight.id), user_summary)
+        insight = transcript_service.update_user_summary(db, str(insight.id), user_summary, expected_version)
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -36,7 +54,8 @@ def update_user_summary(
         "transcript_id": str(insight.transcript_id),
         "insight_id": str(insight.id),
         "user_summary": insight.user_summary,
-        "user_summary_updated_at": insight.user_summary_updated_at.isoformat()
+        "user_summary_updated_at": insight.user_summary_updated_at.isoformat(),
+        "version": insight.version
     })
 
 
@@ -51,6 +70,10 @@ async def generate_refined_summary(
             raise HTTPException(status_code=404, detail="No insight found for this transcript!")
 
         insight = await transcript_service.generate_refined_summary(db, str(insight.id))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -61,5 +84,73 @@ async def generate_refined_summary(
         "refined_summary": insight.refined_summary,
         "refined_summary_updated_at": insight.refined_summary_updated_at.isoformat(),
         "llm_refinement_count": insight.llm_refinement_count,
-        "llm_refinement_required": insight.llm_refinement_required
+        "llm_refinement_required": insight.llm_refinement_required,
+        "version": insight.version
+    })
+
+
+@router.put("/replace_transcript/{transcript_id}")
+async def replace_transcript(
+        transcript_id: str,
+        file: UploadFile = File(...),
+        db: Session = Depends(get_db)
+):
+    try:
+        transcript_uuid = UUID(transcript_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid transcript ID")
+
+    transcript = await transcript_service.replace_transcript(db, transcript_uuid, file)
+
+    call_service.schedule_process_call(transcript.call_id, JobClass.INTERACTIVE)
+
+    return JSONResponse(content={
+        "message": "Transcript replaced successfully. Processing in background.",
+        "transcript_id": str(transcript.id),
+        "call_id": str(transcript.call_id)
+    })
+
+
+@router.get("/turns/{transcript_id}")
+def get_turns(
+        transcript_id: str,
+        start: int = Query(0, ge=0),
+        end: Optional[int] = Query(None, ge=0),
+        role: Optional[List[SpeakerRole]] = Query(None),
+        db: Session = Depends(get_db)
+):
+    try:
+        transcript_uuid = UUID(transcript_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid transcript ID")
+
+    turns = transcript_service.get_turns(db, transcript_uuid, start, end, role)
+
+    return JSONResponse(content={
+        "transcript_id": transcript_id,
+        "turns": turns
+    })
+
+
+@router.get("/summary_history/{transcript_id}")
+def get_summary_history(
+        transcript_id: str,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db)
+):
+    try:
+        transcript_uuid = UUID(transcript_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid transcript ID")
+
+    insight = db.query(Insight).filter(Insight.transcript_id == transcript_uuid).first()
+    if not insight:
+        raise HTTPException(status_code=404, detail="Insight not found")
+
+    history = insight_service.get_summary_history(db, insight.id, page, page_size)
+
+    return JSONResponse(content={
+        "transcript_id": transcript_id,
+        **history
     })
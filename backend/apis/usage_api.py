@@ -0,0 +1,40 @@
+# apis/usage_api.py
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from database import get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from services import usage_service
+from sqlalchemy.orm import Session
+
+router = APIRouter()
+
+
+@router.get("/daily")
+def get_daily_usage(
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        db: Session = Depends(get_read_db)
+):
+    return JSONResponse(content={"daily": usage_service.get_daily_usage(db, start, end)})
+
+
+@router.get("/calls")
+def get_top_calls(
+        limit: int = Query(20, ge=1, le=500),
+        db: Session = Depends(get_read_db)
+):
+    return JSONResponse(content={"calls": usage_service.get_top_calls(db, limit)})
+
+
+@router.get("/calls/{call_id}")
+def get_call_usage(call_id: str, db: Session = Depends(get_read_db)):
+    try:
+        call_uuid = UUID(call_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid call ID")
+
+    return JSONResponse(content=usage_service.get_call_usage(db, call_uuid))
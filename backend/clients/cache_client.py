@@ -0,0 +1,43 @@
+# cache_client.py
+
+from typing import Dict, List, Optional
+
+from config import loaded_config
+
+config = loaded_config
+
+
+# --- Cache Client Classes ---
+class RedisCache:
+    """Shared cache tier for serialized responses, so API processes reuse each other's work."""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        try:
+            import redis
+        except ImportError as e:
+            raise Exception("SUMMARY_CACHE_URL requires the 'redis' package") from e
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.ttl_seconds = ttl_seconds
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        values = self.client.mget(keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, items: Dict[str, bytes]):
+        if not items:
+            return
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipeline.set(key, value, ex=self.ttl_seconds)
+        pipeline.execute()
+
+
+# --- Cache Initialization Function ---
+def init_cache() -> Optional[RedisCache]:
+    """The shared cache tier, or None when SUMMARY_CACHE_URL is not configured."""
+    if not config.SUMMARY_CACHE_URL:
+        return None
+    return RedisCache(config.SUMMARY_CACHE_URL, config.SUMMARY_CACHE_TTL_SECONDS)
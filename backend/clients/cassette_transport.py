@@ -0,0 +1,149 @@
+# clients/cassette_transport.py
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MODES = ["off", "record", "replay", "replay_or_record"]
+
+
+class CassetteStore:
+    """
+    Recorded request/response pairs on disk, one gzipped JSON file per request:
+    <directory>/<key[:2]>/<key>.json.gz, keyed by a hash of the method, path and body.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        body = request.content or b""
+        try:
+            # Canonical JSON, so field order does not change the key
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+        digest = hashlib.sha256(f"{request.method} {request.url.path}\n".encode("utf-8") + body)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as cassette:
+                return json.load(cassette)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, entry: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a temp file and renamed, so concurrent readers never see a partial file
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as temp_file, gzip.GzipFile(fileobj=temp_file, mode="wb") as cassette:
+            cassette.write(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        os.replace(temp_path, path)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """
+    httpx transport for the OpenAI client that records real responses to a CassetteStore
+    and/or replays them without network access.
+
+    - record: send every request and store its response
+    - replay: answer only from the store, with simulated latency; a request that was never
+      recorded gets a 400 response, so it fails like any other rejected request
+    - replay_or_record: replay when recorded, otherwise send and record (a warm cache)
+    """
+
+    def __init__(self, store: CassetteStore, mode: str, latency_scale: float = 1.0,
+                 latency_seconds: float = 0.0, wrapped: Optional[httpx.BaseTransport] = None):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.store = store
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.latency_seconds = latency_seconds
+        self.wrapped = wrapped or httpx.HTTPTransport()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts = {"replayed": 0, "recorded": 0, "missed": 0}
+
+    def last_replayed_latency_ms(self) -> Optional[int]:
+        """
+        The recorded latency of the last request sent from this thread if it was answered
+        from the store, else None.
+        """
+        return getattr(self._local, "replayed_latency_ms", None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"mode": self.mode, "directory": self.store.directory, **self._counts}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._local.replayed_latency_ms = None
+        request.read()
+        key = self.store.key(request)
+
+        if self.mode in ("replay", "replay_or_record"):
+            entry = self.store.load(key)
+            if entry is not None:
+                delay = entry["latency_ms"] / 1000 * self.latency_scale + self.latency_seconds
+                if delay > 0:
+                    time.sleep(delay)
+                self._local.replayed_latency_ms = entry["latency_ms"]
+                self._count("replayed")
+                return httpx.Response(
+                    entry["status_code"],
+                    headers={"content-type": entry["content_type"]},
+                    content=entry["body"].encode("utf-8"),
+                    request=request,
+                )
+
+            if self.mode == "replay":
+                self._count("missed")
+                logger.warning(f"No cassette recording for {request.method} {request.url.path} ({key[:12]})")
+                return httpx.Response(
+                    400,
+                    json={"error": {"message": "No cassette recording for this request", "type": "cassette_miss"}},
+                    request=request,
+                )
+
+        started_at = time.monotonic()
+        response = self.wrapped.handle_request(request)
+        response.read()
+        latency_ms = int((time.monotonic() - started_at) * 1000)
+
+        # Only successful responses are worth replaying; errors are sent again next time
+        if response.status_code < 400:
+            self.store.save(key, {
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "content_type": response.headers.get("content-type", "application/json"),
+                "body": response.text,
+                "latency_ms": latency_ms,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            })
+            self._count("recorded")
+        return response
+
+    def close(self):
+        self.wrapped.close()
@@ -0,0 +1,110 @@
+# embedding_client.py
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+from config import loaded_config
+
+config = loaded_config
+
+
+# --- Embedder Classes ---
+class OpenAIEmbedder:
+    """Embeds text with the OpenAI embeddings API, one request per batch."""
+
+    def __init__(self):
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=config.LLM_API_KEY)
+        self.model = config.EMBEDDING_MODEL
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class LocalEmbedder:
+    """
+    Embeds text with a local sentence-transformers model (CPU is fine).
+    The model is loaded once per process.
+    """
+
+    def __init__(self):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise Exception("EMBEDDER=local requires the 'sentence-transformers' package") from e
+
+        model_name = config.EMBEDDING_MODEL
+        if model_name.startswith("text-embedding-"):
+            # The default points at an OpenAI model, swap to a small local one
+            model_name = "all-MiniLM-L6-v2"
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=len(texts), show_progress_bar=False), dtype=np.float32)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder using the hashing trick over word unigrams and bigrams.
+    Lower quality than a trained model, but deterministic and fully offline.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = re.findall(r"\w+", (text or "").lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                sign = 1.0 if digest[4] & 1 else -1.0
+                vectors[row, bucket] += sign
+        return vectors
+
+
+# --- Embedder Initialization Function ---
+def init_embedder():
+    """
+    Initializes the embedder based on the configuration.
+    Returns an object with one method:
+      - embed(texts: List[str]) -> np.ndarray of shape (len(texts), dimensions)
+    """
+    if config.EMBEDDER == "openai":
+        return OpenAIEmbedder()
+    elif config.EMBEDDER == "local":
+        return LocalEmbedder()
+    elif config.EMBEDDER == "hashing":
+        return HashingEmbedder()
+    else:
+        raise Exception("Unsupported embedder: " + config.EMBEDDER)
+
+
+# Created lazily so importing this module never loads a model or opens a client
+_embedder = None
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Embed texts in batches of EMBEDDING_BATCH_SIZE and return L2-normalised vectors."""
+    global _embedder
+    if _embedder is None:
+        _embedder = init_embedder()
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    batch_size = max(config.EMBEDDING_BATCH_SIZE, 1)
+    vectors = np.vstack([
+        _embedder.embed(texts[start:start + batch_size])
+        for start in range(0, len(texts), batch_size)
+    ])
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -1,19 +1,156 @@
 # llm_client.py
 
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
 
+from clients import usage_recorder
+from clients.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, call_with_hedge
 from config import loaded_config
-from openai import OpenAI
+from models.enums import ExtractionOutcome
+
+try:
+    import httpx
+    import openai
+    from clients.cassette_transport import CassetteStore, CassetteTransport
+    from openai import OpenAI
+except ImportError:  # Optional: not needed with the offline provider (LLM=local)
+    openai = None
 
 config = loaded_config
 
 
+class ExtractionResult(NamedTuple):
+    """Outcome of a transcript extraction; `data` is only set on success."""
+    outcome: ExtractionOutcome
+    data: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class CallExtractionResult(NamedTuple):
+    """
+    Outcome of extracting every transcript of a call in one request: one ExtractionResult
+    per transcript, in input order, plus the call-level summary.
+    """
+    extractions: List[ExtractionResult]
+    call_summary: Optional[str] = None
+
+
 # --- LLM Client Class ---
 class OpenAIClient:
+    # Errors that say the provider is unhealthy, as opposed to a problem with our request
+    PROVIDER_ERRORS = (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+                       openai.InternalServerError) if openai else ()
+
     def __init__(self):
-        self.client = OpenAI(api_key=config.LLM_API_KEY)
+        # Record/replay requests to an on-disk cassette store instead of (or on top of) the network
+        self.cassette = None
+        http_client = None
+        if config.LLM_CASSETTE_MODE != "off":
+            self.cassette = CassetteTransport(
+                CassetteStore(config.LLM_CASSETTE_DIR),
+                config.LLM_CASSETTE_MODE,
+                latency_scale=config.LLM_CASSETTE_LATENCY_SCALE,
+                latency_seconds=config.LLM_CASSETTE_LATENCY_SECONDS,
+            )
+            http_client = httpx.Client(transport=self.cassette)
+
+        # Pure replays never reach the provider, so they run without an API key
+        api_key = config.LLM_API_KEY or ("replay-only" if config.LLM_CASSETTE_MODE == "replay" else None)
+        self.client = OpenAI(api_key=api_key, max_retries=config.LLM_MAX_RETRIES, http_client=http_client)
+        self.breaker = CircuitBreaker(
+            window_seconds=config.LLM_CIRCUIT_WINDOW_SECONDS,
+            min_requests=config.LLM_CIRCUIT_MIN_REQUESTS,
+            failure_rate_threshold=config.LLM_CIRCUIT_FAILURE_RATE,
+            open_seconds=config.LLM_CIRCUIT_OPEN_SECONDS,
+        )
+        self.latencies = LatencyTracker()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=config.LLM_HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+        self._slots = threading.BoundedSemaphore(config.LLM_MAX_CONCURRENCY) if config.LLM_MAX_CONCURRENCY else None
+
+    def get_health(self) -> dict:
+        return {
+            "circuit": self.breaker.get_state(),
+            "p95_latency_seconds": {
+                method: self.latencies.percentile(method, 0.95) for method in config.LLM_TIMEOUT_SECONDS
+            },
+            "cassette": self.cassette.get_stats() if self.cassette else None,
+        }
+
+    def _chat(self, method: str, messages: list, max_tokens: Optional[int] = None) -> str:
+        """
+        Send a chat completion through the circuit breaker, hedging it for the methods in
+        LLM_HEDGE_METHODS once enough latencies are known to estimate their p95.
+        Temperature and (unless given) max_tokens come from the method's configured values.
+        """
+        temperature = config.LLM_TEMPERATURES.get(method, config.LLM_TEMPERATURE)
+        if max_tokens is None:
+            max_tokens = config.LLM_MAX_TOKENS.get(method, 1024)
+
+        def send():
+            return self._send(method, messages, temperature, max_tokens)
+
+        if method in config.LLM_HEDGE_METHODS:
+            p95 = self.latencies.percentile(method, 0.95)
+            if p95 is not None:
+                return call_with_hedge(self._hedge_pool, send, max(p95, config.LLM_HEDGE_MIN_DELAY_SECONDS))
+
+        return send()
+
+    def _send(self, method: str, messages: list, temperature: float, max_tokens: int) -> str:
+        """Send a single request and record its tokens, latency and cost in the usage ledger."""
+        self.breaker.before_call()
 
-    def process_call_summary(self, raw_summary: str) -> str:
+        # Waiting for a slot is not provider latency, so it is left out of the timing
+        if self._slots is not None:
+            self._slots.acquire()
+        started_at = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(
+                model=config.LLM_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=config.LLM_TIMEOUT_SECONDS.get(method, 60.0),
+            )
+        except Exception as e:
+            if isinstance(e, self.PROVIDER_ERRORS):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            usage_recorder.record(
+                method, config.LLM_MODEL,
+                latency_ms=int((time.monotonic() - started_at) * 1000),
+                success=False
+            )
+            raise
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+        self.breaker.record_success()
+        self.latencies.record(method, time.monotonic() - started_at)
+        replayed_latency_ms = self.cassette.last_replayed_latency_ms() if self.cassette else None
+
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        usage_recorder.record(
+            method,
+            response.model or config.LLM_MODEL,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            cached_tokens=(getattr(details, "cached_tokens", 0) or 0) if details else 0,
+            # Replayed from the cassette store: reported with the latency it had when recorded
+            latency_ms=(replayed_latency_ms if replayed_latency_ms is not None
+                        else int((time.monotonic() - started_at) * 1000)),
+            replayed=replayed_latency_ms is not None,
+        )
+        return response.choices[0].message.content.strip()
+
+    def process_call_summary(self, raw_summary: str) -> Optional[str]:
+        """The combined call summary, or None if the request failed."""
         system_prompt = (
             "You are an expert call summarization assistant specializing in customer service interactions. "
             "Your task is to create clear, accurate, and concise summaries that capture key information "
@@ -53,102 +190,231 @@ class OpenAIClient:
             )
 
         try:
-            response = self.client.chat.completions.create(
-                model=config.LLM_MODEL,
+            ai_summary = self._chat(
+                "process_call_summary",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.2,
-                max_tokens=1024,
             )
-            ai_summary = response.choices[0].message.content.strip()
             return ai_summary
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print("OpenAI processing error in process_call_summary():", e)
-            # For multiple summaries, provide a basic concatenation as fallback
-            if " ||| " in raw_summary:
-                summaries = raw_summary.split(" ||| ")
-                return "Multiple transcript summary (error processing): " + " ".join(
-                    [f"[Transcript {i + 1}] {s[:100]}..." for i, s in enumerate(summaries)]
-                )
-            return "Fallback AI summary: " + raw_summary
-
-    def process_transcript_text(self, transcript_text: str) -> dict:
-        system_prompt = (
-            "You are an expert conversation analyzer specializing in financial call transcripts. "
-            "Extract payment details with precision from customer service interactions. Focus on "
-            "identifying payment status, amounts, dates, and methods while maintaining factual accuracy. "
-            "Ignore irrelevant conversation elements and provide output strictly in the requested JSON format."
-        )
-
+            return None
+
+    EXTRACTION_SYSTEM_PROMPT = (
+        "You are an expert conversation analyzer specializing in financial call transcripts. "
+        "Extract payment details with precision from customer service interactions. Focus on "
+        "identifying payment status, amounts, dates, and methods while maintaining factual accuracy. "
+        "Ignore irrelevant conversation elements and provide output strictly in the requested JSON format."
+    )
+
+    EXTRACTION_FIELDS = (
+        "  - payment_status: Must be one of [Prepaid, Collected, Committed, Pending]\n"
+        "  - payment_amount: Numeric value only, without currency symbols\n"
+        "  - payment_currency: Currency code [USD, INR, EUR, GBP, JPY, AUD, Other]\n"
+        "  - payment_date: In YYYY-MM-DD format\n"
+        "  - payment_method: One of [Credit Card, Debit Card, ACH, Check, Cash, Wire Transfer, Other]\n"
+        "    If 'Other', format as 'Other - [specific method]'\n"
+        "  - ai_summary: A concise summary of the key points in the conversation\n"
+    )
+
+    def process_transcript_text(self, transcript_text: str) -> ExtractionResult:
         user_prompt = (
             "Extract the following information from the transcript:\n"
-            "  - payment_status: Must be one of [Prepaid, Collected, Committed, Pending]\n"
-            "  - payment_amount: Numeric value only, without currency symbols\n"
-            "  - payment_currency: Currency code [USD, INR, EUR, GBP, JPY, AUD, Other]\n"
-            "  - payment_date: In YYYY-MM-DD format\n"
-            "  - payment_method: One of [Credit Card, Debit Card, ACH, Check, Cash, Wire Transfer, Other]\n"
-            "    If 'Other', format as 'Other - [specific method]'\n"
-            "  - ai_summary: A concise summary of the key points in the conversation\n\n"
+            f"{self.EXTRACTION_FIELDS}\n"
             "Transcript:\n"
             f"{transcript_text}\n\n"
             "Return the result in valid JSON format."
         )
 
+        messages = [
+            {"role": "system", "content": self.EXTRACTION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
         try:
-            response = self.client.chat.completions.create(
-                model=config.LLM_MODEL,
+            llm_response = self._chat("process_transcript_text", messages)
+            data = self._parse_extraction(llm_response)
+
+            if data is None:
+                # Repair: show the model its own output and ask for just the JSON object
+                messages = messages + [
+                    {"role": "assistant", "content": llm_response},
+                    {"role": "user", "content": (
+                        "That response was not a valid JSON object with the requested fields. "
+                        "Reply with only the corrected JSON object, with no other text."
+                    )}
+                ]
+                llm_response = self._chat("repair_transcript_text", messages)
+                data = self._parse_extraction(llm_response)
+
+            if data is None:
+                return ExtractionResult(
+                    ExtractionOutcome.PERMANENT_FAILURE,
+                    error=f"LLM returned invalid extraction JSON after repair: {llm_response[:200]}"
+                )
+
+            return ExtractionResult(ExtractionOutcome.SUCCESS, data=self._normalize_extraction(data))
+        except CircuitOpenError:
+            raise
+        except self.PROVIDER_ERRORS as e:
+            print("OpenAI processing error in process_transcript():", e)
+            return ExtractionResult(ExtractionOutcome.RETRYABLE, error=str(e))
+        except openai.APIStatusError as e:
+            # Any other 4xx (bad request, context length, auth) fails the same way on every retry
+            print("OpenAI request rejected in process_transcript():", e)
+            return ExtractionResult(ExtractionOutcome.PERMANENT_FAILURE, error=str(e))
+        except Exception as e:
+            print("OpenAI processing error in process_transcript():", e)
+            return ExtractionResult(ExtractionOutcome.RETRYABLE, error=str(e))
+
+    def process_call_transcripts(self, transcript_texts: List[str]) -> Optional[CallExtractionResult]:
+        """
+        Extract every transcript of a call and the call-level summary in a single request.
+        Returns None when the request or its response is unusable; the caller then falls
+        back to one request per transcript, which has its own repair and retry handling.
+        """
+        formatted_transcripts = "\n\n".join([f"Transcript {i + 1}:\n{text}"
+                                              for i, text in enumerate(transcript_texts)])
+
+        user_prompt = (
+            f"The following {len(transcript_texts)} transcripts are from the same call. "
+            "For each transcript, extract the following information:\n"
+            "  - transcript_index: The number N of the transcript, from its 'Transcript N:' heading\n"
+            f"{self.EXTRACTION_FIELDS}\n"
+            "Then write call_summary: a unified summary of the whole call that consolidates the key "
+            "information of all transcripts, eliminates redundancies and keeps a professional tone.\n\n"
+            f"{formatted_transcripts}\n\n"
+            'Return only valid JSON of the form {"transcripts": [one object per transcript], '
+            '"call_summary": "..."}.'
+        )
+
+        try:
+            llm_response = self._chat(
+                "process_call_transcripts",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.EXTRACTION_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=0.0,
-                max_tokens=1024
+                max_tokens=min(
+                    config.LLM_MAX_TOKENS["process_call_transcripts"],
+                    config.LLM_BATCHED_MAX_TOKENS_PER_TRANSCRIPT * (len(transcript_texts) + 1)
+                ),
             )
-            llm_response = response.choices[0].message.content.strip()
-            data = json.loads(llm_response)
-
-            # Standardize the payment_status to lowercase
-            if "payment_status" in data:
-                data["payment_status"] = data["payment_status"].lower()
-
-            # Convert payment_amount to float if it contains currency symbols
-            if "payment_amount" in data and data["payment_amount"] is not None:
-                # Handle if it's already a number
-                if isinstance(data["payment_amount"], (int, float)):
-                    data["payment_amount"] = float(data["payment_amount"])
-                else:
-                    # Remove currency symbols, commas and whitespace
-                    amount_str = str(data["payment_amount"])
-                    # Replace common currency symbols and formatting characters
-                    replacements = ['$', '₹', '€', '£', '¥', ',', ' ']
-                    for char in replacements:
-                        amount_str = amount_str.replace(char, '')
-
-                    try:
-                        data["payment_amount"] = float(amount_str)
-                    except ValueError:
-                        # Fallback if conversion fails
-                        print(f"Could not convert payment amount: '{data['payment_amount']}'")
-                        data["payment_amount"] = None
-
-            # Standardize the currency code to uppercase
-            if "payment_currency" in data and data["payment_currency"]:
-                data["payment_currency"] = data["payment_currency"].upper()
-
-            return data
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            print("OpenAI processing error in process_transcript():", e)
-            return {
-                "payment_status": "Pending",
-                "payment_amount": None,
-                "payment_currency": None,
-                "payment_date": None,
-                "payment_method": None,
-                "comments": None,
-                "summary_text": f"Error processing transcript: {str(e)}. This is a fallback response and requires manual review."
-            }
+            print("OpenAI processing error in process_call_transcripts():", e)
+            return None
+
+        data = self._load_json(llm_response)
+        items = self._match_transcript_entries(data, len(transcript_texts))
+        if items is None:
+            print(f"Unusable response in process_call_transcripts(): {llm_response[:200]}")
+            return None
+
+        extractions = []
+        for item in items:
+            item = self._validate_extraction(item)
+            if item is None:
+                extractions.append(ExtractionResult(
+                    ExtractionOutcome.RETRYABLE, error="Missing or invalid entry in the call extraction response"
+                ))
+            else:
+                extractions.append(ExtractionResult(ExtractionOutcome.SUCCESS, data=self._normalize_extraction(item)))
+
+        return CallExtractionResult(extractions, data.get("call_summary") or None)
+
+    @staticmethod
+    def _match_transcript_entries(data, count: int) -> Optional[List[Optional[dict]]]:
+        """
+        Order the entries of a call extraction response by the transcript_index each one
+        echoes, with None for transcripts the model left out. Returns None when any entry
+        lacks a valid index or two entries claim the same transcript: then the entries
+        cannot be trusted to belong to the right transcripts.
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("transcripts"), list):
+            return None
+
+        items: List[Optional[dict]] = [None] * count
+        for item in data["transcripts"]:
+            index = item.pop("transcript_index", None) if isinstance(item, dict) else None
+            try:
+                position = int(index) - 1
+            except (TypeError, ValueError):
+                return None
+            if not 0 <= position < count or items[position] is not None:
+                return None
+            items[position] = item
+        return items
+
+    @staticmethod
+    def _load_json(llm_response: str):
+        """Parse a JSON response, tolerating code fences. Returns None when it is not JSON."""
+        text = llm_response.strip()
+        if text.startswith("```"):
+            text = text.strip("`").strip()
+            if text.lower().startswith("json"):
+                text = text[4:]
+
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _parse_extraction(cls, llm_response: str):
+        """Parse the extraction JSON, tolerating code fences. Returns None when it is unusable."""
+        return cls._validate_extraction(cls._load_json(llm_response))
+
+    @staticmethod
+    def _validate_extraction(data):
+        if not isinstance(data, dict):
+            return None
+
+        # Models occasionally name the summary field differently
+        for alias in ("summary", "summary_text"):
+            if alias in data and "ai_summary" not in data:
+                data["ai_summary"] = data.pop(alias)
+
+        if not data.get("ai_summary"):
+            return None
+        return data
+
+    @staticmethod
+    def _normalize_extraction(data: dict) -> dict:
+        # Standardize the payment_status to lowercase
+        if data.get("payment_status"):
+            data["payment_status"] = str(data["payment_status"]).lower()
+
+        # Convert payment_amount to float if it contains currency symbols
+        if "payment_amount" in data and data["payment_amount"] is not None:
+            # Handle if it's already a number
+            if isinstance(data["payment_amount"], (int, float)):
+                data["payment_amount"] = float(data["payment_amount"])
+            else:
+                # Remove currency symbols, commas and whitespace
+                amount_str = str(data["payment_amount"])
+                # Replace common currency symbols and formatting characters
+                replacements = ['$', '₹', '€', '£', '¥', ',', ' ']
+                for char in replacements:
+                    amount_str = amount_str.replace(char, '')
+
+                try:
+                    data["payment_amount"] = float(amount_str)
+                except ValueError:
+                    # Fallback if conversion fails
+                    print(f"Could not convert payment amount: '{data['payment_amount']}'")
+                    data["payment_amount"] = None
+
+        # Standardize the currency code to uppercase
+        if data.get("payment_currency"):
+            data["payment_currency"] = str(data["payment_currency"]).upper()
+
+        return data
 
     def generate_refined_summary(self, base_summary: str, user_summary: str) -> str:
         """
@@ -184,51 +450,76 @@ class OpenAIClient:
                     Produce a single cohesive summary paragraph.
                     """
 
-            response = self.client.chat.completions.create(
-                model=config.LLM_MODEL,
+            refined_summary = self._chat(
+                "generate_refined_summary",
                 messages=[
                     {"role": "system",
                      "content": "You are a helpful assistant that refines summaries based on expert feedback."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.0,
-                max_tokens=1024
             )
-
-            refined_summary = response.choices[0].message.content.strip()
             return refined_summary
 
         except Exception as e:
+            # Raised rather than saving a placeholder; the insight keeps llm_refinement_required set
             print(f"OpenAI processing error in generate_refined_summary(): {str(e)}")
-            return "Fallback refined summary: " + base_summary
+            raise
 
 
 # --- LLM Initialization Function ---
-def init_llm():
+def init_llm(provider: Optional[str] = None):
     """
-    Initializes the LLM client based on the configuration.
-    Returns an object with two methods:
-      - process_transcript(transcript_text: str) -> dict
-      - process_call_summary(raw_summary: str) -> str
+    Initializes the LLM client for `provider`, by default the configured LLM.
+    Returns an object with these methods:
+      - process_transcript_text(transcript_text: str) -> ExtractionResult
+      - process_call_summary(raw_summary: str) -> Optional[str] (None on failure)
+      - process_call_transcripts(transcript_texts: List[str]) -> Optional[CallExtractionResult]
+      - generate_refined_summary(base_summary: str, user_summary: str) -> str
     """
-    if config.LLM == "openai":
+    provider = provider or config.LLM
+    if provider == "openai":
+        if openai is None:
+            raise Exception("LLM=openai requires the 'openai' package")
         return OpenAIClient()
+    elif provider == "local":
+        # Imported here: the local provider builds on this module's result types
+        from clients.local_llm_client import LocalLLMClient
+        return LocalLLMClient()
     else:
-        raise Exception("Unsupported LLM provider: " + config.LLM)
+        raise Exception("Unsupported LLM provider: " + provider)
+
 
+# Singleton client instance, created on first use: the local provider imports
+# this module, so building it at import time would import them while it is half-initialised
+_client = None
+_client_lock = threading.Lock()
 
-# Create a singleton client instance
-_client = init_llm()
+
+def _get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = init_llm()
+    return _client
 
 
 # Module-level functions that delegate to the client instance
-def process_call_summary(raw_summary: str) -> str:
-    return _client.process_call_summary(raw_summary)
+def process_call_summary(raw_summary: str) -> Optional[str]:
+    return _get_client().process_call_summary(raw_summary)
+
 
+def process_transcript_text(transcript_text: str) -> ExtractionResult:
+    return _get_client().process_transcript_text(transcript_text)
 
-def process_transcript_text(transcript_text: str) -> dict:
-    return _client.process_transcript_text(transcript_text)
+
+def process_call_transcripts(transcript_texts: List[str]) -> Optional[CallExtractionResult]:
+    return _get_client().process_call_transcripts(transcript_texts)
 
 
 def generate_refined_summary(base_summary: str, user_summary: str) -> str:
-    return _client.generate_refined_summary(base_summary, user_summary)
+    return _get_client().generate_refined_summary(base_summary, user_summary)
+
+
+def get_health() -> dict:
+    return _get_client().get_health()
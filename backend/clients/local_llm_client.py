@@ -0,0 +1,254 @@
+# clients/local_llm_client.py
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from clients.llm_client import CallExtractionResult, ExtractionResult
+from config import loaded_config
+from models.enums import ExtractionOutcome
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+# Linear cue-phrase model: score(label) = bias + sum(weight * occurrences). Weights can be
+# replaced by a JSON file of the same shape (LOCAL_EXTRACTOR_MODEL_PATH), e.g. one fitted
+# on labelled transcripts.
+DEFAULT_MODEL = {
+    "payment_status": {
+        "bias": {"Pending": 0.5, "Committed": 0.0, "Collected": 0.0, "Prepaid": 0.0},
+        "features": {
+            "Collected": {
+                "payment has been processed": 3.0, "payment went through": 3.0, "payment is successful": 3.0,
+                "payment was successful": 3.0, "transaction is complete": 3.0, "transaction was successful": 3.0,
+                "i've processed": 2.5, "i have processed": 2.5, "processed the payment": 2.5,
+                "received your payment": 2.5, "confirmation number": 1.5, "charged": 1.0, "go ahead": 1.0,
+                "has been collected": 3.0, "successfully collected": 3.0, "payment is complete": 3.0,
+                "payment completed": 3.0, "processed successfully": 3.0,
+            },
+            "Committed": {
+                "i will pay": 2.5, "i'll pay": 2.5, "i will make the payment": 2.5, "i'll make the payment": 2.5,
+                "promise to pay": 3.0, "schedule the payment": 2.5, "scheduled payment": 2.0,
+                "set up a payment": 2.0, "payment arrangement": 2.0, "payment plan": 1.5, "by friday": 1.0,
+                "next week": 1.0, "on payday": 1.5, "i can pay on": 2.0, "i commit to": 3.0,
+                "commitment to pay": 3.0, "later today": 1.0, "tomorrow": 1.0,
+            },
+            "Prepaid": {
+                "already paid": 3.0, "already made the payment": 3.0, "paid in advance": 3.0, "prepaid": 3.0,
+                "paid it last": 2.0, "paid last week": 2.0, "payment was already": 2.5, "already been made": 3.0,
+            },
+            "Pending": {
+                "can't pay": 2.0, "cannot pay": 2.0, "not able to pay": 2.0, "unable to pay": 2.0,
+                "need more time": 2.0, "call back": 1.0, "think about it": 1.5, "check with": 1.0,
+                "not right now": 1.5, "dispute": 1.5,
+            },
+        },
+    },
+    "payment_method": {
+        "Credit Card": ["credit card", "visa", "mastercard", "amex", "american express"],
+        "Debit Card": ["debit card"],
+        "ACH": ["ach", "bank transfer", "online transfer", "direct debit", "routing number", "checking account", "savings account",
+                "bank account"],
+        "Check": ["cheque", "a check", "the check", "by check", "via check", "check payment"],
+        "Cash": ["cash"],
+        "Wire Transfer": ["wire transfer", "wire"],
+        "Other - UPI": ["upi"],
+        "Other - PayPal": ["paypal"],
+        "Other - Money Order": ["money order"],
+    },
+}
+
+_CURRENCY_SYMBOLS = {"$": "USD", "₹": "INR", "€": "EUR", "£": "GBP", "¥": "JPY"}
+_CURRENCY_WORDS = {
+    "usd": "USD", "dollar": "USD", "dollars": "USD", "inr": "INR", "rupee": "INR", "rupees": "INR",
+    "eur": "EUR", "euro": "EUR", "euros": "EUR", "gbp": "GBP", "pound": "GBP", "pounds": "GBP",
+    "jpy": "JPY", "yen": "JPY", "aud": "AUD",
+}
+_NUMBER = r"\d[\d,]*(?:\.\d{1,2})?"
+_SYMBOL_AMOUNT_PATTERN = re.compile(r"(?P<currency>[$₹€£¥])\s?(?P<amount>" + _NUMBER + r")")
+_WORD_AMOUNT_PATTERN = re.compile(
+    r"(?P<amount>" + _NUMBER + r")\s?(?P<currency>" + "|".join(_CURRENCY_WORDS) + r")\b", re.IGNORECASE
+)
+
+_MONTHS = ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october",
+           "november", "december"]
+_MONTH = r"(?P<month>" + "|".join(month[:3] for month in _MONTHS) + r")[a-z]*\.?"
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(?:,?\s+(?P<year>\d{4}))?"
+_DATE_PATTERNS = [
+    re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})\b"),
+    re.compile(r"\b" + _MONTH + r"\s+" + _DAY + r"\b" + _YEAR, re.IGNORECASE),
+    re.compile(r"\b" + _DAY + r"\s+(?:of\s+)?" + _MONTH + _YEAR, re.IGNORECASE),
+    re.compile(r"\b(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})\b"),
+]
+
+_SPEAKER_LABEL_PATTERN = re.compile(r"^\s*[A-Za-z][\w .'&/-]{0,40}?(?:\s*\([^)]{0,80}\))?\s*:\s*")
+_SENTENCE_PATTERN = re.compile(r"(?<!\bMr\.)(?<!\bMs\.)(?<!\bMrs\.)(?<!\bDr\.)(?<=[.!?])\s+|\n+")
+_WORD_PATTERN = re.compile(r"[a-z']+")
+_STOPWORDS = set(
+    "a an the and or but if so of to in on at for with by from is are was were be been am i you he she it we "
+    "they me my your our their this that these those do does did have has had will would can could should "
+    "just okay ok yes no yeah sure thank thanks please hi hello sir madam um uh well let me".split()
+)
+_SUMMARY_CUES = ("pay", "amount", "due", "balance", "card", "account", "transfer", "date", "agree", "confirm")
+
+
+class LocalLLMClient:
+    """
+    Offline extraction provider (LLM=local): a cue-phrase classifier for payment status
+    and method, rules for amount, currency and date, and an extractive summary. CPU only,
+    no network and no third-party packages; the model is loaded once per process.
+    """
+
+    def __init__(self):
+        self.model = self._load_model(config.LOCAL_EXTRACTOR_MODEL_PATH)
+        self._status_features = {
+            label: [(phrase, weight) for phrase, weight in features.items()]
+            for label, features in self.model["payment_status"]["features"].items()
+        }
+        self._method_patterns = {
+            method: re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+            for method, terms in self.model["payment_method"].items()
+        }
+        self._requests = 0
+        self._seconds = 0.0
+
+    @staticmethod
+    def _load_model(path: Optional[str]) -> dict:
+        if not path:
+            return DEFAULT_MODEL
+        with open(path) as model_file:
+            model = json.load(model_file)
+        logger.info(f"Loaded local extraction model from {path}")
+        return {**DEFAULT_MODEL, **model}
+
+    def get_health(self) -> dict:
+        return {
+            "provider": "local",
+            "requests": self._requests,
+            "mean_latency_ms": round(self._seconds / self._requests * 1000, 2) if self._requests else None,
+        }
+
+    def extract_batch(self, transcript_texts: List[str]) -> List[dict]:
+        started_at = time.monotonic()
+        results = [self._extract(text) for text in transcript_texts]
+        self._requests += len(transcript_texts)
+        self._seconds += time.monotonic() - started_at
+        return results
+
+    def _extract(self, transcript_text: str) -> dict:
+        lowered = transcript_text.lower()
+        amount, currency = self._amount(transcript_text)
+        payment_date = self._date(transcript_text)
+        return {
+            "payment_status": self._status(lowered).lower(),
+            "payment_amount": amount,
+            "payment_currency": currency,
+            "payment_date": payment_date.isoformat() if payment_date else None,
+            "payment_method": self._method(lowered),
+            "ai_summary": self._summarize(transcript_text.splitlines()),
+        }
+
+    def _status(self, lowered: str) -> str:
+        scores = dict(self.model["payment_status"]["bias"])
+        for label, features in self._status_features.items():
+            for phrase, weight in features:
+                count = lowered.count(phrase)
+                if count:
+                    scores[label] = scores.get(label, 0.0) + weight * count
+        return max(scores, key=scores.get)
+
+    def _method(self, lowered: str) -> Optional[str]:
+        counts = {method: len(pattern.findall(lowered)) for method, pattern in self._method_patterns.items()}
+        method, count = max(counts.items(), key=lambda item: item[1])
+        return method if count else None
+
+    @staticmethod
+    def _amount(transcript_text: str) -> Tuple[Optional[float], Optional[str]]:
+        """The most frequently mentioned amount (the latest one on a tie) and its currency."""
+        mentions = []
+        for match in _SYMBOL_AMOUNT_PATTERN.finditer(transcript_text):
+            mentions.append((match.start(), match.group("amount"), _CURRENCY_SYMBOLS[match.group("currency")]))
+        for match in _WORD_AMOUNT_PATTERN.finditer(transcript_text):
+            mentions.append((match.start(), match.group("amount"), _CURRENCY_WORDS[match.group("currency").lower()]))
+        if not mentions:
+            return None, None
+
+        mentions.sort()
+        counts = Counter(amount for _, amount, _ in mentions)
+        best = max(reversed(mentions), key=lambda mention: counts[mention[1]])
+        try:
+            return float(best[1].replace(",", "")), best[2]
+        except ValueError:
+            return None, best[2]
+
+    @staticmethod
+    def _date(transcript_text: str) -> Optional[date]:
+        """The last date mentioned; a date without a year is taken to be in the current year."""
+        found = []
+        for pattern in _DATE_PATTERNS:
+            for match in pattern.finditer(transcript_text):
+                month = match.group("month")
+                month = int(month) if month.isdigit() else _MONTHS.index(
+                    next(name for name in _MONTHS if name.startswith(month.lower()[:3]))) + 1
+                year = int(match.group("year")) if match.group("year") else datetime.now().year
+                try:
+                    found.append((match.start(), date(year, month, int(match.group("day")))))
+                except ValueError:
+                    continue
+        return max(found)[1] if found else None
+
+    @staticmethod
+    def _summarize(lines: List[str], max_sentences: int = 3) -> str:
+        """Extractive summary: the highest-scoring sentences, in their original order."""
+        sentences = []
+        for line in lines:
+            text = _SPEAKER_LABEL_PATTERN.sub("", line).strip()
+            sentences.extend(sentence.strip() for sentence in _SENTENCE_PATTERN.split(text) if sentence.strip())
+        if not sentences:
+            return ""
+
+        words = [[word for word in _WORD_PATTERN.findall(sentence.lower()) if word not in _STOPWORDS]
+                 for sentence in sentences]
+        frequencies = Counter(word for sentence_words in words for word in sentence_words)
+
+        def score(index: int) -> float:
+            if not words[index]:
+                return 0.0
+            value = sum(frequencies[word] for word in words[index]) / len(words[index])
+            lowered = sentences[index].lower()
+            if any(cue in lowered for cue in _SUMMARY_CUES):
+                value *= 2
+            if _SYMBOL_AMOUNT_PATTERN.search(sentences[index]) or any(ch.isdigit() for ch in lowered):
+                value *= 1.5
+            return value
+
+        best = sorted(sorted(range(len(sentences)), key=score, reverse=True)[:max_sentences])
+        return " ".join(sentences[index] for index in best)
+
+    def process_transcript_text(self, transcript_text: str) -> ExtractionResult:
+        data = self.extract_batch([transcript_text])[0]
+        if not data["ai_summary"]:
+            return ExtractionResult(ExtractionOutcome.PERMANENT_FAILURE, error="Transcript has no text to extract from")
+        return ExtractionResult(ExtractionOutcome.SUCCESS, data=data)
+
+    def process_call_transcripts(self, transcript_texts: List[str]) -> Optional[CallExtractionResult]:
+        extractions = [
+            ExtractionResult(ExtractionOutcome.SUCCESS, data=data) if data["ai_summary"]
+            else ExtractionResult(ExtractionOutcome.PERMANENT_FAILURE, error="Transcript has no text to extract from")
+            for data in self.extract_batch(transcript_texts)
+        ]
+        summaries = [extraction.data["ai_summary"] for extraction in extractions if extraction.data]
+        return CallExtractionResult(extractions, self._summarize(summaries, max_sentences=5) or None)
+
+    def process_call_summary(self, raw_summary: str) -> Optional[str]:
+        return self._summarize(raw_summary.split(" ||| "), max_sentences=5)
+
+    def generate_refined_summary(self, base_summary: str, user_summary: str) -> str:
+        # Without a generative model the reviewer's version is the best summary we have
+        return user_summary.strip() or base_summary
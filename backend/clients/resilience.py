@@ -0,0 +1,163 @@
+# clients/resilience.py
+
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        # Only retry_after goes into args so the error survives pickling across worker processes
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f"LLM provider circuit is open, retry in {self.retry_after:.0f}s"
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker shared by all threads of a process.
+
+    - CLOSED: requests flow; once the window holds `min_requests` outcomes and the
+      failure rate reaches `failure_rate_threshold`, the circuit opens.
+    - OPEN: requests fail fast with CircuitOpenError for `open_seconds`.
+    - HALF_OPEN: a single probe request is let through; success closes the circuit,
+      failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window_seconds: float, min_requests: int, failure_rate_threshold: float,
+                 open_seconds: float):
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque()  # (timestamp, succeeded)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError if a request may not be sent right now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.open_seconds - now
+                if remaining > 0:
+                    raise CircuitOpenError(remaining)
+                self._state = self.HALF_OPEN
+
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.open_seconds)
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._close()
+                return
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            if len(self._outcomes) >= self.min_requests \
+                    and failures / len(self._outcomes) >= self.failure_rate_threshold:
+                self._open()
+
+    def get_state(self) -> dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            return {
+                "state": self._state,
+                "window_requests": len(self._outcomes),
+                "window_failures": failures,
+                "times_opened": self._times_opened,
+                "retry_after_seconds": round(max(0.0, self._opened_at + self.open_seconds - time.monotonic()), 1)
+                if self._state == self.OPEN else 0.0,
+            }
+
+    def _record(self, succeeded: bool):
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._times_opened += 1
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """Keeps the most recent successful request latencies per method for percentile estimates."""
+
+    def __init__(self, sample_size: int = 200):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, method: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(method, deque(maxlen=self.sample_size)).append(seconds)
+
+    def percentile(self, method: str, percentile: float, min_samples: int = 20) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(method, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(percentile * len(samples)) - 1)]
+
+
+def call_with_hedge(executor: ThreadPoolExecutor, send: Callable[[], Any], hedge_after: float) -> Any:
+    """
+    Run `send` and, if it has not returned after `hedge_after` seconds, send a second
+    identical request; whichever succeeds first wins. The loser cannot be cancelled
+    mid-request, it finishes in the background and its result is discarded.
+    """
+    # Each attempt gets its own copy of the caller's context (usage attribution etc.)
+    primary = executor.submit(contextvars.copy_context().run, send)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    pending = {primary, executor.submit(contextvars.copy_context().run, send)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
@@ -0,0 +1,18 @@
+# clients/usage_recorder.py
+
+from typing import Callable, Optional
+
+# Receives one usage entry per LLM request. The clients sit below the service layer, so the
+# usage ledger (services.usage_service) registers itself here rather than being imported by them.
+_recorder: Optional[Callable[..., None]] = None
+
+
+def set_recorder(recorder: Optional[Callable[..., None]]):
+    global _recorder
+    _recorder = recorder
+
+
+def record(method: str, model: str, **usage):
+    """Report one LLM request; dropped when no recorder is registered (e.g. standalone scripts)."""
+    if _recorder is not None:
+        _recorder(method, model, **usage)
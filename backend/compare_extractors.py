@@ -0,0 +1,96 @@
+# compare_extractors.py
+"""
+Benchmark the offline extractor (LLM=local) against the OpenAI extraction path:
+per-transcript latency for both, and how often the local extractor agrees with the
+LLM on each field.
+
+Run from the backend directory (needs LLM_API_KEY for the OpenAI side):
+    python compare_extractors.py ../streamlit/setup/sample_transcripts [--batch-size 16]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import statistics
+import time
+
+from clients.llm_client import OpenAIClient
+from clients.local_llm_client import LocalLLMClient
+from models.enums import ExtractionOutcome
+
+logger = logging.getLogger("compare_extractors")
+
+FIELDS = ["payment_status", "payment_amount", "payment_currency", "payment_date", "payment_method"]
+
+
+def _same(field: str, expected, actual) -> bool:
+    if expected in (None, "") or actual in (None, ""):
+        return expected in (None, "") and actual in (None, "")
+    if field == "payment_amount":
+        try:
+            return abs(float(expected) - float(actual)) < 0.01
+        except (TypeError, ValueError):
+            return False
+    return str(expected).strip().lower() == str(actual).strip().lower()
+
+
+def _latency_summary(seconds: list) -> str:
+    if not seconds:
+        return "n/a"
+    ordered = sorted(seconds)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"mean {statistics.mean(ordered) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the local extractor with the OpenAI extraction path.")
+    parser.add_argument("directory", help="Directory of transcript .txt files")
+    parser.add_argument("--batch-size", type=int, default=16, help="Transcripts per local inference batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    paths = sorted(glob.glob(os.path.join(args.directory, "*.txt")))
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as transcript_file:
+            texts.append(transcript_file.read())
+
+    local = LocalLLMClient()
+    local_results, local_seconds = [], []
+    for start in range(0, len(texts), args.batch_size):
+        batch = texts[start:start + args.batch_size]
+        started_at = time.monotonic()
+        local_results.extend(local.extract_batch(batch))
+        local_seconds.extend([(time.monotonic() - started_at) / len(batch)] * len(batch))
+
+    remote = OpenAIClient()
+    agreement = {field: 0 for field in FIELDS}
+    compared, remote_seconds = 0, []
+    for path, text, local_data in zip(paths, texts, local_results):
+        started_at = time.monotonic()
+        result = remote.process_transcript_text(text)
+        remote_seconds.append(time.monotonic() - started_at)
+        if result.outcome != ExtractionOutcome.SUCCESS:
+            logger.warning(f"OpenAI extraction failed for {os.path.basename(path)}: {result.error}")
+            continue
+
+        compared += 1
+        for field in FIELDS:
+            if _same(field, result.data.get(field), local_data.get(field)):
+                agreement[field] += 1
+            else:
+                logger.info(f"{os.path.basename(path)} {field}: openai={result.data.get(field)!r} "
+                            f"local={local_data.get(field)!r}")
+
+    print(f"Transcripts: {len(texts)} ({compared} compared)")
+    print(f"Local latency:  {_latency_summary(local_seconds)}")
+    print(f"OpenAI latency: {_latency_summary(remote_seconds)}")
+    for field in FIELDS:
+        rate = agreement[field] / compared if compared else 0.0
+        print(f"Agreement {field}: {rate:.0%}")
+
+
+if __name__ == "__main__":
+    main()
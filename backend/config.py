@@ -1,6 +1,8 @@
 # config.py
+import copy
+import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Tuple
 
 from dotenv import load_dotenv
 
@@ -20,16 +22,163 @@ class BaseConfig:
     LLM_API_KEY: str = os.getenv("LLM_API_KEY", "")
     LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4")
     LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.0"))
+    # Per-method sampling temperature and completion token budget
+    LLM_TEMPERATURES: Dict[str, float] = {
+        "process_transcript_text": LLM_TEMPERATURE,
+        "process_call_summary": float(os.getenv("LLM_CALL_SUMMARY_TEMPERATURE", "0.2")),
+        "repair_transcript_text": LLM_TEMPERATURE,
+        "process_call_transcripts": LLM_TEMPERATURE,
+        "generate_refined_summary": LLM_TEMPERATURE,
+    }
+    LLM_MAX_TOKENS: Dict[str, int] = {
+        "process_transcript_text": int(os.getenv("LLM_TRANSCRIPT_MAX_TOKENS", "1024")),
+        "process_call_summary": int(os.getenv("LLM_CALL_SUMMARY_MAX_TOKENS", "1024")),
+        "repair_transcript_text": int(os.getenv("LLM_TRANSCRIPT_MAX_TOKENS", "1024")),
+        "process_call_transcripts": int(os.getenv("LLM_CALL_TRANSCRIPTS_MAX_TOKENS", "4096")),
+        "generate_refined_summary": int(os.getenv("LLM_REFINEMENT_MAX_TOKENS", "1024")),
+    }
+    # Batched extraction asks for this many tokens per transcript (plus one share for the
+    # call summary), up to LLM_MAX_TOKENS["process_call_transcripts"]
+    LLM_BATCHED_MAX_TOKENS_PER_TRANSCRIPT: int = int(os.getenv("LLM_BATCHED_MAX_TOKENS_PER_TRANSCRIPT", "768"))
+    # Requests in flight to the provider per process; further requests wait for a slot (0 = no limit)
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "0"))
+    # LLM=local: optional JSON weights replacing the offline extractor's built-in cue-phrase model
+    LOCAL_EXTRACTOR_MODEL_PATH: str = os.getenv("LOCAL_EXTRACTOR_MODEL_PATH", "")
+
+    # LLM resilience: per-method request timeouts, SDK retries, circuit breaker and hedging
+    LLM_TIMEOUT_SECONDS: Dict[str, float] = {
+        "process_transcript_text": float(os.getenv("LLM_TRANSCRIPT_TIMEOUT_SECONDS", "60")),
+        "process_call_summary": float(os.getenv("LLM_CALL_SUMMARY_TIMEOUT_SECONDS", "45")),
+        "repair_transcript_text": float(os.getenv("LLM_TRANSCRIPT_TIMEOUT_SECONDS", "60")),
+        "process_call_transcripts": float(os.getenv("LLM_CALL_TRANSCRIPTS_TIMEOUT_SECONDS", "90")),
+        "generate_refined_summary": float(os.getenv("LLM_REFINEMENT_TIMEOUT_SECONDS", "30")),
+    }
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "1"))
+    LLM_CIRCUIT_WINDOW_SECONDS: float = float(os.getenv("LLM_CIRCUIT_WINDOW_SECONDS", "60"))
+    LLM_CIRCUIT_MIN_REQUESTS: int = int(os.getenv("LLM_CIRCUIT_MIN_REQUESTS", "10"))
+    LLM_CIRCUIT_FAILURE_RATE: float = float(os.getenv("LLM_CIRCUIT_FAILURE_RATE", "0.5"))
+    LLM_CIRCUIT_OPEN_SECONDS: float = float(os.getenv("LLM_CIRCUIT_OPEN_SECONDS", "30"))
+    # Methods that send a second request once the first is slower than the method's p95 latency
+    LLM_HEDGE_METHODS: list = os.getenv("LLM_HEDGE_METHODS", "generate_refined_summary").split(",")
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0"))
+    LLM_HEDGE_MAX_WORKERS: int = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "8"))
+
+    # Record/replay transport for OpenAI requests: off | record | replay | replay_or_record.
+    # Replays sleep for the recorded latency times the scale, plus the fixed extra seconds
+    LLM_CASSETTE_MODE: str = os.getenv("LLM_CASSETTE_MODE", "off")
+    LLM_CASSETTE_DIR: str = os.getenv("LLM_CASSETTE_DIR", "./llm_cassettes")
+    LLM_CASSETTE_LATENCY_SCALE: float = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1.0"))
+    LLM_CASSETTE_LATENCY_SECONDS: float = float(os.getenv("LLM_CASSETTE_LATENCY_SECONDS", "0.0"))
+
+    # Transcript preprocessing before prompting; add "roles" to send only agent/customer turns
+    # and "prune" to drop turns unrelated to payments
+    PREPROCESSING_ENABLED: bool = os.getenv("PREPROCESSING_ENABLED", "true").lower() == "true"
+    PREPROCESSING_STEPS: list = os.getenv("PREPROCESSING_STEPS", "timestamps,disfluencies,whitespace,turns").split(",")
+
+    # Extract all transcripts of a call plus its summary in one request when their prompts fit
+    # the token budget; larger calls fall back to one request per transcript
+    BATCHED_EXTRACTION: bool = os.getenv("BATCHED_EXTRACTION", "false").lower() == "true"
+    BATCHED_EXTRACTION_MAX_TOKENS: int = int(os.getenv("BATCHED_EXTRACTION_MAX_TOKENS", "6000"))
+    # A transcript whose prompt is larger than this is split on turn boundaries and its parts
+    # are extracted together in one batched request (0 = always send it whole)
+    EXTRACTION_CHUNK_TOKENS: int = int(os.getenv("EXTRACTION_CHUNK_TOKENS", "8000"))
+
+    # Embedding and similarity search settings
+    EMBEDDER: str = os.getenv("EMBEDDER", "openai")  # openai | local | hashing
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    VECTOR_INDEX_PATH: str = os.getenv("VECTOR_INDEX_PATH", "./vector_index/insights")
+    VECTOR_INDEX_ANN_THRESHOLD: int = int(os.getenv("VECTOR_INDEX_ANN_THRESHOLD", "20000"))
+
+    # Processing job scheduler settings
+    JOB_MAX_CONCURRENCY: int = int(os.getenv("JOB_MAX_CONCURRENCY", "8"))
+    # Higher weight = larger share of slots under contention; deadline drives SLA tracking
+    JOB_CLASS_SETTINGS: Dict[str, Dict[str, float]] = {
+        "interactive": {"weight": 4, "max_concurrency": 6, "deadline_seconds": 120},
+        "refinement": {"weight": 8, "max_concurrency": 4, "deadline_seconds": 30},
+        "backfill": {"weight": 1, "max_concurrency": 2, "deadline_seconds": 3600},
+    }
+
+    # "inline" runs call processing in the API process; "worker" queues it for worker.py
+    PROCESSING_MODE: str = os.getenv("PROCESSING_MODE", "inline")
+    # Inline mode only: start extracting each transcript as soon as it is stored during upload
+    PIPELINED_UPLOADS: bool = os.getenv("PIPELINED_UPLOADS", "false").lower() == "true"
+    WORKER_PROCESSES_PER_CORE: float = float(os.getenv("WORKER_PROCESSES_PER_CORE", "1.0"))
+    WORKER_POLL_INTERVAL_SECONDS: float = float(os.getenv("WORKER_POLL_INTERVAL_SECONDS", "1.0"))
+    WORKER_HEARTBEAT_SECONDS: float = float(os.getenv("WORKER_HEARTBEAT_SECONDS", "15"))
+    WORKER_STALE_AFTER_SECONDS: float = float(os.getenv("WORKER_STALE_AFTER_SECONDS", "120"))
+    WORKER_MAX_ATTEMPTS: int = int(os.getenv("WORKER_MAX_ATTEMPTS", "3"))
+    WORKER_HEALTH_FILE: str = os.getenv("WORKER_HEALTH_FILE", "./worker_health.json")
+
+    # LLM usage ledger: records are buffered and written in batches by a background thread
+    USAGE_LEDGER_BATCH_SIZE: int = int(os.getenv("USAGE_LEDGER_BATCH_SIZE", "200"))
+    USAGE_LEDGER_FLUSH_SECONDS: float = float(os.getenv("USAGE_LEDGER_FLUSH_SECONDS", "2.0"))
+
+    # Transcript extraction retries: exponential backoff with jitter, then the transcript is marked failed
+    TRANSCRIPT_MAX_ATTEMPTS: int = int(os.getenv("TRANSCRIPT_MAX_ATTEMPTS", "4"))
+    TRANSCRIPT_RETRY_BASE_SECONDS: float = float(os.getenv("TRANSCRIPT_RETRY_BASE_SECONDS", "30"))
+    TRANSCRIPT_RETRY_MAX_SECONDS: float = float(os.getenv("TRANSCRIPT_RETRY_MAX_SECONDS", "1800"))
+    TRANSCRIPT_RETRY_SWEEP_SECONDS: float = float(os.getenv("TRANSCRIPT_RETRY_SWEEP_SECONDS", "30"))
+    # A scheduled retry that never ran (e.g. lost in a restart) becomes due again after this long
+    TRANSCRIPT_RETRY_LEASE_SECONDS: float = float(os.getenv("TRANSCRIPT_RETRY_LEASE_SECONDS", "900"))
+
+    # Bulk export: rows fetched per server-side cursor batch (and per Parquet row group)
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+    # Call summaries response cache: in-process LRU, plus an optional shared Redis tier
+    SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+    SUMMARY_CACHE_URL: str = os.getenv("SUMMARY_CACHE_URL", "")  # e.g. redis://localhost:6379/0
+    SUMMARY_CACHE_TTL_SECONDS: int = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "3600"))
+
+    # Upload admission control: uploads are turned away with 503 once this much processing work
+    # is pending (0 disables), backfill uploads already at ADMISSION_BACKFILL_SHARE of it, and
+    # with 429 once a client exceeds its quota (0 disables)
+    ADMISSION_MAX_PENDING_JOBS: int = int(os.getenv("ADMISSION_MAX_PENDING_JOBS", "200"))
+    ADMISSION_BACKFILL_SHARE: float = float(os.getenv("ADMISSION_BACKFILL_SHARE", "0.5"))
+    ADMISSION_RETRY_AFTER_SECONDS: float = float(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "10"))
+    ADMISSION_QUEUE_CHECK_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_CHECK_SECONDS", "1.0"))
+    ADMISSION_CLIENT_UPLOADS_PER_MINUTE: float = float(os.getenv("ADMISSION_CLIENT_UPLOADS_PER_MINUTE", "60"))
+    ADMISSION_CLIENT_BURST: int = int(os.getenv("ADMISSION_CLIENT_BURST", "10"))
+    # Quotas are keyed on the peer IP. Only requests from these proxy IPs may name the client,
+    # with X-Client-Id (e.g. set by an authenticating gateway) or else X-Forwarded-For
+    ADMISSION_TRUSTED_PROXIES: list = [ip.strip() for ip in os.getenv("ADMISSION_TRUSTED_PROXIES", "").split(",")
+                                       if ip.strip()]
 
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./call_insights.db")
+    # Connection pool per engine (primary and each replica); not applied to SQLite
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    # Comma-separated PostgreSQL streaming replicas for read-only endpoints. Every
+    # REPLICA_LAG_CHECK_SECONDS each replica's replay position is compared with the primary's
+    # WAL position; reads go to the primary unless the replica had replayed every commit (from
+    # any process) as of that check and this process has not written since
+    DATABASE_REPLICA_URLS: list = [url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url]
+    REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1.0"))
+
+    # How enum columns are stored: "string" (member names) or "smallint" (1-based codes in
+    # definition order; smaller rows and indexes). There are no migrations, so switching only
+    # applies to a new database.
+    ENUM_STORAGE: str = os.getenv("ENUM_STORAGE", "string")
 
     # Application settings
-    MAX_TRANSCRIPT_LENGTH: int = 100000
+    # Extracted payment values matching no enum value or alias: "default" (the enum's fallback, e.g.
+    # Pending / USD / Cash), "other" (the Other option), "none" (left empty where optional) or "raise" (extraction fails)
+    ENUM_UNKNOWN_MODE: str = os.getenv("ENUM_UNKNOWN_MODE", "default")
+    MAX_TRANSCRIPT_LENGTH: int = int(os.getenv("MAX_TRANSCRIPT_LENGTH", "100000"))  # Bytes per transcript file
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
     CORS_ORIGINS: list = [
         "*"  # Allow all origins for development; restrict in production
     ]
 
+    # Performance profile: an optional JSON file of {setting: value} overriding any setting in
+    # PERFORMANCE_SETTINGS below, so throughput can be tuned per deployment. It is re-read every
+    # PERFORMANCE_PROFILE_RELOAD_SECONDS (0 disables); only hot-reloadable settings change live
+    PERFORMANCE_PROFILE_PATH: str = os.getenv("PERFORMANCE_PROFILE_PATH", "")
+    PERFORMANCE_PROFILE_RELOAD_SECONDS: float = float(os.getenv("PERFORMANCE_PROFILE_RELOAD_SECONDS", "30"))
+
 
 class DevelopmentConfig(BaseConfig):
     """Development configuration."""
@@ -52,6 +201,120 @@ class TestConfig(BaseConfig):
     TESTING: bool = True
 
 
+class PerformanceSetting(NamedTuple):
+    kind: type  # int or float; for per-method settings, the type of each value
+    minimum: float
+    # Read on every use, so a reloaded value takes effect immediately; the others are read
+    # once when their pool, client or cache is created, and need a restart
+    hot_reload: bool
+    per_method: bool = False  # A dict keyed by LLM method; a profile may set only some methods
+
+
+PERFORMANCE_SETTINGS: Dict[str, PerformanceSetting] = {
+    "DB_POOL_SIZE": PerformanceSetting(int, 1, False),
+    "DB_MAX_OVERFLOW": PerformanceSetting(int, 0, False),
+    "DB_POOL_TIMEOUT_SECONDS": PerformanceSetting(float, 0, False),
+    "DB_POOL_RECYCLE_SECONDS": PerformanceSetting(int, -1, False),
+    "REPLICA_LAG_CHECK_SECONDS": PerformanceSetting(float, 0, True),
+    "LLM_MAX_CONCURRENCY": PerformanceSetting(int, 0, False),
+    "LLM_MAX_RETRIES": PerformanceSetting(int, 0, False),
+    "LLM_TIMEOUT_SECONDS": PerformanceSetting(float, 0.1, True, per_method=True),
+    "LLM_TEMPERATURES": PerformanceSetting(float, 0, True, per_method=True),
+    "LLM_MAX_TOKENS": PerformanceSetting(int, 1, True, per_method=True),
+    "LLM_BATCHED_MAX_TOKENS_PER_TRANSCRIPT": PerformanceSetting(int, 1, True),
+    "LLM_HEDGE_MIN_DELAY_SECONDS": PerformanceSetting(float, 0, True),
+    "LLM_HEDGE_MAX_WORKERS": PerformanceSetting(int, 1, False),
+    "BATCHED_EXTRACTION_MAX_TOKENS": PerformanceSetting(int, 1, True),
+    "EXTRACTION_CHUNK_TOKENS": PerformanceSetting(int, 0, True),
+    "EMBEDDING_BATCH_SIZE": PerformanceSetting(int, 1, True),
+    "EXPORT_BATCH_SIZE": PerformanceSetting(int, 1, True),
+    "JOB_MAX_CONCURRENCY": PerformanceSetting(int, 1, False),
+    "WORKER_PROCESSES_PER_CORE": PerformanceSetting(float, 0.1, False),
+    "WORKER_POLL_INTERVAL_SECONDS": PerformanceSetting(float, 0.1, False),
+    "USAGE_LEDGER_BATCH_SIZE": PerformanceSetting(int, 1, False),
+    "USAGE_LEDGER_FLUSH_SECONDS": PerformanceSetting(float, 0.1, False),
+    "SUMMARY_CACHE_MAX_ENTRIES": PerformanceSetting(int, 0, False),
+    "SUMMARY_CACHE_TTL_SECONDS": PerformanceSetting(int, 1, False),
+    "TRANSCRIPT_MAX_ATTEMPTS": PerformanceSetting(int, 1, True),
+    "TRANSCRIPT_RETRY_BASE_SECONDS": PerformanceSetting(float, 0, True),
+    "TRANSCRIPT_RETRY_MAX_SECONDS": PerformanceSetting(float, 0, True),
+    "TRANSCRIPT_RETRY_SWEEP_SECONDS": PerformanceSetting(float, 1, True),
+    "ADMISSION_MAX_PENDING_JOBS": PerformanceSetting(int, 0, True),
+    "ADMISSION_RETRY_AFTER_SECONDS": PerformanceSetting(float, 0, True),
+    "ADMISSION_QUEUE_CHECK_SECONDS": PerformanceSetting(float, 0, True),
+    "ADMISSION_CLIENT_UPLOADS_PER_MINUTE": PerformanceSetting(float, 0, False),
+    "ADMISSION_CLIENT_BURST": PerformanceSetting(int, 1, False),
+}
+
+
+def _check_value(name: str, value, setting: PerformanceSetting):
+    # bool is an int subclass, but never a meaningful size or duration
+    if isinstance(value, bool) or not isinstance(value, (int, float)) \
+            or (setting.kind is int and not float(value).is_integer()):
+        raise ValueError(f"{name} must be {setting.kind.__name__}, got {value!r}")
+    if value < setting.minimum:
+        raise ValueError(f"{name} must be at least {setting.minimum}, got {value!r}")
+    return setting.kind(value)
+
+
+def check_performance_profile(settings: Dict[str, Any], current) -> Dict[str, Any]:
+    """
+    Validate profile values against PERFORMANCE_SETTINGS and return them typed; per-method
+    values are merged over `current`'s. Raises ValueError listing every invalid setting.
+    """
+    checked, errors = {}, []
+    for name, value in settings.items():
+        setting = PERFORMANCE_SETTINGS.get(name)
+        try:
+            if setting is None:
+                raise ValueError(f"{name} is not a performance setting")
+            if not setting.per_method:
+                checked[name] = _check_value(name, value, setting)
+                continue
+            if not isinstance(value, dict):
+                raise ValueError(f"{name} must map LLM methods to values, got {value!r}")
+            merged = dict(getattr(current, name))
+            for method, method_value in value.items():
+                if method not in merged:
+                    raise ValueError(f"{name} has unknown LLM method {method!r}")
+                merged[method] = _check_value(f"{name}[{method}]", method_value, setting)
+            checked[name] = merged
+        except ValueError as e:
+            errors.append(str(e))
+
+    if errors:
+        raise ValueError("Invalid performance profile: " + "; ".join(errors))
+    return checked
+
+
+def load_performance_profile(path: str) -> Dict[str, Any]:
+    """The settings in a profile file, unchecked; {} when no file is configured."""
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as profile_file:
+        profile = json.load(profile_file)
+    if not isinstance(profile, dict):
+        raise ValueError(f"Performance profile {path} must be a JSON object")
+    return profile
+
+
+def apply_performance_profile(target, settings: Dict[str, Any], hot_only: bool = False) -> Tuple[list, list]:
+    """
+    Set checked profile values on the config class. Returns the names of settings that
+    changed and, with `hot_only`, those left unchanged because they need a restart.
+    """
+    applied, restart_required = [], []
+    for name, value in settings.items():
+        if getattr(target, name) == value:
+            continue
+        if hot_only and not PERFORMANCE_SETTINGS[name].hot_reload:
+            restart_required.append(name)
+            continue
+        setattr(target, name, value)
+        applied.append(name)
+    return applied, restart_required
+
+
 # Map environment names to config classes
 config_by_name: Dict[str, Any] = {
     "development": DevelopmentConfig,
@@ -64,3 +327,12 @@ ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
 
 # Load the appropriate config
 loaded_config = config_by_name[ENVIRONMENT]
+
+# Checked at import, env values included, so a bad setting fails at startup rather than under load
+check_performance_profile({name: getattr(loaded_config, name) for name in PERFORMANCE_SETTINGS}, loaded_config)
+# The values before the profile file is applied; a setting removed from the file reverts to these on reload
+PERFORMANCE_DEFAULTS: Dict[str, Any] = {name: copy.copy(getattr(loaded_config, name)) for name in PERFORMANCE_SETTINGS}
+apply_performance_profile(
+    loaded_config,
+    check_performance_profile(load_performance_profile(loaded_config.PERFORMANCE_PROFILE_PATH), loaded_config)
+)
@@ -2,3 +2,21 @@
 
 # Constants for the Gen-AI Call Insight Extractor project
 MAX_LLM_RETRY_COUNT = 3
+MAX_TRANSCRIPTS_PER_CALL = 4
+
+# Quiet period before a call summary is recomputed after its transcript summaries change
+CALL_SUMMARY_DEBOUNCE_SECONDS = 5
+# Wait before retrying a call summary whose LLM request failed
+CALL_SUMMARY_RETRY_SECONDS = 60
+
+# LLM list prices in USD per 1M tokens: (prompt, cached prompt, completion).
+# Used for cost estimates in the usage ledger; unknown models are costed at 0.
+LLM_PRICING_PER_MILLION_TOKENS = {
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+}
@@ -1,17 +1,176 @@
 # database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session, sessionmaker
 
 from config import ENVIRONMENT, loaded_config
 from models.entities.base import Base
+from repositories import call_repository, search_repository
 
 config = loaded_config
 
 DATABASE_URL = config.DATABASE_URL
 
-engine = create_engine(DATABASE_URL)
+
+def _create_engine(url: str):
+    # SQLite's default pools take no sizing options
+    if url.startswith("sqlite"):
+        return create_engine(url)
+    return create_engine(
+        url,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+    )
+
+
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Only replicas that report their replay position can be checked for lag, so only they are used
+replica_engines = [_create_engine(url) for url in config.DATABASE_REPLICA_URLS if url.startswith("postgresql")]
+if len(replica_engines) < len(config.DATABASE_REPLICA_URLS):
+    print("Warning: ignoring read replicas that are not PostgreSQL; they cannot report replication lag")
+_replica_sessions = [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines]
+_replica_cursor = itertools.count()
+
+# Wall-clock time of the latest write committed through this process, and for each replica
+# (checked_at, caught_up_to): caught_up_to is the wall-clock time as of which the replica had
+# replayed every commit made on the primary, or None if it was behind at the last check
+_last_write_at = 0.0
+_replica_positions: Dict[int, Tuple[float, Optional[float]]] = {}
+_replica_lock = threading.Lock()
+
+
+# Keeps Call.updated_at current when a transcript or insight changes (summary cache versions)
+event.listen(SessionLocal, "before_flush", call_repository.touch_parent_calls)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_flush_write(session, flush_context):
+    session.info["wrote_at"] = time.time()
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote_at"] = time.time()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_write(session):
+    global _last_write_at
+    wrote_at = session.info.pop("wrote_at", None)
+    if wrote_at:
+        _last_write_at = max(_last_write_at, wrote_at)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote_at", None)
+
+
+def _check_replica(index: int) -> Optional[float]:
+    """
+    Compare a replica's replay position with the primary's current WAL position. Returns the
+    time the primary was sampled if the replica has replayed up to it, else None. This covers
+    writes from every process (API and workers), not just this one.
+    """
+    sampled_at = time.time()
+    try:
+        with engine.connect() as connection:
+            primary_lsn = connection.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+        with replica_engines[index].connect() as connection:
+            caught_up = connection.execute(
+                text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": primary_lsn}
+            ).scalar()
+    except Exception as e:
+        print(f"Could not compare replica {index} replay position: {str(e)}")
+        return None
+    return sampled_at if caught_up else None
+
+
+def _replica_caught_up(index: int) -> bool:
+    """
+    Whether a replica is fresh enough to read from: it had replayed every commit as of its
+    last check (at most REPLICA_LAG_CHECK_SECONDS ago), and this process has not written since.
+    """
+    with _replica_lock:
+        checked_at, caught_up_to = _replica_positions.get(index, (0.0, None))
+    if time.monotonic() - checked_at >= config.REPLICA_LAG_CHECK_SECONDS:
+        caught_up_to = _check_replica(index)
+        with _replica_lock:
+            _replica_positions[index] = (time.monotonic(), caught_up_to)
+
+    return caught_up_to is not None and caught_up_to >= _last_write_at
+
+
+def read_session() -> Session:
+    """
+    A session for read-only work: the next replica (round robin) that has caught up with
+    the primary, so a user reads back their own changes, else the primary.
+    """
+    for _ in range(len(replica_engines)):
+        index = next(_replica_cursor) % len(replica_engines)
+        if _replica_caught_up(index):
+            return _replica_sessions[index]()
+    return SessionLocal()
+
+
+def reset_engine_for_worker():
+    """
+    Give a forked worker process its own connection pool. Connections inherited from
+    the parent are left for the parent to use and are never shared across processes.
+    """
+    engine.dispose(close=False)
+    for replica in replica_engines:
+        replica.dispose(close=False)
+
+
+def _init_replicas():
+    # Replicas receive the primary's schema through replication
+    for replica in replica_engines:
+        search_repository.share_index(replica, engine)
+
+
+# Columns added to existing tables after their first release, as (table, column, DDL, statements
+# run after adding it).
+# create_all only creates missing tables, so an existing database gets these at startup.
+# Production databases skip init_database and need the same ALTER TABLE statements as a migration.
+_ADDED_COLUMNS = [
+    ("call", "summary_inputs_hash", "VARCHAR(64)", []),
+    ("transcript", "transcript_status", "VARCHAR(10) NOT NULL DEFAULT 'PENDING'", [
+        "UPDATE transcript SET transcript_status = 'PROCESSED' WHERE processed_at IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS ix_transcript_transcript_status ON transcript (transcript_status)",
+    ]),
+    ("transcript", "attempts", "INTEGER NOT NULL DEFAULT 0", []),
+    ("transcript", "last_error", "TEXT", []),
+    ("transcript", "next_attempt_at", "TIMESTAMP", []),
+    ("transcript", "original_token_count", "INTEGER", []),
+    ("transcript", "prompt_token_count", "INTEGER", []),
+    ("insight", "version", "INTEGER NOT NULL DEFAULT 1", []),
+]
+
+
+def _add_missing_columns():
+    inspector = inspect(engine)
+    existing = {table: {column["name"] for column in inspector.get_columns(table)}
+                for table in {table for table, _, _, _ in _ADDED_COLUMNS} if inspector.has_table(table)}
+
+    with engine.begin() as connection:
+        for table, column, ddl, statements in _ADDED_COLUMNS:
+            if table not in existing or column in existing[table]:
+                continue
+            connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}'))
+            for statement in statements:
+                connection.execute(text(statement))
+            print(f"Added column {table}.{column}")
+
 
 def init_database():
     try:
@@ -20,6 +179,9 @@ def init_database():
             return
 
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns()
+        search_repository.init_index(engine)
+        _init_replicas()
         print("Database initialized!")
     except Exception as e:
         print(f"Error initializing database: {str(e)}")
@@ -39,6 +201,20 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Like get_db, for read-only endpoints; may be served by a read replica."""
+    db = read_session()
+    try:
+        yield db
+    except Exception as e:
+        print(f"Database session error: {str(e)}")
+        db.rollback()
+        db.close()
+        return None
+    finally:
+        db.close()
+
+
 def reset_database():
     try:
         if ENVIRONMENT.lower() == "production":
@@ -46,6 +222,8 @@ def reset_database():
 
         Base.metadata.drop_all(bind=engine)
         Base.metadata.create_all(bind=engine)
+        search_repository.init_index(engine)
+        _init_replicas()
         print("Database reset!")
     except Exception as e:
         print(f"Error resetting database: {str(e)}")
@@ -58,6 +236,8 @@ def create_tables_in_production():
             raise EnvironmentError("ERROR: This method should only be called in a production environment!")
 
         Base.metadata.create_all(bind=engine)
+        search_repository.init_index(engine)
+        _init_replicas()
         print("Production tables created!")
     except Exception as e:
         print(f"Error creating production tables: {str(e)}")
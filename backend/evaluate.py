@@ -0,0 +1,85 @@
+# evaluate.py
+"""
+Score transcript extraction against a labelled dataset, next to latency, tokens and cost,
+to compare providers, models, prompts and preprocessing settings.
+
+Run from the backend directory:
+    python evaluate.py setup/eval_dataset.jsonl                          # the configured LLM
+    python evaluate.py setup/eval_dataset.jsonl --provider local
+    python evaluate.py setup/eval_dataset.jsonl --record runs/gpt-4  # also record the responses
+    python evaluate.py setup/eval_dataset.jsonl --replay runs/gpt-4  # offline, from a recording
+
+Model and preprocessing come from the usual settings (LLM_MODEL, PREPROCESSING_STEPS, ...),
+so a comparison is one run per configuration. --output writes the per-case report as JSON.
+Recordings are cassette directories (see clients/cassette_transport.py), the same format as
+LLM_CASSETTE_MODE=record; a replay only answers requests identical to the recorded ones, so
+it needs the same model, prompts and preprocessing settings.
+"""
+
+import argparse
+import json
+import logging
+
+from clients import llm_client
+from config import loaded_config
+from services import evaluation_service
+
+logger = logging.getLogger("evaluate")
+
+config = loaded_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate extraction accuracy, latency and cost.")
+    parser.add_argument("dataset", help="Labelled dataset (JSONL)")
+    parser.add_argument("--provider", choices=["openai", "local"], default=None,
+                        help="LLM provider (default: the configured LLM)")
+    parser.add_argument("--replay", default=None, help="Replay OpenAI responses from this cassette directory")
+    parser.add_argument("--record", default=None, help="Record OpenAI responses to this cassette directory")
+    parser.add_argument("--no-preprocessing", action="store_true", help="Send transcripts as uploaded")
+    parser.add_argument("--output", default=None, help="Write the full report as JSON to this file")
+    args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if (args.record or args.replay) and (args.provider or config.LLM) != "openai":
+        parser.error("--record and --replay apply to the openai provider")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    # The OpenAI client picks these up when it is built; replays report the recorded latency,
+    # so there is no need to wait for it
+    if args.record:
+        config.LLM_CASSETTE_MODE, config.LLM_CASSETTE_DIR = "record", args.record
+    elif args.replay:
+        config.LLM_CASSETTE_MODE, config.LLM_CASSETTE_DIR = "replay", args.replay
+        config.LLM_CASSETTE_LATENCY_SCALE, config.LLM_CASSETTE_LATENCY_SECONDS = 0.0, 0.0
+
+    cases = evaluation_service.load_dataset(args.dataset)
+    client = llm_client.init_llm(args.provider)
+    report = evaluation_service.evaluate(client, cases, preprocess=not args.no_preprocessing)
+
+    if args.record or args.replay:
+        stats = client.get_health()["cassette"]
+        logger.info(f"Cassette {stats['directory']}: {stats['replayed']} replayed, "
+                    f"{stats['recorded']} recorded, {stats['missed']} missed")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    summary = report["summary"]
+    provider = args.provider or config.LLM
+    if args.replay:
+        provider += f" (replayed from {args.replay})"
+    print(f"Provider: {provider} (model {config.LLM_MODEL}), preprocessing: {not args.no_preprocessing}")
+    print(f"Cases: {summary['cases']}, failures: {summary['failures']}, exact match: {summary['exact_match']}")
+    for field, accuracy in summary["accuracy"].items():
+        print(f"  {field:<18} {'n/a' if accuracy is None else f'{accuracy:.1%}'}")
+    print(f"Latency p50/p95: {summary['latency_ms_p50']} / {summary['latency_ms_p95']} ms")
+    print(f"Tokens per transcript: {summary['prompt_tokens_per_transcript']} prompt, "
+          f"{summary['completion_tokens_per_transcript']} completion")
+    print(f"Cost: ${summary['cost_usd_per_transcript']} per transcript, ${summary['cost_usd_total']} total")
+
+
+if __name__ == "__main__":
+    main()
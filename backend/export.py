@@ -0,0 +1,56 @@
+# export.py
+"""
+Bulk export of call, transcript and insight rows to CSV or Parquet.
+Rows are streamed with a server-side cursor, so memory use does not grow with the export.
+
+Run from the backend directory:
+    python export.py --format parquet --output insights.parquet [--since 2025-01-01T00:00:00]
+    python export.py --format csv --output delta.csv --watermark-file .export_watermark
+
+With --watermark-file the export starts from the watermark stored by the previous run
+(unless --since is given) and stores the new watermark once the export succeeds.
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime
+
+from services import export_service
+
+logger = logging.getLogger("export")
+
+
+def _read_watermark(path: str):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as watermark_file:
+        value = watermark_file.read().strip()
+    return datetime.fromisoformat(value) if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export insights to CSV or Parquet.")
+    parser.add_argument("--format", choices=export_service.EXPORT_FORMATS, default="parquet")
+    parser.add_argument("--output", required=True, help="File to write")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Only export rows changed after this ISO timestamp (UTC)")
+    parser.add_argument("--watermark-file", default=None,
+                        help="Read the starting watermark from, and store the next one in, this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    since = args.since or _read_watermark(args.watermark_file)
+    rows, watermark = export_service.export_to_file(args.output, args.format, since)
+
+    if args.watermark_file:
+        with open(args.watermark_file, "w") as watermark_file:
+            watermark_file.write(watermark.isoformat())
+
+    logger.info(f"Wrote {rows} rows to {args.output} (since {since.isoformat() if since else 'the beginning'}); "
+                f"next watermark {watermark.isoformat()}")
+
+
+if __name__ == "__main__":
+    main()
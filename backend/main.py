@@ -6,6 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from apis import register_routes
 from config import loaded_config
 from database import init_database
+from services import call_summary_service, call_view_service, profile_service, retry_service, search_service, \
+    similarity_service
+from services.admission_service import AdmissionMiddleware
 
 config = loaded_config
 
@@ -15,6 +18,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Added first so CORS headers are also set on its 413/429/503 responses
+app.add_middleware(AdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.CORS_ORIGINS,  # List of allowed origins for CORS
@@ -26,6 +32,37 @@ app.add_middleware(
 init_database()
 register_routes(app)
 
+
+@app.on_event("startup")
+async def resume_call_summary_refreshes():
+    call_summary_service.schedule_pending_refreshes()
+
+
+@app.on_event("startup")
+async def backfill_call_list():
+    call_view_service.backfill()
+
+
+@app.on_event("startup")
+async def backfill_search_index():
+    search_service.backfill()
+
+
+@app.on_event("startup")
+async def sync_similarity_index():
+    similarity_service.start_index_sync()
+
+
+@app.on_event("startup")
+async def start_transcript_retries():
+    retry_service.start_retry_sweeper()
+
+
+@app.on_event("startup")
+async def watch_performance_profile():
+    profile_service.start_profile_reloader()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,15 +2,58 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Integer, String
+from config import loaded_config
+from sqlalchemy import Column, DateTime, Enum, Integer, SmallInteger, String
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+config = loaded_config
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
 
 class AuditMixin:
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # Callables, so each row gets the time of its own insert/update
+    created_at = Column(DateTime, default=_now)
     created_by = Column(Integer, default=1)
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    updated_at = Column(DateTime, default=_now, onupdate=_now)
     updated_by = Column(Integer, default=1)
     record_status = Column(String, default="Active")
+
+
+class SmallIntEnum(TypeDecorator):
+    """
+    Stores an enum member as a small integer code instead of its name.
+    Codes follow definition order (first member = 1), so members may only ever be appended,
+    never reordered or removed.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._codes = {member: code for code, member in enumerate(enum_class, start=1)}
+        self._members = {code: member for member, code in self._codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_class):
+            # Same inputs the string Enum type accepts: a member name or value
+            value = self.enum_class[value] if value in self.enum_class.__members__ else self.enum_class(value)
+        return self._codes[value]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._members[value]
+
+
+def enum_column_type(enum_class):
+    """Column type for an enum, per ENUM_STORAGE (member names, or small integer codes)."""
+    if config.ENUM_STORAGE == "smallint":
+        return SmallIntEnum(enum_class)
+    return Enum(enum_class)
@@ -2,9 +2,9 @@
 
 import uuid
 
-from models.entities.base import Base, AuditMixin
+from models.entities.base import Base, AuditMixin, enum_column_type
 from models.enums import CallStatus
-from sqlalchemy import Column, Text, DateTime, Integer, Enum, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -13,11 +13,13 @@ class Call(Base, AuditMixin):
     __tablename__ = "call"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    call_status = Column(Enum(CallStatus), default=CallStatus.UPLOADED, nullable=False)
+    call_status = Column(enum_column_type(CallStatus), default=CallStatus.UPLOADED, nullable=False)
 
     raw_summary = Column(Text, nullable=True)
     ai_summary = Column(Text, nullable=True)
     ai_summary_updated_at = Column(DateTime, nullable=True)
+    # Hash of the transcript summaries ai_summary was built from
+    summary_inputs_hash = Column(String(64), nullable=True)
 
     llm_refinement_required = Column(Boolean, default=False)
     llm_refinement_count = Column(Integer, default=0)
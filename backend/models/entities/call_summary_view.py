@@ -0,0 +1,38 @@
+# models/entities/call_summary_view.py
+
+from models.entities.base import Base, enum_column_type
+from models.enums import CallStatus
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, JSON, String
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class CallSummaryView(Base):
+    """
+    Denormalized call-list read model, one row per call. Rebuilt from the call, its
+    transcripts and their insights by call_view_service whenever the services change them;
+    never written to directly.
+    """
+    __tablename__ = "call_summary_view"
+
+    call_id = Column(UUID(as_uuid=True), ForeignKey("call.id"), primary_key=True)
+    call_status = Column(enum_column_type(CallStatus), nullable=False)
+
+    transcript_count = Column(Integer, nullable=False, default=0)
+    processed_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    # {"USD": "1520.00", ...}; amounts as strings so they stay exact in JSON
+    totals_by_currency = Column(JSON, nullable=True)
+
+    summary_snippet = Column(String(280), nullable=True)
+    llm_refinement_required = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    ai_summary_updated_at = Column(DateTime, nullable=True)
+    last_processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # List pages: ORDER BY created_at DESC, optionally filtered by status, keyset on created_at
+        Index("ix_call_summary_view_created", "created_at", "call_id"),
+        Index("ix_call_summary_view_status_created", "call_status", "created_at", "call_id"),
+    )
@@ -0,0 +1,18 @@
+# models/entities/idempotency_key.py
+
+import uuid
+
+from models.entities.base import Base, AuditMixin
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class IdempotencyKey(Base, AuditMixin):
+    __tablename__ = "idempotency_key"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Client-supplied Idempotency-Key header, or "content:<hash>" when the client sent none
+    key = Column(String, nullable=False, unique=True, index=True)
+    content_hash = Column(String(64), nullable=False)
+    call_id = Column(UUID(as_uuid=True), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
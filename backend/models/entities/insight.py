@@ -2,11 +2,11 @@
 
 import uuid
 
-from models.entities.base import Base, AuditMixin
+from models.entities.base import Base, AuditMixin, enum_column_type
 from models.enums import PaymentStatus, PaymentCurrency, PaymentMethod
-from sqlalchemy import Column, Text, DateTime, Numeric, Date, Boolean, Integer, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Text, DateTime, Numeric, Date, Boolean, Integer, ForeignKey, JSON
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 
 class Insight(Base, AuditMixin):
@@ -15,11 +15,11 @@ class Insight(Base, AuditMixin):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcript.id"), nullable=False, unique=True)
 
-    payment_status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
+    payment_status = Column(enum_column_type(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
     payment_amount = Column(Numeric(10, 2), nullable=True, default=0.0)
-    payment_currency = Column(Enum(PaymentCurrency), nullable=False, default=PaymentCurrency.USD)
+    payment_currency = Column(enum_column_type(PaymentCurrency), nullable=False, default=PaymentCurrency.USD)
     payment_date = Column(Date, nullable=True)
-    payment_method = Column(Enum(PaymentMethod), nullable=True)
+    payment_method = Column(enum_column_type(PaymentMethod), nullable=True)
     comments = Column(Text, nullable=True)
 
     ai_summary = Column(Text, nullable=True)
@@ -31,9 +31,17 @@ class Insight(Base, AuditMixin):
     refined_summary = Column(Text, nullable=True)
     refined_summary_updated_at = Column(DateTime, nullable=True)
 
-    summary_history = Column(JSON, nullable=True)
+    # Legacy JSON history, superseded by the insight_summary_version table. Deferred so it
+    # is never loaded with the insight; copied into the table on first history read.
+    summary_history = deferred(Column(JSON, nullable=True))
 
     llm_refinement_required = Column(Boolean, default=False)
     llm_refinement_count = Column(Integer, default=0)
 
+    # Optimistic locking: every UPDATE checks and bumps the version, so a write based on
+    # a stale read fails with StaleDataError instead of silently overwriting
+    version = Column(Integer, nullable=False, default=1)
+
     transcript = relationship("Transcript", back_populates="insight")
+
+    __mapper_args__ = {"version_id_col": version}
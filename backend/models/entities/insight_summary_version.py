@@ -0,0 +1,30 @@
+# models/entities/insight_summary_version.py
+
+from datetime import datetime, timezone
+
+from models.entities.base import Base
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class InsightSummaryVersion(Base):
+    """
+    Append-only history of an insight's summaries: a snapshot is inserted whenever the
+    summaries are overwritten, and rows are never updated. Like TranscriptTurn it skips
+    the AuditMixin columns to stay compact.
+    """
+    __tablename__ = "insight_summary_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    insight_id = Column(UUID(as_uuid=True), ForeignKey("insight.id"), nullable=False)
+    event = Column(String, nullable=False)  # extracted | re-extracted | refined | legacy
+    recorded_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    ai_summary = Column(Text, nullable=True)
+    user_summary = Column(Text, nullable=True)
+    refined_summary = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # History pages: WHERE insight_id = ? ORDER BY id DESC LIMIT ? OFFSET ?
+        Index("ix_insight_summary_version_insight", "insight_id", "id"),
+    )
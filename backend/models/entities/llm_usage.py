@@ -0,0 +1,33 @@
+# models/entities/llm_usage.py
+
+from datetime import datetime, timezone
+
+from models.entities.base import Base
+from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class LlmUsage(Base):
+    """
+    One row per LLM request, for cost attribution. This is an insert-only ledger
+    written in batches, so it skips the AuditMixin columns.
+    """
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    call_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    transcript_id = Column(UUID(as_uuid=True), nullable=True)
+
+    method = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+
+    latency_ms = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Numeric(12, 6), nullable=False, default=0)
+    cache_hit = Column(Boolean, nullable=False, default=False)
+    success = Column(Boolean, nullable=False, default=True)
+
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
@@ -0,0 +1,33 @@
+# models/entities/processing_job.py
+
+import uuid
+from datetime import datetime, timezone
+
+from models.entities.base import Base, AuditMixin, enum_column_type
+from models.enums import JobClass, JobStatus
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class ProcessingJob(Base, AuditMixin):
+    __tablename__ = "processing_job"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    call_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    job_class = Column(enum_column_type(JobClass), nullable=False, default=JobClass.INTERACTIVE)
+    job_status = Column(enum_column_type(JobStatus), nullable=False, default=JobStatus.QUEUED)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+
+    enqueued_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    available_at = Column(DateTime, nullable=True)  # Parked jobs are not claimed before this time
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest queued job of a class
+        Index("ix_processing_job_claim", "job_status", "job_class", "enqueued_at"),
+    )
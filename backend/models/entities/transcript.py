@@ -3,8 +3,9 @@
 import uuid
 from datetime import datetime, timezone
 
-from models.entities.base import Base, AuditMixin
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from models.entities.base import Base, AuditMixin, enum_column_type
+from models.enums import TranscriptStatus
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -20,5 +21,15 @@ class Transcript(Base, AuditMixin):
     uploaded_at = Column(DateTime, default=datetime.now(timezone.utc))
     processed_at = Column(DateTime, nullable=True)
 
+    # Extraction status; failed attempts are retried with backoff until next_attempt_at
+    transcript_status = Column(enum_column_type(TranscriptStatus), nullable=False, default=TranscriptStatus.PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)
+
+    # Token counts of the raw transcript and of the preprocessed prompt text
+    original_token_count = Column(Integer, nullable=True)
+    prompt_token_count = Column(Integer, nullable=True)
+
     call = relationship("Call", back_populates="transcripts")
     insight = relationship("Insight", uselist=False, back_populates="transcript")
@@ -0,0 +1,29 @@
+# models/entities/transcript_turn.py
+
+from models.entities.base import Base, enum_column_type
+from models.enums import SpeakerRole
+from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class TranscriptTurn(Base):
+    """
+    One speaker turn of a transcript. Turn text is not duplicated here: start/end are
+    character offsets into Transcript.transcript_text. Rows are written in bulk and
+    never updated, so this table skips the AuditMixin columns to stay compact.
+    """
+    __tablename__ = "transcript_turn"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transcript_id = Column(UUID(as_uuid=True), ForeignKey("transcript.id"), nullable=False)
+    turn_index = Column(Integer, nullable=False)
+
+    speaker = Column(String, nullable=True)
+    speaker_role = Column(enum_column_type(SpeakerRole), nullable=False, default=SpeakerRole.OTHER)
+    start_offset = Column(Integer, nullable=False)
+    end_offset = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Also serves turn-range lookups: WHERE transcript_id = ? AND turn_index BETWEEN ? AND ?
+        UniqueConstraint("transcript_id", "turn_index", name="uq_transcript_turn_index"),
+    )
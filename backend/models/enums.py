@@ -1,6 +1,63 @@
 # models/enums.py
 
 import enum
+import re
+from typing import Dict, Optional
+
+
+class UnknownMode(enum.Enum):
+    """What from_string returns for a value that matches no member or alias."""
+    DEFAULT = "default"  # The enum's fallback member (historical behaviour)
+    OTHER = "other"  # The OTHER member where the enum has one, else the fallback member
+    NONE = "none"  # None
+    RAISE = "raise"  # ValueError
+
+
+# Per enum: normalized value/name/alias -> member, built once at import
+_LOOKUPS: Dict[type, Dict[str, enum.Enum]] = {}
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def _normalize(value: str) -> str:
+    return _SEPARATORS.sub(" ", value.strip().lower())
+
+
+def _register(enum_cls, aliases: Dict[str, enum.Enum]):
+    lookup = {}
+    for member in enum_cls:
+        lookup[_normalize(member.value)] = member
+        lookup[_normalize(member.name)] = member
+    for alias, member in aliases.items():
+        lookup[_normalize(alias)] = member
+    _LOOKUPS[enum_cls] = lookup
+
+
+def _parse(enum_cls, value_string: Optional[str], unknown: UnknownMode, fallback: enum.Enum, optional: bool = False):
+    """
+    Case-insensitive lookup of a value, member name or alias in O(1). A missing value gives
+    None for an `optional` enum, else the fallback member.
+    """
+    key = _normalize(value_string) if value_string else ""
+    member = _LOOKUPS[enum_cls].get(key)
+    if member is not None:
+        return member
+
+    # A missing value is not an unknown one: never raised on, never mapped to OTHER
+    if not key:
+        return None if optional or unknown == UnknownMode.NONE else fallback
+
+    other = getattr(enum_cls, "OTHER", None)
+    # "Other - UPI" style values name an unlisted option explicitly
+    if other is not None and key.startswith("other"):
+        return other
+
+    if unknown == UnknownMode.RAISE:
+        raise ValueError(f"Unknown {enum_cls.__name__}: {value_string!r}")
+    if unknown == UnknownMode.NONE:
+        return None
+    if unknown == UnknownMode.OTHER and other is not None:
+        return other
+    return fallback
 
 
 class PaymentStatus(enum.Enum):
@@ -10,12 +67,9 @@ class PaymentStatus(enum.Enum):
     PENDING = "Pending"
 
     @classmethod
-    def from_string(cls, value_string: str) -> "PaymentStatus":
-        """Get enum value from display string like 'Collected'"""
-        for item in cls:
-            if item.value == value_string:
-                return item
-        return cls.PENDING
+    def from_string(cls, value_string: str, unknown: UnknownMode = UnknownMode.DEFAULT) -> "PaymentStatus":
+        """Get enum value from a display string like 'Collected', a member name or an alias, in any case"""
+        return _parse(cls, value_string, unknown, cls.PENDING)
 
 
 class PaymentCurrency(enum.Enum):
@@ -28,12 +82,9 @@ class PaymentCurrency(enum.Enum):
     OTHER = "Other"
 
     @classmethod
-    def from_string(cls, value_string: str) -> "PaymentCurrency":
-        """Get enum value from display string like 'USD'"""
-        for item in cls:
-            if item.value == value_string:
-                return item
-        return cls.USD
+    def from_string(cls, value_string: str, unknown: UnknownMode = UnknownMode.DEFAULT) -> "PaymentCurrency":
+        """Get enum value from a display string like 'USD', a member name or an alias, in any case"""
+        return _parse(cls, value_string, unknown, cls.USD)
 
 
 class CallStatus(enum.Enum):
@@ -43,12 +94,9 @@ class CallStatus(enum.Enum):
     PROCESSING_FAILED = "Processing Failed"
 
     @classmethod
-    def from_string(cls, value_string: str) -> "CallStatus":
-        """Get enum value from display string like 'Processing'"""
-        for item in cls:
-            if item.value == value_string:
-                return item
-        return cls.UPLOADED
+    def from_string(cls, value_string: str, unknown: UnknownMode = UnknownMode.DEFAULT) -> "CallStatus":
+        """Get enum value from a display string like 'Processing', a member name or an alias, in any case"""
+        return _parse(cls, value_string, unknown, cls.UPLOADED)
 
 
 class PaymentMethod(enum.Enum):
@@ -61,9 +109,109 @@ class PaymentMethod(enum.Enum):
     OTHER = "Other"
 
     @classmethod
-    def from_string(cls, value_string: str) -> "PaymentMethod":
-        """Get enum value from display string like 'Credit Card'"""
-        for item in cls:
-            if item.value == value_string:
-                return item
-        return cls.CASH
+    def from_string(cls, value_string: str, unknown: UnknownMode = UnknownMode.DEFAULT) -> "PaymentMethod":
+        """Get enum value from a display string like 'Credit Card', a member name or an alias, in any case"""
+        # No method mentioned is recorded as None rather than guessed as Cash
+        return _parse(cls, value_string, unknown, cls.CASH, optional=True)
+
+
+class JobClass(enum.Enum):
+    """Priority classes for background processing jobs."""
+    INTERACTIVE = "interactive"  # Calls uploaded by a user waiting on the result
+    REFINEMENT = "refinement"  # Reviewer-triggered summary refinements and recomputes
+    BACKFILL = "backfill"  # Bulk historical uploads
+
+
+class JobStatus(enum.Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+
+class TranscriptStatus(enum.Enum):
+    PENDING = "Pending"
+    PROCESSED = "Processed"
+    RETRYING = "Retrying"  # Extraction failed transiently, a retry is scheduled
+    FAILED = "Failed"  # Permanent failure or retries exhausted; needs a manual reprocess
+
+
+class ExtractionOutcome(enum.Enum):
+    SUCCESS = "Success"
+    RETRYABLE = "Retryable"
+    PERMANENT_FAILURE = "Permanent Failure"
+
+
+class SpeakerRole(enum.Enum):
+    AGENT = "Agent"
+    CUSTOMER = "Customer"
+    OTHER = "Other"
+
+    @classmethod
+    def from_speaker(cls, speaker: str) -> "SpeakerRole":
+        """Classify a transcript speaker label like 'Agent (XYZ Collections)' or 'Customer'"""
+        label = (speaker or "").strip().lower()
+        if label.startswith(("agent", "collector", "representative")):
+            return cls.AGENT
+        if label.startswith(("customer", "client", "caller", "debtor", "borrower")):
+            return cls.CUSTOMER
+        return cls.OTHER
+
+
+_register(PaymentStatus, {
+    "paid": PaymentStatus.COLLECTED,
+    "received": PaymentStatus.COLLECTED,
+    "completed": PaymentStatus.COLLECTED,
+    "promised": PaymentStatus.COMMITTED,
+    "promise to pay": PaymentStatus.COMMITTED,
+    "scheduled": PaymentStatus.COMMITTED,
+    "commitment": PaymentStatus.COMMITTED,
+    "already paid": PaymentStatus.PREPAID,
+    "paid in advance": PaymentStatus.PREPAID,
+    "unpaid": PaymentStatus.PENDING,
+    "outstanding": PaymentStatus.PENDING,
+    "not paid": PaymentStatus.PENDING,
+})
+_register(PaymentCurrency, {
+    "$": PaymentCurrency.USD,
+    "us$": PaymentCurrency.USD,
+    "dollar": PaymentCurrency.USD,
+    "dollars": PaymentCurrency.USD,
+    "us dollar": PaymentCurrency.USD,
+    "₹": PaymentCurrency.INR,
+    "rs": PaymentCurrency.INR,
+    "rs.": PaymentCurrency.INR,
+    "rupee": PaymentCurrency.INR,
+    "rupees": PaymentCurrency.INR,
+    "€": PaymentCurrency.EUR,
+    "euro": PaymentCurrency.EUR,
+    "euros": PaymentCurrency.EUR,
+    "£": PaymentCurrency.GBP,
+    "pound": PaymentCurrency.GBP,
+    "pounds": PaymentCurrency.GBP,
+    "sterling": PaymentCurrency.GBP,
+    "¥": PaymentCurrency.JPY,
+    "yen": PaymentCurrency.JPY,
+    "a$": PaymentCurrency.AUD,
+    "australian dollar": PaymentCurrency.AUD,
+})
+_register(CallStatus, {
+    "failed": CallStatus.PROCESSING_FAILED,
+})
+_register(PaymentMethod, {
+    "credit": PaymentMethod.CREDIT_CARD,
+    "visa": PaymentMethod.CREDIT_CARD,
+    "mastercard": PaymentMethod.CREDIT_CARD,
+    "master card": PaymentMethod.CREDIT_CARD,
+    "amex": PaymentMethod.CREDIT_CARD,
+    "american express": PaymentMethod.CREDIT_CARD,
+    "debit": PaymentMethod.DEBIT_CARD,
+    "bank transfer": PaymentMethod.ACH,
+    "direct debit": PaymentMethod.ACH,
+    "eft": PaymentMethod.ACH,
+    "online transfer": PaymentMethod.ACH,
+    "cheque": PaymentMethod.CHECK,
+    "wire": PaymentMethod.WIRE_TRANSFER,
+    "bank wire": PaymentMethod.WIRE_TRANSFER,
+    "swift": PaymentMethod.WIRE_TRANSFER,
+})
@@ -1,9 +1,17 @@
 # repositories/call_repository.py
 
+import itertools
+from datetime import datetime, timezone
+from typing import List, Tuple
 from uuid import UUID
 
 from models.entities.call import Call
-from sqlalchemy.orm import Session
+from models.entities.call_summary_view import CallSummaryView
+from models.entities.insight import Insight
+from models.entities.insight_summary_version import InsightSummaryVersion
+from models.entities.transcript import Transcript
+from models.entities.transcript_turn import TranscriptTurn
+from sqlalchemy.orm import Session, selectinload
 
 
 def save(db: Session, call: Call):
@@ -13,13 +21,73 @@ def save(db: Session, call: Call):
     db.refresh(call)
 
 
-def create(db: Session) -> Call:
-    call = Call()
+def create(db: Session, call_id: UUID = None) -> Call:
+    call = Call(id=call_id) if call_id else Call()
     db.add(call)
     db.commit()
     db.refresh(call)
     return call
 
 
+def delete_with_transcripts(db: Session, call_id: UUID) -> List[UUID]:
+    """Delete a call with its transcripts and everything derived from them. Returns the transcript ids."""
+    transcript_ids = [row.id for row in db.query(Transcript.id).filter(Transcript.call_id == call_id).all()]
+    if transcript_ids:
+        insight_ids = [row.id for row in db.query(Insight.id).filter(Insight.transcript_id.in_(transcript_ids)).all()]
+        if insight_ids:
+            db.query(InsightSummaryVersion).filter(InsightSummaryVersion.insight_id.in_(insight_ids)) \
+                .delete(synchronize_session=False)
+            db.query(Insight).filter(Insight.id.in_(insight_ids)).delete(synchronize_session=False)
+        db.query(TranscriptTurn).filter(TranscriptTurn.transcript_id.in_(transcript_ids)) \
+            .delete(synchronize_session=False)
+        db.query(Transcript).filter(Transcript.id.in_(transcript_ids)).delete(synchronize_session=False)
+    db.query(CallSummaryView).filter(CallSummaryView.call_id == call_id).delete(synchronize_session=False)
+    db.query(Call).filter(Call.id == call_id).delete(synchronize_session=False)
+    db.commit()
+    return transcript_ids
+
+
 def get_by_id(db: Session, call_id: UUID) -> Call:
     return db.query(Call).filter(Call.id == call_id).first()
+
+
+def get_ids_requiring_refinement(db: Session) -> List[UUID]:
+    return [row.id for row in db.query(Call.id).filter(Call.llm_refinement_required.is_(True)).all()]
+
+
+def get_versions(db: Session) -> List[Tuple[UUID, str]]:
+    """
+    (call_id, version) for every call. Writing a transcript or insight touches its call
+    (see touch_parent_calls), so Call.updated_at alone changes whenever any of them does.
+    """
+    return [(call_id, str(updated_at)) for call_id, updated_at in db.query(Call.id, Call.updated_at).all()]
+
+
+def touch_parent_calls(db: Session, flush_context, instances):
+    """
+    before_flush hook: bump updated_at on the call of every transcript or insight added,
+    changed or deleted in this flush. Bulk query updates skip the ORM and touch the calls
+    themselves.
+    """
+    call_ids = set()
+    for instance in itertools.chain(db.new, db.dirty, db.deleted):
+        if instance in db.dirty and not db.is_modified(instance):
+            continue
+        if isinstance(instance, Transcript):
+            call_ids.add(instance.call_id)
+        elif isinstance(instance, Insight) and instance.transcript is not None:
+            call_ids.add(instance.transcript.call_id)
+
+    now = datetime.now(timezone.utc)
+    for call_id in call_ids:
+        call = db.get(Call, call_id) if call_id is not None else None
+        if call is not None and call not in db.deleted:
+            call.updated_at = now
+
+
+def get_with_insights(db: Session, call_ids: List[UUID]) -> List[Call]:
+    """Load calls with their transcripts and insights in three queries instead of one per row."""
+    return db.query(Call) \
+        .filter(Call.id.in_(call_ids)) \
+        .options(selectinload(Call.transcripts).selectinload(Transcript.insight)) \
+        .all()
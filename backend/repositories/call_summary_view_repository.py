@@ -0,0 +1,50 @@
+# repositories/call_summary_view_repository.py
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from models.entities.call import Call
+from models.entities.call_summary_view import CallSummaryView
+from models.enums import CallStatus
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, row: dict):
+    """Insert or replace a call's row, in the caller's transaction."""
+    db.merge(CallSummaryView(**row))
+
+
+def get_page(
+        db: Session,
+        limit: int,
+        call_status: Optional[CallStatus] = None,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+) -> List[CallSummaryView]:
+    """
+    Newest calls first. (`before`, `before_id`) is the (created_at, call_id) of the last row
+    of the previous page, so calls sharing a timestamp are neither skipped nor repeated.
+    """
+    query = db.query(CallSummaryView)
+    if call_status is not None:
+        query = query.filter(CallSummaryView.call_status == call_status)
+    if before is not None:
+        if before.tzinfo is not None:
+            # Stored as naive UTC
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        if before_id is not None:
+            query = query.filter(tuple_(CallSummaryView.created_at, CallSummaryView.call_id) < (before, before_id))
+        else:
+            query = query.filter(CallSummaryView.created_at < before)
+    return query.order_by(CallSummaryView.created_at.desc(), CallSummaryView.call_id.desc()).limit(limit).all()
+
+
+def get_missing_call_ids(db: Session) -> List[UUID]:
+    """Calls that have no read-model row yet, e.g. created before the table existed."""
+    rows = db.query(Call.id) \
+        .outerjoin(CallSummaryView, CallSummaryView.call_id == Call.id) \
+        .filter(CallSummaryView.call_id.is_(None)) \
+        .all()
+    return [row.id for row in rows]
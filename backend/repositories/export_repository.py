@@ -0,0 +1,64 @@
+# repositories/export_repository.py
+
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from models.entities.call import Call
+from models.entities.insight import Insight
+from models.entities.transcript import Transcript
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+# (export column name, source column), one row per transcript
+EXPORT_COLUMNS = [
+    ("call_id", Call.id),
+    ("call_status", Call.call_status),
+    ("call_ai_summary", Call.ai_summary),
+    ("transcript_id", Transcript.id),
+    ("file_name", Transcript.file_name),
+    ("uploaded_at", Transcript.uploaded_at),
+    ("processed_at", Transcript.processed_at),
+    ("transcript_status", Transcript.transcript_status),
+    ("insight_id", Insight.id),
+    ("payment_status", Insight.payment_status),
+    ("payment_amount", Insight.payment_amount),
+    ("payment_currency", Insight.payment_currency),
+    ("payment_date", Insight.payment_date),
+    ("payment_method", Insight.payment_method),
+    ("comments", Insight.comments),
+    ("ai_summary", Insight.ai_summary),
+    ("user_summary", Insight.user_summary),
+    ("refined_summary", Insight.refined_summary),
+    ("llm_refinement_count", Insight.llm_refinement_count),
+    ("ai_summary_updated_at", Insight.ai_summary_updated_at),
+    ("user_summary_updated_at", Insight.user_summary_updated_at),
+    ("refined_summary_updated_at", Insight.refined_summary_updated_at),
+    ("call_summary_updated_at", Call.ai_summary_updated_at),
+]
+
+# A row counts as changed since a watermark if its call, transcript or insight was updated after it
+CHANGE_COLUMNS = [
+    Call.updated_at,
+    Transcript.updated_at,
+    Insight.updated_at,
+]
+
+
+def stream_rows(db: Session, since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[List[dict]]:
+    """
+    Yield export rows in batches of `batch_size` dicts, streamed with a server-side cursor.
+    Only plain column values are selected, so nothing is loaded into the session's identity map.
+    """
+    statement = select(*[column.label(name) for name, column in EXPORT_COLUMNS]) \
+        .select_from(Transcript) \
+        .join(Call, Transcript.call_id == Call.id) \
+        .outerjoin(Insight, Insight.transcript_id == Transcript.id) \
+        .order_by(Transcript.call_id, Transcript.uploaded_at)
+
+    if since is not None:
+        since = since.replace(tzinfo=None)
+        statement = statement.where(or_(*[column > since for column in CHANGE_COLUMNS]))
+
+    result = db.execute(statement.execution_options(stream_results=True, max_row_buffer=batch_size))
+    for partition in result.partitions(batch_size):
+        yield [dict(row._mapping) for row in partition]
@@ -0,0 +1,40 @@
+# repositories/idempotency_repository.py
+
+from datetime import datetime
+from uuid import UUID
+
+from models.entities.idempotency_key import IdempotencyKey
+from sqlalchemy.orm import Session
+
+
+def create(db: Session, key: str, content_hash: str, call_id: UUID, expires_at: datetime) -> IdempotencyKey:
+    """
+    Create a new idempotency record. Raises IntegrityError if the key is already taken,
+    which is how concurrent retries of the same request are detected.
+    """
+    record = IdempotencyKey(
+        key=key,
+        content_hash=content_hash,
+        call_id=call_id,
+        expires_at=expires_at,
+    )
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return record
+
+
+def get_by_key(db: Session, key: str) -> IdempotencyKey:
+    return db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+
+
+def delete(db: Session, record: IdempotencyKey):
+    db.delete(record)
+    db.commit()
+
+
+def delete_expired(db: Session, now: datetime) -> int:
+    """Delete every record whose TTL has passed. Uses the expires_at index."""
+    count = db.query(IdempotencyKey).filter(IdempotencyKey.expires_at <= now).delete(synchronize_session=False)
+    db.commit()
+    return count
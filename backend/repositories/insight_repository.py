@@ -3,6 +3,7 @@
 from uuid import UUID
 
 from models.entities.insight import Insight
+from sqlalchemy import null
 from sqlalchemy.orm import Session
 
 
@@ -23,8 +24,7 @@ def create(
         payment_method,
         ai_summary,
         ai_summary_updated_at,
-        comments,
-        summary_history
+        comments
 ) -> Insight:
     """
     Create a new insight entry in the database and return it.
@@ -39,7 +39,6 @@ def create(
         ai_summary=ai_summary,
         ai_summary_updated_at=ai_summary_updated_at,
         comments=comments,
-        summary_history=summary_history,
     )
     db.add(insight)
     db.commit()
@@ -59,3 +58,21 @@ def get_by_transcript_id(db: Session, transcript_id: UUID) -> Insight:
     Retrieve an insight by its transcript ID.
     """
     return db.query(Insight).filter(Insight.transcript_id == transcript_id).first()
+
+
+def take_legacy_summary_history(db: Session, insight_id: UUID) -> list:
+    """
+    Return the legacy JSON history and clear the column, in the caller's transaction.
+    Only the transaction whose UPDATE clears a non-null value gets the entries, so two
+    concurrent migrations of the same insight cannot both copy them.
+    """
+    legacy = db.query(Insight.summary_history) \
+        .filter(Insight.id == insight_id, Insight.summary_history.isnot(None)) \
+        .scalar()
+    if legacy is None:
+        return []
+
+    cleared = db.query(Insight) \
+        .filter(Insight.id == insight_id, Insight.summary_history.isnot(None)) \
+        .update({Insight.summary_history: null()}, synchronize_session=False)
+    return (legacy or []) if cleared else []
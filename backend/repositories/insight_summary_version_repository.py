@@ -0,0 +1,47 @@
+# repositories/insight_summary_version_repository.py
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from models.entities.insight_summary_version import InsightSummaryVersion
+from sqlalchemy.orm import Session
+
+
+def append(
+        db: Session,
+        insight_id: UUID,
+        event: str,
+        recorded_at: datetime,
+        ai_summary: Optional[str],
+        user_summary: Optional[str],
+        refined_summary: Optional[str]
+):
+    """Add a history row; it is committed with the caller's transaction."""
+    db.add(InsightSummaryVersion(
+        insight_id=insight_id,
+        event=event,
+        recorded_at=recorded_at,
+        ai_summary=ai_summary,
+        user_summary=user_summary,
+        refined_summary=refined_summary,
+    ))
+
+
+def bulk_append(db: Session, insight_id: UUID, versions: List[dict]):
+    """Add history rows; they are committed with the caller's transaction."""
+    db.bulk_insert_mappings(InsightSummaryVersion, [{"insight_id": insight_id, **version} for version in versions])
+
+
+def count_for_insight(db: Session, insight_id: UUID) -> int:
+    return db.query(InsightSummaryVersion).filter(InsightSummaryVersion.insight_id == insight_id).count()
+
+
+def get_page(db: Session, insight_id: UUID, offset: int, limit: int) -> List[InsightSummaryVersion]:
+    """Newest first; migrated legacy rows get later ids than rows recorded after them, so order by time."""
+    return db.query(InsightSummaryVersion) \
+        .filter(InsightSummaryVersion.insight_id == insight_id) \
+        .order_by(InsightSummaryVersion.recorded_at.desc(), InsightSummaryVersion.id.desc()) \
+        .offset(offset) \
+        .limit(limit) \
+        .all()
@@ -0,0 +1,54 @@
+# repositories/llm_usage_repository.py
+
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from models.entities.llm_usage import LlmUsage
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+_TOTALS = (
+    func.count(LlmUsage.id).label("requests"),
+    func.sum(LlmUsage.prompt_tokens).label("prompt_tokens"),
+    func.sum(LlmUsage.completion_tokens).label("completion_tokens"),
+    func.sum(LlmUsage.cached_tokens).label("cached_tokens"),
+    func.sum(LlmUsage.cost_usd).label("cost_usd"),
+    func.avg(LlmUsage.latency_ms).label("avg_latency_ms"),
+)
+
+
+def bulk_create(db: Session, records: List[dict]):
+    db.bulk_insert_mappings(LlmUsage, records)
+    db.commit()
+
+
+def get_daily_rollup(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> list:
+    """Totals per day, method and model between start and end (inclusive)."""
+    day = func.date(LlmUsage.created_at).label("day")
+    query = db.query(day, LlmUsage.method, LlmUsage.model, *_TOTALS)
+
+    if start:
+        query = query.filter(LlmUsage.created_at >= start)
+    if end:
+        query = query.filter(func.date(LlmUsage.created_at) <= end)
+
+    return query.group_by(day, LlmUsage.method, LlmUsage.model).order_by(day).all()
+
+
+def get_call_rollup(db: Session, call_id: UUID) -> list:
+    """Totals per method for a single call."""
+    return db.query(LlmUsage.method, LlmUsage.model, *_TOTALS) \
+        .filter(LlmUsage.call_id == call_id) \
+        .group_by(LlmUsage.method, LlmUsage.model) \
+        .all()
+
+
+def get_top_calls(db: Session, limit: int) -> list:
+    """The most expensive calls overall."""
+    return db.query(LlmUsage.call_id, *_TOTALS) \
+        .filter(LlmUsage.call_id.isnot(None)) \
+        .group_by(LlmUsage.call_id) \
+        .order_by(func.sum(LlmUsage.cost_usd).desc()) \
+        .limit(limit) \
+        .all()
@@ -0,0 +1,152 @@
+# repositories/processing_job_repository.py
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from models.entities.processing_job import ProcessingJob
+from models.enums import JobClass, JobStatus
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def enqueue(db: Session, call_id: UUID, job_class: JobClass) -> ProcessingJob:
+    job = ProcessingJob(call_id=call_id, job_class=job_class, job_status=JobStatus.QUEUED, enqueued_at=_now())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next(db: Session, job_class: JobClass, worker_id: str) -> Optional[ProcessingJob]:
+    """
+    Atomically move the oldest queued job of a class to RUNNING and return it.
+    On PostgreSQL concurrent workers skip each other's locked rows; on SQLite the
+    conditional UPDATE makes sure only one worker wins a given job.
+    """
+    available = or_(ProcessingJob.available_at.is_(None), ProcessingJob.available_at <= _now().replace(tzinfo=None))
+    candidate = db.query(ProcessingJob.id) \
+        .filter(ProcessingJob.job_status == JobStatus.QUEUED, ProcessingJob.job_class == job_class, available) \
+        .order_by(ProcessingJob.enqueued_at) \
+        .with_for_update(skip_locked=True) \
+        .first()
+    if not candidate:
+        db.commit()
+        return None
+
+    now = _now()
+    claimed = db.query(ProcessingJob) \
+        .filter(ProcessingJob.id == candidate.id, ProcessingJob.job_status == JobStatus.QUEUED) \
+        .update({
+            ProcessingJob.job_status: JobStatus.RUNNING,
+            ProcessingJob.worker_id: worker_id,
+            ProcessingJob.attempts: ProcessingJob.attempts + 1,
+            ProcessingJob.started_at: now,
+            ProcessingJob.heartbeat_at: now,
+        }, synchronize_session=False)
+    db.commit()
+
+    if not claimed:
+        return None
+    return db.query(ProcessingJob).filter(ProcessingJob.id == candidate.id).first()
+
+
+def mark_completed(db: Session, job_id: UUID):
+    db.query(ProcessingJob).filter(ProcessingJob.id == job_id).update({
+        ProcessingJob.job_status: JobStatus.COMPLETED,
+        ProcessingJob.finished_at: _now(),
+        ProcessingJob.error: None,
+    }, synchronize_session=False)
+    db.commit()
+
+
+def mark_failed(db: Session, job_id: UUID, error: str):
+    db.query(ProcessingJob).filter(ProcessingJob.id == job_id).update({
+        ProcessingJob.job_status: JobStatus.FAILED,
+        ProcessingJob.finished_at: _now(),
+        ProcessingJob.error: error,
+    }, synchronize_session=False)
+    db.commit()
+
+
+def park(db: Session, job_id: UUID, delay_seconds: float, error: str):
+    """
+    Put a claimed job back on the queue, not to be claimed again for `delay_seconds`.
+    The attempt is not counted, since the job never got to run.
+    """
+    db.query(ProcessingJob).filter(ProcessingJob.id == job_id).update({
+        ProcessingJob.job_status: JobStatus.QUEUED,
+        ProcessingJob.worker_id: None,
+        ProcessingJob.attempts: ProcessingJob.attempts - 1,
+        ProcessingJob.available_at: _now() + timedelta(seconds=delay_seconds),
+        ProcessingJob.error: error,
+    }, synchronize_session=False)
+    db.commit()
+
+
+def heartbeat(db: Session, job_ids: List[UUID]):
+    if not job_ids:
+        return
+    db.query(ProcessingJob).filter(ProcessingJob.id.in_(job_ids)).update(
+        {ProcessingJob.heartbeat_at: _now()}, synchronize_session=False
+    )
+    db.commit()
+
+
+def requeue_stale(db: Session, heartbeat_before: datetime, max_attempts: int) -> int:
+    """
+    Return RUNNING jobs whose worker stopped heart-beating to the queue,
+    or fail them once they have used up their attempts.
+    """
+    stale = ProcessingJob.job_status == JobStatus.RUNNING
+    stale_before = ProcessingJob.heartbeat_at < heartbeat_before.replace(tzinfo=None)
+
+    requeued = db.query(ProcessingJob) \
+        .filter(stale, stale_before, ProcessingJob.attempts < max_attempts) \
+        .update({ProcessingJob.job_status: JobStatus.QUEUED, ProcessingJob.worker_id: None},
+                synchronize_session=False)
+    db.query(ProcessingJob) \
+        .filter(stale, stale_before, ProcessingJob.attempts >= max_attempts) \
+        .update({ProcessingJob.job_status: JobStatus.FAILED, ProcessingJob.finished_at: _now(),
+                 ProcessingJob.error: "Worker stopped responding"},
+                synchronize_session=False)
+    db.commit()
+    return requeued
+
+
+def requeue(db: Session, job_ids: List[UUID], max_attempts: int, error: str) -> int:
+    """
+    Return running jobs whose process died to the queue, or fail them once they have used
+    up their attempts (so a job that keeps crashing its process is not retried forever).
+    """
+    if not job_ids:
+        return 0
+    running = and_(ProcessingJob.id.in_(job_ids), ProcessingJob.job_status == JobStatus.RUNNING)
+
+    requeued = db.query(ProcessingJob) \
+        .filter(running, ProcessingJob.attempts < max_attempts) \
+        .update({ProcessingJob.job_status: JobStatus.QUEUED, ProcessingJob.worker_id: None,
+                 ProcessingJob.error: error},
+                synchronize_session=False)
+    db.query(ProcessingJob) \
+        .filter(running, ProcessingJob.attempts >= max_attempts) \
+        .update({ProcessingJob.job_status: JobStatus.FAILED, ProcessingJob.finished_at: _now(),
+                 ProcessingJob.error: error},
+                synchronize_session=False)
+    db.commit()
+    return requeued
+
+
+def count_by_status(db: Session) -> Dict[str, Dict[str, int]]:
+    """Job counts as {job_class: {job_status: count}}."""
+    counts: Dict[str, Dict[str, int]] = {}
+    rows = db.query(ProcessingJob.job_class, ProcessingJob.job_status, func.count(ProcessingJob.id)) \
+        .group_by(ProcessingJob.job_class, ProcessingJob.job_status) \
+        .all()
+    for job_class, job_status, count in rows:
+        counts.setdefault(job_class.value, {})[job_status.value] = count
+    return counts
@@ -0,0 +1,427 @@
+# repositories/search_repository.py
+
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from models.entities.insight import Insight
+from models.entities.transcript import Transcript
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+SEARCH_TABLE = "transcript_search"
+# FTS5 columns cannot be indexed, so transcript ids are mapped to the FTS table's rowid here
+SEARCH_ROWID_TABLE = "transcript_search_rowid"
+SEARCH_FIELDS = ["transcript_text", "ai_summary", "refined_summary", "user_summary"]
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+_QUERY_TERM_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Backend chosen per engine URL by init_index(): "fts5", "postgres" or "memory"
+_backends: Dict[str, str] = {}
+
+
+def _backend_for(db: Session) -> str:
+    return _backends.get(str(db.get_bind().url), "memory")
+
+
+def parse_query(query: str) -> List[str]:
+    """
+    Split a user query into terms, keeping double-quoted phrases together.
+    e.g. 'john "wire transfer"' -> ['john', 'wire transfer']
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM_PATTERN.findall(query or ""):
+        term = (phrase or word).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall(value.lower()) if value else []
+
+
+# --- Index setup ---
+def init_index(engine: Engine):
+    """
+    Create the search index for the given engine and remember which backend it uses.
+    SQLite uses an FTS5 virtual table, PostgreSQL a tsvector table with a GIN index,
+    and anything else (or SQLite without FTS5) falls back to the in-process index.
+    """
+    backend = "memory"
+    try:
+        with engine.begin() as connection:
+            if engine.dialect.name == "sqlite":
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                    "transcript_id UNINDEXED, call_id UNINDEXED, "
+                    f"{', '.join(SEARCH_FIELDS)}, "
+                    "tokenize='porter unicode61')"
+                ))
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {SEARCH_ROWID_TABLE} ("
+                    "transcript_id TEXT PRIMARY KEY, search_rowid INTEGER NOT NULL)"
+                ))
+                # Indexes built before the mapping existed get it filled in once
+                if connection.execute(text(f"SELECT 1 FROM {SEARCH_ROWID_TABLE} LIMIT 1")).first() is None:
+                    connection.execute(text(
+                        f"INSERT OR IGNORE INTO {SEARCH_ROWID_TABLE} (transcript_id, search_rowid) "
+                        f"SELECT transcript_id, rowid FROM {SEARCH_TABLE}"
+                    ))
+                backend = "fts5"
+            elif engine.dialect.name == "postgresql":
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                    "transcript_id UUID PRIMARY KEY, call_id UUID NOT NULL, "
+                    f"{', '.join(f'{field} TEXT' for field in SEARCH_FIELDS)}, "
+                    "document TSVECTOR NOT NULL)"
+                ))
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+                    f"ON {SEARCH_TABLE} USING GIN (document)"
+                ))
+                backend = "postgres"
+    except Exception as e:
+        print(f"Full-text search unavailable, using in-process index: {str(e)}")
+        backend = "memory"
+
+    _backends[str(engine.url)] = backend
+    return backend
+
+
+def share_index(engine: Engine, source: Engine):
+    """Use the backend detected for `source` (the primary) on `engine`, a read replica of it."""
+    _backends[str(engine.url)] = _backends.get(str(source.url), "memory")
+
+
+# --- Source documents ---
+def _document_query(db: Session):
+    return db.query(
+        Transcript.id, Transcript.call_id, Transcript.transcript_text,
+        Insight.ai_summary, Insight.refined_summary, Insight.user_summary
+    ).outerjoin(Insight, Insight.transcript_id == Transcript.id)
+
+
+def _document(row) -> Tuple[str, str, Dict[str, Optional[str]]]:
+    return str(row.id), str(row.call_id), {
+        "transcript_text": row.transcript_text,
+        "ai_summary": row.ai_summary,
+        "refined_summary": row.refined_summary,
+        "user_summary": row.user_summary,
+    }
+
+
+def get_documents(db: Session, transcript_id):
+    """Yield (transcript_id, call_id, fields) for indexing one transcript, straight from the source tables."""
+    for row in _document_query(db).filter(Transcript.id == transcript_id):
+        yield _document(row)
+
+
+def get_document_batches(db: Session, batch_size: int = 1000):
+    """
+    Yield every transcript's documents in batches of (transcript_id, call_id, fields), paged by
+    transcript id so the caller can commit between batches without holding a cursor open.
+    """
+    last_id = None
+    while True:
+        query = _document_query(db)
+        if last_id is not None:
+            query = query.filter(Transcript.id > last_id)
+        rows = query.order_by(Transcript.id).limit(batch_size).all()
+        if not rows:
+            return
+
+        last_id = rows[-1].id
+        yield [_document(row) for row in rows]
+
+
+# --- Writes ---
+def _fts5_rowid(db: Session, transcript_id: str) -> Optional[int]:
+    return db.execute(
+        text(f"SELECT search_rowid FROM {SEARCH_ROWID_TABLE} WHERE transcript_id = :transcript_id"),
+        {"transcript_id": transcript_id}
+    ).scalar()
+
+
+def upsert(db: Session, transcript_id: str, call_id: str, fields: Dict[str, Optional[str]]):
+    """Insert or replace the indexed document for a transcript. The caller commits."""
+    backend = _backend_for(db)
+    values = {field: fields.get(field) or "" for field in SEARCH_FIELDS}
+
+    if backend == "fts5":
+        # Replace the document under its existing rowid; transcript_id itself is not indexed
+        rowid = _fts5_rowid(db, transcript_id)
+        if rowid is not None:
+            db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {"rowid": rowid})
+        result = db.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, transcript_id, call_id, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (:rowid, :transcript_id, :call_id, {', '.join(':' + field for field in SEARCH_FIELDS)})"
+        ), {"rowid": rowid, "transcript_id": transcript_id, "call_id": call_id, **values})
+        if rowid is None:
+            db.execute(text(
+                f"INSERT INTO {SEARCH_ROWID_TABLE} (transcript_id, search_rowid) VALUES (:transcript_id, :rowid)"
+            ), {"transcript_id": transcript_id, "rowid": result.lastrowid})
+    elif backend == "postgres":
+        # Summaries are weighted above the raw transcript so they rank first
+        document = (
+            "setweight(to_tsvector('english', :refined_summary), 'A') || "
+            "setweight(to_tsvector('english', :user_summary), 'A') || "
+            "setweight(to_tsvector('english', :ai_summary), 'B') || "
+            "setweight(to_tsvector('english', :transcript_text), 'C')"
+        )
+        db.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (transcript_id, call_id, {', '.join(SEARCH_FIELDS)}, document) "
+            f"VALUES (:transcript_id, :call_id, {', '.join(':' + field for field in SEARCH_FIELDS)}, {document}) "
+            "ON CONFLICT (transcript_id) DO UPDATE SET "
+            f"{', '.join(f'{field} = EXCLUDED.{field}' for field in SEARCH_FIELDS)}, "
+            "document = EXCLUDED.document"
+        ), {"transcript_id": transcript_id, "call_id": call_id, **values})
+    else:
+        memory_index.upsert(transcript_id, call_id, values)
+
+
+def delete(db: Session, transcript_id: str):
+    """Remove a transcript's indexed document. The caller commits."""
+    backend = _backend_for(db)
+    if backend == "fts5":
+        rowid = _fts5_rowid(db, transcript_id)
+        if rowid is not None:
+            db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {"rowid": rowid})
+            db.execute(text(f"DELETE FROM {SEARCH_ROWID_TABLE} WHERE transcript_id = :transcript_id"),
+                       {"transcript_id": transcript_id})
+    elif backend == "postgres":
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE transcript_id = :transcript_id"),
+                   {"transcript_id": transcript_id})
+    else:
+        memory_index.delete(transcript_id)
+
+
+# --- Reads ---
+def search(db: Session, query: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+    """
+    Run a ranked search and return (total_matches, page_of_results).
+    Each result has transcript_id, call_id, rank (higher is better) and highlight.
+    """
+    terms = parse_query(query)
+    if not terms:
+        return 0, []
+
+    backend = _backend_for(db)
+    if backend == "fts5":
+        return _search_fts5(db, terms, limit, offset)
+    if backend == "postgres":
+        return _search_postgres(db, terms, limit, offset)
+    return memory_index.search(terms, limit, offset)
+
+
+def _search_fts5(db: Session, terms: List[str], limit: int, offset: int) -> Tuple[int, List[dict]]:
+    # Quote every term so user input can never be parsed as FTS5 syntax
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    total = db.execute(
+        text(f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match"),
+        {"match": match}
+    ).scalar()
+
+    # bm25() weights follow column order; summaries count more than the raw transcript
+    rows = db.execute(text(
+        "SELECT transcript_id, call_id, "
+        f"bm25({SEARCH_TABLE}, 0, 0, 1.0, 2.0, 3.0, 3.0) AS score, "
+        f"snippet({SEARCH_TABLE}, -1, :start, :end, '...', 24) AS highlight "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+        "ORDER BY score LIMIT :limit OFFSET :offset"
+    ), {"match": match, "start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "limit": limit, "offset": offset})
+
+    return total, [
+        {
+            "transcript_id": row.transcript_id,
+            "call_id": row.call_id,
+            # bm25() is lower-is-better, flip it so every backend ranks higher-is-better
+            "rank": -float(row.score),
+            "highlight": row.highlight,
+        }
+        for row in rows
+    ]
+
+
+def _search_postgres(db: Session, terms: List[str], limit: int, offset: int) -> Tuple[int, List[dict]]:
+    tsquery = " ".join(f'"{term}"' if " " in term else term for term in terms)
+
+    total = db.execute(text(
+        f"SELECT COUNT(*) FROM {SEARCH_TABLE} "
+        "WHERE document @@ websearch_to_tsquery('english', :query)"
+    ), {"query": tsquery}).scalar()
+
+    # Rank and page first, then only build headlines for the rows on this page
+    rows = db.execute(text(
+        "WITH page AS ("
+        "  SELECT transcript_id, call_id, ts_rank_cd(document, query) AS score, "
+        f"   concat_ws(' ', {', '.join(SEARCH_FIELDS[::-1])}) AS body, query "
+        f"  FROM {SEARCH_TABLE}, websearch_to_tsquery('english', :query) AS query "
+        "  WHERE document @@ query ORDER BY score DESC LIMIT :limit OFFSET :offset"
+        ") "
+        "SELECT transcript_id, call_id, score, "
+        "ts_headline('english', body, query, "
+        "  'StartSel=' || :start || ', StopSel=' || :end || ', MaxFragments=2, MaxWords=24, MinWords=8'"
+        ") AS highlight "
+        "FROM page ORDER BY score DESC"
+    ), {"query": tsquery, "start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "limit": limit, "offset": offset})
+
+    return total, [
+        {
+            "transcript_id": str(row.transcript_id),
+            "call_id": str(row.call_id),
+            "rank": float(row.score),
+            "highlight": row.highlight,
+        }
+        for row in rows
+    ]
+
+
+# --- Pure-Python fallback ---
+class InMemoryIndex:
+    """
+    Inverted index kept in process memory: token -> {transcript_id: term frequency}.
+    Used when the database has no native full-text search. Ranking is TF-IDF with
+    the same field weights as the FTS5 backend.
+    """
+
+    FIELD_WEIGHTS = {"transcript_text": 1.0, "ai_summary": 2.0, "refined_summary": 3.0, "user_summary": 3.0}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._documents: Dict[str, Dict[str, str]] = {}
+        self._call_ids: Dict[str, str] = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._documents)
+
+    def upsert(self, transcript_id: str, call_id: str, fields: Dict[str, str]):
+        with self._lock:
+            self._remove(transcript_id)
+
+            weights = defaultdict(float)
+            for field in SEARCH_FIELDS:
+                for token in tokenize(fields.get(field)):
+                    weights[token] += self.FIELD_WEIGHTS[field]
+
+            for token, weight in weights.items():
+                self._postings[token][transcript_id] = weight
+
+            self._documents[transcript_id] = {field: fields.get(field) or "" for field in SEARCH_FIELDS}
+            self._call_ids[transcript_id] = call_id
+
+    def delete(self, transcript_id: str):
+        with self._lock:
+            self._remove(transcript_id)
+
+    def _remove(self, transcript_id: str):
+        document = self._documents.pop(transcript_id, None)
+        self._call_ids.pop(transcript_id, None)
+        if not document:
+            return
+
+        for token in set(token for field in SEARCH_FIELDS for token in tokenize(document[field])):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(transcript_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def search(self, terms: List[str], limit: int, offset: int) -> Tuple[int, List[dict]]:
+        with self._lock:
+            total_documents = len(self._documents) or 1
+            scores: Optional[Dict[str, float]] = None
+
+            for term in terms:
+                tokens = tokenize(term)
+                if not tokens:
+                    continue
+
+                # Intersect postings for every token of the term (AND semantics)
+                candidates = None
+                for token in tokens:
+                    postings = self._postings.get(token, {})
+                    candidates = set(postings) if candidates is None else candidates & set(postings)
+                candidates = candidates or set()
+
+                # Phrases must also appear verbatim in one of the fields
+                if len(tokens) > 1:
+                    phrase = " ".join(tokens)
+                    candidates = {
+                        transcript_id for transcript_id in candidates
+                        if any(phrase in " ".join(tokenize(value))
+                               for value in self._documents[transcript_id].values())
+                    }
+
+                term_scores = {}
+                for token in tokens:
+                    postings = self._postings.get(token, {})
+                    idf = math.log(1 + total_documents / (1 + len(postings)))
+                    for transcript_id in candidates:
+                        term_scores[transcript_id] = term_scores.get(transcript_id, 0.0) \
+                                                     + postings[transcript_id] * idf
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {transcript_id: score + term_scores[transcript_id]
+                              for transcript_id, score in scores.items() if transcript_id in term_scores}
+
+            ranked = sorted((scores or {}).items(), key=lambda item: item[1], reverse=True)
+            page = ranked[offset:offset + limit]
+
+            return len(ranked), [
+                {
+                    "transcript_id": transcript_id,
+                    "call_id": self._call_ids[transcript_id],
+                    "rank": score,
+                    "highlight": self._highlight(transcript_id, terms),
+                }
+                for transcript_id, score in page
+            ]
+
+    def _highlight(self, transcript_id: str, terms: List[str], window: int = 120) -> str:
+        document = self._documents[transcript_id]
+        patterns = [re.compile(r"\b" + r"\W+".join(map(re.escape, tokenize(term))) + r"\b", re.IGNORECASE)
+                    for term in terms if tokenize(term)]
+
+        for field in ["refined_summary", "user_summary", "ai_summary", "transcript_text"]:
+            value = document[field]
+            first = min((m.start() for p in patterns for m in [p.search(value)] if m), default=None)
+            if first is None:
+                continue
+
+            start = max(0, first - window // 2)
+            fragment = value[start:start + window]
+            for pattern in patterns:
+                fragment = pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}", fragment)
+            return ("..." if start > 0 else "") + fragment + ("..." if start + window < len(value) else "")
+
+        return ""
+
+
+memory_index = InMemoryIndex()
+
+
+def is_empty(db: Session) -> bool:
+    if _backend_for(db) == "memory":
+        return len(memory_index) == 0
+    return db.execute(text(f"SELECT 1 FROM {SEARCH_TABLE} LIMIT 1")).first() is None
+
+
+def is_loaded(db: Session) -> bool:
+    return _backend_for(db) != "memory" or memory_index.loaded
+
+
+def mark_loaded():
+    memory_index.loaded = True
@@ -1,9 +1,12 @@
 # repositories/transcript_repository.py
 
 from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from models.entities.call import Call
 from models.entities.transcript import Transcript
+from models.enums import TranscriptStatus
 from sqlalchemy.orm import Session
 
 
@@ -29,5 +32,64 @@ def create(db: Session, call_id: UUID, file_name: str, transcript_text: str, fil
     return transcript
 
 
+def get_by_id(db: Session, transcript_id: UUID) -> Transcript:
+    return db.query(Transcript).filter(Transcript.id == transcript_id).first()
+
+
 def get_by_call_id(db: Session, call_id: UUID) -> Transcript:
-    return db.query(Transcript).filter(Transcript.call_id == call_id).all()
+    # Insertion order, not uploaded_at: replacing a transcript must not reorder the call's summary inputs
+    return db.query(Transcript).filter(Transcript.call_id == call_id) \
+        .order_by(Transcript.created_at, Transcript.id) \
+        .all()
+
+
+def claim_due_retries(db: Session, now: datetime, lease_until: datetime) -> List[UUID]:
+    """
+    Return the calls that have transcripts due for a retry, pushing those transcripts'
+    next_attempt_at to `lease_until` so the next sweep does not schedule them again.
+    """
+    due = db.query(Transcript.id, Transcript.call_id) \
+        .filter(Transcript.transcript_status == TranscriptStatus.RETRYING,
+                Transcript.next_attempt_at <= now.replace(tzinfo=None)) \
+        .all()
+    if not due:
+        return []
+
+    call_ids = list({call_id for _, call_id in due})
+    db.query(Transcript).filter(Transcript.id.in_([transcript_id for transcript_id, _ in due])).update(
+        {Transcript.next_attempt_at: lease_until}, synchronize_session=False
+    )
+    _touch_calls(db, call_ids)
+    db.commit()
+    return call_ids
+
+
+def reset_failed(db: Session, call_id: Optional[UUID] = None) -> Tuple[int, List[UUID]]:
+    """
+    Move FAILED transcripts (optionally of a single call) back to PENDING.
+    Returns the number of transcripts reset and the calls they belong to.
+    """
+    query = db.query(Transcript).filter(Transcript.transcript_status == TranscriptStatus.FAILED)
+    if call_id is not None:
+        query = query.filter(Transcript.call_id == call_id)
+
+    call_ids = list({row.call_id for row in query.with_entities(Transcript.call_id).all()})
+    if not call_ids:
+        return 0, []
+
+    count = query.update({
+        Transcript.transcript_status: TranscriptStatus.PENDING,
+        Transcript.attempts: 0,
+        Transcript.last_error: None,
+        Transcript.next_attempt_at: None,
+    }, synchronize_session=False)
+    _touch_calls(db, call_ids)
+    db.commit()
+    return count, call_ids
+
+
+def _touch_calls(db: Session, call_ids: List[UUID]):
+    # Bulk updates skip the ORM flush hook that keeps Call.updated_at current (summary cache versions)
+    db.query(Call).filter(Call.id.in_(call_ids)).update(
+        {Call.updated_at: datetime.now(timezone.utc)}, synchronize_session=False
+    )
@@ -0,0 +1,44 @@
+# repositories/transcript_turn_repository.py
+
+from typing import List, Optional
+from uuid import UUID
+
+from models.entities.transcript_turn import TranscriptTurn
+from models.enums import SpeakerRole
+from sqlalchemy.orm import Session
+
+
+def replace_for_transcript(db: Session, transcript_id: UUID, turns: List[dict]):
+    """
+    Replace all turns of a transcript with a single DELETE and one bulk INSERT.
+    Each turn is a dict with speaker, speaker_role, start_offset and end_offset.
+    """
+    db.query(TranscriptTurn).filter(TranscriptTurn.transcript_id == transcript_id).delete(synchronize_session=False)
+    db.bulk_insert_mappings(TranscriptTurn, [
+        {"transcript_id": transcript_id, "turn_index": index, **turn}
+        for index, turn in enumerate(turns)
+    ])
+    db.commit()
+
+
+def get_range(
+        db: Session,
+        transcript_id: UUID,
+        start_index: int = 0,
+        end_index: Optional[int] = None,
+        roles: Optional[List[SpeakerRole]] = None
+) -> List[TranscriptTurn]:
+    """Turns with start_index <= turn_index < end_index, optionally limited to some speaker roles."""
+    query = db.query(TranscriptTurn) \
+        .filter(TranscriptTurn.transcript_id == transcript_id, TranscriptTurn.turn_index >= start_index)
+
+    if end_index is not None:
+        query = query.filter(TranscriptTurn.turn_index < end_index)
+    if roles:
+        query = query.filter(TranscriptTurn.speaker_role.in_(roles))
+
+    return query.order_by(TranscriptTurn.turn_index).all()
+
+
+def count_for_transcript(db: Session, transcript_id: UUID) -> int:
+    return db.query(TranscriptTurn).filter(TranscriptTurn.transcript_id == transcript_id).count()
@@ -0,0 +1,331 @@
+# repositories/vector_repository.py
+
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # Optional: without it every query is a brute-force scan
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+# How often a process looks for shards written by other processes
+REFRESH_SECONDS = 5.0
+
+
+class VectorIndex:
+    """
+    Persisted vector index keyed by insight id, shared by the API and worker processes.
+
+    Vectors (L2-normalised, float32) live in a NumPy matrix that is always the source
+    of truth and is searched by brute force while the index is small. Once it grows past
+    `ann_threshold` and hnswlib is installed, an HNSW graph is built over the same rows
+    and used for queries. On disk:
+      - {path}.npz            vectors, ids and source-text hashes (written by compact())
+      - {path}.hnsw           the HNSW graph over {path}.npz (only when built)
+      - {path}.shard-{pid}.npz  vectors embedded by one process since the last compaction
+
+    Each process only ever writes its own shard, so processes never overwrite each other's
+    vectors; loading merges the main file with every shard, and picks up other processes'
+    shards as they change.
+    """
+
+    def __init__(self, path: str, ann_threshold: int):
+        self.path = path
+        self.ann_threshold = ann_threshold
+
+        self._lock = threading.RLock()
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: List[Optional[str]] = []
+        self._hashes: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._ann = None
+        # Insight ids embedded by this process, saved to its shard
+        self._own: Set[str] = set()
+        self._signature: Optional[tuple] = None
+        self._checked_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    # --- Persistence ---
+    def _shard_path(self) -> str:
+        # Looked up on every save: pool processes are forked after the index is created
+        return f"{self.path}.shard-{os.getpid()}.npz"
+
+    def _files(self) -> List[str]:
+        """The main file (if any) followed by every shard, oldest first."""
+        shards = []
+        for shard in glob.glob(glob.escape(self.path) + ".shard-*.npz"):
+            try:
+                shards.append((os.path.getmtime(shard), shard))
+            except OSError:  # Removed by a compaction in the meantime
+                continue
+        main = [self.path + ".npz"] if os.path.exists(self.path + ".npz") else []
+        return main + [shard for _, shard in sorted(shards)]
+
+    @staticmethod
+    def _file_signature(files: List[str]) -> tuple:
+        signature = []
+        for file in files:
+            try:
+                signature.append((file, os.path.getmtime(file)))
+            except OSError:
+                continue
+        return tuple(signature)
+
+    def load(self):
+        """(Re-)read the index from disk when the main file or any shard changed."""
+        with self._lock:
+            if self._checked_at is not None \
+                    and time.monotonic() - self._checked_at < REFRESH_SECONDS:
+                return
+            self._checked_at = time.monotonic()
+
+            files = self._files()
+            signature = self._file_signature(files)
+            if signature == self._signature:
+                return
+            self._signature = signature
+            self._read(files)
+
+    def _read(self, files: List[str]):
+        own = {insight_id: (self._vectors[self._rows[insight_id]], self._hashes[self._rows[insight_id]])
+               for insight_id in self._own if insight_id in self._rows}
+
+        vectors: List[np.ndarray] = []
+        ids: List[Optional[str]] = []
+        hashes: List[Optional[str]] = []
+        rows: Dict[str, int] = {}
+        main_only = False
+
+        for file in files:
+            try:
+                data = np.load(file, allow_pickle=False)
+                file_vectors, file_ids, file_hashes = data["vectors"], data["ids"].tolist(), data["hashes"].tolist()
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping vector index file {file}: {str(e)}")
+                continue
+
+            if vectors and file_vectors.shape[1] != vectors[0].shape[0]:
+                logger.warning(f"Skipping vector index file {file}: embedding dimensions differ")
+                continue
+
+            if file == self.path + ".npz":
+                # Keep the main file's rows (tombstones included) in place so its HNSW labels stay valid
+                vectors.extend(file_vectors)
+                ids.extend(value or None for value in file_ids)
+                hashes.extend(value or None for value in file_hashes)
+                rows.update({value: row for row, value in enumerate(ids) if value})
+                main_only = True
+                continue
+
+            main_only = False
+            for insight_id, text_hash, vector in zip(file_ids, file_hashes, file_vectors):
+                if not insight_id:
+                    continue
+                row = rows.get(insight_id)
+                if row is None:
+                    rows[insight_id] = len(ids)
+                    vectors.append(vector)
+                    ids.append(insight_id)
+                    hashes.append(text_hash or None)
+                else:
+                    vectors[row] = vector
+                    hashes[row] = text_hash or None
+
+        # This process's own vectors win, even if its shard was not written yet
+        for insight_id, (vector, text_hash) in own.items():
+            if vectors and vector.shape[0] != vectors[0].shape[0]:
+                continue
+            main_only = False
+            row = rows.get(insight_id)
+            if row is None:
+                rows[insight_id] = len(ids)
+                vectors.append(vector)
+                ids.append(insight_id)
+                hashes.append(text_hash)
+            else:
+                vectors[row] = vector
+                hashes[row] = text_hash
+
+        self._vectors = np.asarray(vectors, dtype=np.float32) if vectors else None
+        self._ids, self._hashes, self._rows = ids, hashes, rows
+        self._own &= set(rows)
+        self._ann = None
+
+        if hnswlib is None or self._vectors is None:
+            return
+        if main_only and os.path.exists(self.path + ".hnsw"):
+            self._ann = hnswlib.Index(space="ip", dim=self._vectors.shape[1])
+            self._ann.load_index(self.path + ".hnsw", max_elements=len(self._ids))
+        elif len(self._rows) >= self.ann_threshold:
+            self._build_ann()
+
+    def _write(self, target: str, rows: List[int]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # Write to a temporary file and swap it in, so readers never see a partial index
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as temp_file:
+            np.savez(
+                temp_file,
+                vectors=self._vectors[rows],
+                ids=np.array([self._ids[row] or "" for row in rows]),
+                hashes=np.array([self._hashes[row] or "" for row in rows]),
+            )
+        os.replace(temp_path, target)
+
+    def save(self):
+        """Write the vectors this process embedded to its own shard file."""
+        with self._lock:
+            if self._vectors is None or not self._own:
+                return
+
+            self._write(self._shard_path(), sorted(self._rows[insight_id] for insight_id in self._own))
+            self._signature = self._file_signature(self._files())
+
+    def compact(self):
+        """
+        Fold every shard into the main file (and rebuild its HNSW graph), then delete the shards.
+        Run by a single process; vectors a shard gains while this runs are re-embedded by the next sync.
+        """
+        with self._lock:
+            files = self._files()
+            self._signature = self._file_signature(files)
+            self._checked_at = time.monotonic()
+            self._read(files)
+            if self._vectors is None:
+                return
+
+            self._write(self.path + ".npz", list(range(len(self._ids))))
+            if self._ann is None and hnswlib is not None and len(self._rows) >= self.ann_threshold:
+                self._build_ann()
+            if self._ann is not None:
+                temp_path = f"{self.path}.hnsw.{os.getpid()}.tmp"
+                self._ann.save_index(temp_path)
+                os.replace(temp_path, self.path + ".hnsw")
+
+            for shard in files:
+                if shard != self.path + ".npz":
+                    try:
+                        os.remove(shard)
+                    except OSError:
+                        pass
+
+            self._own.clear()
+            self._signature = self._file_signature(self._files())
+
+    # --- Writes ---
+    def get_hash(self, insight_id: str) -> Optional[str]:
+        with self._lock:
+            self.load()
+            row = self._rows.get(insight_id)
+            return self._hashes[row] if row is not None else None
+
+    def upsert(self, insight_ids: List[str], vectors: np.ndarray, text_hashes: List[str]):
+        """Insert new vectors or overwrite existing ones in place (row numbers are stable)."""
+        with self._lock:
+            self.load()
+
+            if self._vectors is None:
+                self._vectors = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            elif self._vectors.shape[1] != vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimensions changed ({self._vectors.shape[1]} -> {vectors.shape[1]}); "
+                    "rebuild the vector index"
+                )
+
+            new_rows = []
+            for insight_id, vector, text_hash in zip(insight_ids, vectors, text_hashes):
+                row = self._rows.get(insight_id)
+                if row is None:
+                    row = len(self._ids) + len(new_rows)
+                    new_rows.append(vector)
+                    self._ids.append(insight_id)
+                    self._hashes.append(text_hash)
+                    self._rows[insight_id] = row
+                else:
+                    self._vectors[row] = vector
+                    self._hashes[row] = text_hash
+
+            if new_rows:
+                self._vectors = np.vstack([self._vectors, np.asarray(new_rows, dtype=np.float32)])
+
+            self._own.update(insight_ids)
+
+            rows = [self._rows[insight_id] for insight_id in insight_ids]
+            if self._ann is not None:
+                if self._ann.get_max_elements() < len(self._ids):
+                    self._ann.resize_index(max(len(self._ids), self._ann.get_max_elements() * 2))
+                self._ann.add_items(self._vectors[rows], rows)
+            elif hnswlib is not None and len(self._rows) >= self.ann_threshold:
+                self._build_ann()
+
+    def remove(self, insight_id: str):
+        with self._lock:
+            self.load()
+            row = self._rows.pop(insight_id, None)
+            self._own.discard(insight_id)
+            if row is None:
+                return
+
+            # Rows are tombstoned rather than compacted so HNSW labels stay valid
+            self._ids[row] = None
+            self._hashes[row] = None
+            self._vectors[row] = 0.0
+            if self._ann is not None:
+                self._ann.mark_deleted(row)
+
+    def _build_ann(self):
+        live_rows = list(self._rows.values())
+        self._ann = hnswlib.Index(space="ip", dim=self._vectors.shape[1])
+        self._ann.init_index(max_elements=max(len(self._ids) * 2, 1024), ef_construction=200, M=16)
+        self._ann.add_items(self._vectors[live_rows], live_rows)
+        self._ann.set_ef(64)
+
+    # --- Reads ---
+    def get_vectors(self, insight_ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        with self._lock:
+            self.load()
+            found = [insight_id for insight_id in insight_ids if insight_id in self._rows]
+            if not found:
+                return [], np.zeros((0, 0), dtype=np.float32)
+            return found, self._vectors[[self._rows[insight_id] for insight_id in found]].copy()
+
+    def query(self, vectors: np.ndarray, k: int) -> List[List[Tuple[str, float]]]:
+        """Return the k nearest insight ids (cosine similarity, highest first) for each query vector."""
+        with self._lock:
+            self.load()
+            if not self._rows or len(vectors) == 0:
+                return [[] for _ in range(len(vectors))]
+
+            k = min(k, len(self._rows))
+
+            if self._ann is not None:
+                labels, distances = self._ann.knn_query(vectors, k=k)
+                # hnswlib's "ip" space reports 1 - dot product as the distance
+                return [
+                    [(self._ids[label], float(1.0 - distance)) for label, distance in zip(row_labels, row_distances)]
+                    for row_labels, row_distances in zip(labels, distances)
+                ]
+
+            # Over-fetch by the number of tombstoned rows, then drop them
+            fetch = min(k + len(self._ids) - len(self._rows), len(self._ids))
+            scores = vectors @ self._vectors.T
+            top = np.argpartition(-scores, fetch - 1, axis=1)[:, :fetch]
+
+            results = []
+            for query_row, candidates in enumerate(top):
+                ordered = candidates[np.argsort(-scores[query_row, candidates])]
+                results.append([
+                    (self._ids[row], float(scores[query_row, row])) for row in ordered if self._ids[row] is not None
+                ][:k])
+            return results
@@ -0,0 +1,240 @@
+# services/admission_service.py
+
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from config import loaded_config
+from constants.constants import MAX_TRANSCRIPTS_PER_CALL
+from database import get_db
+from fastapi import HTTPException
+from models.enums import JobClass, JobStatus
+from repositories import processing_job_repository
+from services import scheduler_service
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+# Multipart boundaries and part headers on top of the transcript bytes themselves
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class AdmissionError(Exception):
+    """An upload turned away: 429 when the client is over its quota, 503 when the service is overloaded."""
+
+    def __init__(self, status_code: int, message: str, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ClientQuotas:
+    """Per-client token buckets: `rate_per_minute` uploads on average, bursts of up to `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: int, max_clients: int = 10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # client -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, client: str) -> float:
+        """Take one upload from the client's bucket; returns 0, or the seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(client, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+            if tokens < 1.0:
+                self._buckets[client] = (tokens, now)
+                return (1.0 - tokens) / self.rate
+
+            self._buckets[client] = (tokens - 1.0, now)
+            if len(self._buckets) > self.max_clients:
+                # Full buckets carry no state worth keeping
+                self._buckets = {key: value for key, value in self._buckets.items()
+                                 if value[0] + (now - value[1]) * self.rate < self.burst}
+            return 0.0
+
+
+class AdmissionController:
+    """
+    Decides whether an upload is accepted, before its body is read:
+    - per-client quotas (429)
+    - pending processing work, from the in-process scheduler or the durable job queue (503).
+      Backfill uploads are shed first, once pending work reaches ADMISSION_BACKFILL_SHARE
+      of the limit, so interactive uploads keep getting through under load.
+    """
+
+    def __init__(self):
+        self.quotas = ClientQuotas(config.ADMISSION_CLIENT_UPLOADS_PER_MINUTE, config.ADMISSION_CLIENT_BURST)
+        self._queue_depth: Optional[int] = None
+        self._queue_depth_checked_at = 0.0
+        self._lock = threading.Lock()
+        self._rejected = {"quota": 0, "overload": 0, "too_large": 0}
+
+    def pending_work(self) -> int:
+        if config.PROCESSING_MODE != "worker":
+            return scheduler_service.scheduler.queue_depth() + scheduler_service.scheduler.running_count()
+
+        # The durable queue is shared by every API process; counted at most once per interval
+        now = time.monotonic()
+        if self._queue_depth is None or now - self._queue_depth_checked_at >= config.ADMISSION_QUEUE_CHECK_SECONDS:
+            db = next(get_db())
+            try:
+                counts = processing_job_repository.count_by_status(db)
+            finally:
+                db.close()
+            self._queue_depth = sum(
+                by_status.get(JobStatus.QUEUED.value, 0) + by_status.get(JobStatus.RUNNING.value, 0)
+                for by_status in counts.values()
+            )
+            self._queue_depth_checked_at = now
+        return self._queue_depth
+
+    def admit_upload(self, client: str, job_class: JobClass):
+        """Raise AdmissionError if this upload should be turned away."""
+        limit = config.ADMISSION_MAX_PENDING_JOBS
+        if limit > 0:
+            if job_class == JobClass.BACKFILL:
+                limit = int(limit * config.ADMISSION_BACKFILL_SHARE)
+            pending = self.pending_work()
+            if pending >= limit:
+                self._count("overload")
+                # Rough time for the backlog above the limit to drain, never below the base delay
+                retry_after = config.ADMISSION_RETRY_AFTER_SECONDS * max(1.0, pending / max(limit, 1))
+                raise AdmissionError(503, f"Service is busy ({pending} jobs pending), retry later", retry_after)
+
+        wait = self.quotas.take(client)
+        if wait > 0:
+            self._count("quota")
+            raise AdmissionError(429, "Upload quota exceeded for this client", wait)
+
+    def record_too_large(self):
+        self._count("too_large")
+
+    def _count(self, reason: str):
+        with self._lock:
+            self._rejected[reason] += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            rejected = dict(self._rejected)
+        return {
+            "pending_work": self.pending_work(),
+            "max_pending_jobs": config.ADMISSION_MAX_PENDING_JOBS,
+            "client_uploads_per_minute": config.ADMISSION_CLIENT_UPLOADS_PER_MINUTE,
+            "rejected": rejected,
+        }
+
+
+controller = AdmissionController()
+
+
+def get_stats() -> dict:
+    return controller.get_stats()
+
+
+def max_upload_bytes() -> int:
+    return MAX_TRANSCRIPTS_PER_CALL * config.MAX_TRANSCRIPT_LENGTH + _MULTIPART_OVERHEAD_BYTES
+
+
+def client_identity(scope, headers: Dict[str, str]) -> str:
+    """
+    The quota key for a request: the peer IP, unless the peer is a trusted proxy, in which
+    case the client it names. Headers from anyone else are ignored, so they cannot be
+    rotated to get a fresh quota.
+    """
+    peer = (scope.get("client") or ("unknown",))[0]
+    if peer not in config.ADMISSION_TRUSTED_PROXIES:
+        return peer
+
+    client_id = headers.get("x-client-id", "").strip()
+    if client_id:
+        return client_id
+
+    # Each proxy appends the address it received from, so the client can only forge the
+    # left of the list: the first untrusted hop from the right is the real client
+    hops = [hop.strip() for hop in headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in config.ADMISSION_TRUSTED_PROXIES:
+            return hop
+    return hops[0] if hops else peer
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware for the upload endpoints, all of which schedule processing. It admits or
+    rejects an upload before its body is read. It then enforces the size limit while the body streams in: a declared
+    Content-Length over the limit is rejected up front, and a body that grows past it is cut
+    off with a 413 without being buffered.
+    """
+
+    UPLOAD_PATHS = ("/upload_call", "/add_transcripts/", "/replace_transcript/")
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT") \
+                or not any(path in scope["path"] for path in self.UPLOAD_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        max_bytes = max_upload_bytes()
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            controller.record_too_large()
+            await self._reject(send, 413, f"Upload exceeds {max_bytes} bytes")
+            return
+
+        client = client_identity(scope, headers)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            job_class = JobClass(query.get("job_class", [JobClass.INTERACTIVE.value])[0])
+        except ValueError:
+            job_class = JobClass.INTERACTIVE  # The route itself rejects the invalid value
+
+        try:
+            if config.PROCESSING_MODE == "worker":
+                # Counting the durable queue is a blocking DB query; keep it off the event loop
+                await asyncio.to_thread(controller.admit_upload, client, job_class)
+            else:
+                controller.admit_upload(client, job_class)
+        except AdmissionError as e:
+            logger.warning(f"Rejected upload from {client}: {str(e)}")
+            await self._reject(send, e.status_code, str(e), e.retry_after)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    controller.record_too_large()
+                    # Raised while the route parses the body; FastAPI passes HTTPExceptions through
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, status_code: int, detail: str, retry_after: Optional[float] = None):
+        headers = [(b"content-type", b"application/json")]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(math.ceil(retry_after)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode("utf-8")})
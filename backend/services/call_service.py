@@ -2,35 +2,250 @@
 
 import asyncio
 import logging
-from datetime import datetime, timezone
-from typing import List
+from typing import Callable, List, Optional, Set, Tuple
 from uuid import UUID
 
-from clients import llm_client
+from clients.resilience import CircuitOpenError
+from config import loaded_config
+from constants.constants import MAX_TRANSCRIPTS_PER_CALL
 from database import get_db
-from fastapi import UploadFile
+from fastapi import UploadFile, HTTPException
 from models.entities.call import Call
-from models.enums import CallStatus
-from repositories import call_repository
-from services import transcript_service
+from models.entities.transcript import Transcript
+from models.enums import CallStatus, JobClass, TranscriptStatus
+from repositories import call_repository, processing_job_repository, transcript_repository
+from services import call_summary_service, call_view_service, idempotency_service, scheduler_service, \
+    search_service, similarity_service, summary_service, transcript_service
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+config = loaded_config
+
+# Background tasks of upload pipelines; the event loop only keeps weak references to tasks
+_pipeline_tasks: Set[asyncio.Task] = set()
+
 
 async def create_call(
         db: Session,
         files: List[UploadFile],
+        call_id: UUID = None,
+        on_stored: Optional[Callable[[Transcript], None]] = None,
+) -> Call:
+    """
+    Create a new call entry in the database and return it. `on_stored` is called with
+    each transcript as soon as it is committed.
+    """
+    call = call_repository.create(db, call_id)
+    if on_stored is not None:
+        # Extraction starts before the upload finishes; keeps add_transcripts out meanwhile
+        call.call_status = CallStatus.PROCESSING
+        call_repository.save(db, call)
+
+    for file in files:
+        transcript = await transcript_service.create_transcript(db, call.id, file)
+        if on_stored is not None:
+            on_stored(transcript)
+
+    call_view_service.refresh(db, call.id)
+    return call
+
+
+async def create_call_idempotent(
+        db: Session,
+        files: List[UploadFile],
+        idempotency_key: Optional[str] = None,
+        on_stored: Optional[Callable[[Transcript], None]] = None,
+        on_failed: Optional[Callable[[UUID], None]] = None,
+) -> Tuple[UUID, bool]:
+    """
+    Create a call unless this upload is a retry of one we already accepted.
+    Returns (call_id, created): created is False for a retry, in which case the
+    existing call is returned and nothing is (re-)scheduled for processing.
+    If storing the upload fails, the partial call is deleted, or handed to `on_failed`.
+    """
+    contents = []
+    for file in files:
+        contents.append((file.filename, await file.read()))
+        await file.seek(0)
+
+    content_hash = idempotency_service.compute_content_hash(contents)
+    call_id, created = idempotency_service.reserve(db, idempotency_key, content_hash)
+    if not created:
+        return call_id, False
+
+    try:
+        await create_call(db, files, call_id, on_stored)
+    except Exception:
+        db.rollback()
+        # The call and any transcripts stored before the failure are already committed
+        if on_failed is not None:
+            on_failed(call_id)
+        else:
+            discard_call(db, call_id)
+        idempotency_service.release(db, call_id, idempotency_key, content_hash)
+        raise
+
+    return call_id, True
+
+
+def discard_call(db: Session, call_id: UUID):
+    """Delete a call whose upload failed part-way, with its transcripts and their search entries."""
+    try:
+        for transcript_id in call_repository.delete_with_transcripts(db, call_id):
+            search_service.remove_transcript(db, transcript_id)
+        db.commit()
+        summary_service.invalidate(call_id)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to discard partially uploaded call {call_id}: {str(e)}")
+
+
+class UploadPipeline:
+    """
+    Speculative extraction for a call being uploaded: each transcript is scheduled for
+    extraction as soon as it is stored, and the call-level stage runs once the upload is
+    complete and every extraction has finished (fan-in barrier).
+    """
+
+    def __init__(self, job_class: JobClass):
+        self.job_class = job_class
+        self._extractions: List[asyncio.Future] = []
+        self._aborted = False
+
+    def add(self, transcript: Transcript):
+        transcript_id = transcript.id
+        self._extractions.append(scheduler_service.submit(
+            self.job_class,
+            f"extract_transcript:{transcript_id}",
+            lambda: self._extract(transcript_id)
+        ))
+
+    def seal(self, call_id: UUID):
+        """No more transcripts are coming; run the call stage after the last extraction."""
+        self._track(self._finish(call_id, list(self._extractions)))
+
+    def abort(self, call_id: UUID):
+        """
+        The upload failed: extractions that have not started yet are skipped, and the partial
+        call is deleted once the ones already running have finished writing.
+        """
+        self._aborted = True
+        self._track(self._discard(call_id, list(self._extractions)))
+
+    @staticmethod
+    def _track(coroutine):
+        task = asyncio.ensure_future(coroutine)
+        _pipeline_tasks.add(task)
+        task.add_done_callback(_pipeline_tasks.discard)
+
+    async def _extract(self, transcript_id: UUID):
+        if self._aborted:
+            return
+        db = next(get_db())
+        try:
+            transcript = transcript_repository.get_by_id(db, transcript_id)
+            if transcript and transcript.processed_at is None:
+                await transcript_service.process_transcript(db, transcript)
+        finally:
+            db.close()
+
+    async def _finish(self, call_id: UUID, extractions: List[asyncio.Future]):
+        for result in await asyncio.gather(*extractions, return_exceptions=True):
+            if isinstance(result, Exception) and not isinstance(result, CircuitOpenError):
+                logger.error(f"Speculative extraction failed for call {call_id}: {str(result)}")
+
+        # Extracts whatever did not finish above (circuit open, errors), then builds the call summary
+        await _process_or_park(call_id, self.job_class)
+
+    @staticmethod
+    async def _discard(call_id: UUID, extractions: List[asyncio.Future]):
+        await asyncio.gather(*extractions, return_exceptions=True)
+        db = next(get_db())
+        try:
+            discard_call(db, call_id)
+        finally:
+            db.close()
+
+
+async def create_call_pipelined(
+        db: Session,
+        files: List[UploadFile],
+        idempotency_key: Optional[str] = None,
+        job_class: JobClass = JobClass.INTERACTIVE,
+) -> Tuple[UUID, bool]:
+    """
+    create_call_idempotent, but extraction of each transcript overlaps with storing the
+    rest of the upload instead of waiting for the whole call. Must be called from the event loop.
+    """
+    pipeline = UploadPipeline(job_class)
+    call_id, created = await create_call_idempotent(db, files, idempotency_key, pipeline.add, pipeline.abort)
+    if created:
+        pipeline.seal(call_id)
+    return call_id, created
+
+
+async def add_transcripts(
+        db: Session,
+        call_id: UUID,
+        files: List[UploadFile],
 ) -> Call:
-    """Create a new call entry in the database and return it."""
-    call = call_repository.create(db)
+    """Add transcripts to an existing call. The caller schedules the call for processing."""
+    call = call_repository.get_by_id(db, call_id)
+    if not call:
+        raise HTTPException(status_code=404, detail="Call not found")
+
+    if call.call_status == CallStatus.PROCESSING:
+        raise HTTPException(status_code=409, detail="Call is currently being processed.")
+
+    if len(call.transcripts) + len(files) > MAX_TRANSCRIPTS_PER_CALL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A call can have a maximum of {MAX_TRANSCRIPTS_PER_CALL} transcripts."
+        )
 
     for file in files:
         await transcript_service.create_transcript(db, call.id, file)
 
+    db.refresh(call)
+    call_view_service.refresh(db, call.id)
     return call
 
 
+def get_call(db: Session, call_id: UUID) -> Call:
+    """Get a call by its ID."""
+    return call_repository.get_by_id(db, call_id)
+
+
+def schedule_process_call(call_id: UUID, job_class: JobClass = JobClass.INTERACTIVE):
+    """
+    Queue a call for processing in the given priority class: in-process by default,
+    or on the durable processing_job queue that worker.py consumes.
+    """
+    if config.PROCESSING_MODE == "worker":
+        db = next(get_db())
+        try:
+            processing_job_repository.enqueue(db, call_id, job_class)
+        finally:
+            db.close()
+        return
+
+    scheduler_service.submit(
+        job_class,
+        f"process_call:{call_id}",
+        lambda: _process_or_park(call_id, job_class)
+    )
+
+
+async def _process_or_park(call_id: UUID, job_class: JobClass):
+    """Run an inline processing job; while the LLM circuit is open, park it and retry later."""
+    try:
+        await setup_and_initiate_process_call(call_id)
+    except CircuitOpenError as e:
+        logger.warning(f"Parking call {call_id} for {e.retry_after:.0f}s: {str(e)}")
+        asyncio.get_running_loop().call_later(e.retry_after, schedule_process_call, call_id, job_class)
+
+
 async def setup_and_initiate_process_call(call_id: UUID):
     """Process a call with its own session management."""
     db = next(get_db())
@@ -54,29 +269,44 @@ async def process_call(db: Session, call: Call):
 
     call.call_status = CallStatus.PROCESSING
     call_repository.save(db, call)
+    call_view_service.refresh(db, call.id)
 
     transcripts = transcript_service.get_transcripts_by_call_id(db, call.id)
 
-    for transcript in transcripts:
-        await transcript_service.process_transcript(db, transcript)
+    try:
+        # Only new, replaced or retrying transcripts need extraction; failed ones wait for a reprocess
+        pending = [transcript for transcript in transcripts
+                   if transcript.processed_at is None and transcript.transcript_status != TranscriptStatus.FAILED]
+
+        call_summary = None
+        if config.BATCHED_EXTRACTION and len(transcripts) > 1 and len(pending) == len(transcripts):
+            # One request for the whole call; whatever it could not extract goes through the loop below
+            call_summary = await transcript_service.process_transcripts_together(db, call.id, pending)
 
-    raw_summaries = [
-        transcript.insight.ai_summary
-        for transcript in transcripts
-        if transcript.insight and transcript.insight.ai_summary
-    ]
+        for transcript in pending:
+            if transcript.processed_at is None:
+                await transcript_service.process_transcript(db, transcript)
 
-    if not raw_summaries:
-        call.raw_summary = ""
-        call.ai_summary = "No transcript insights available!"
-    elif len(call.transcripts) == 1:
-        call.raw_summary = raw_summaries[0]
-        call.ai_summary = raw_summaries[0]
-    else:
-        call.raw_summary = " ||| ".join(raw_summaries)
-        call.ai_summary = await asyncio.to_thread(llm_client.process_call_summary, call.raw_summary)
+        statuses = {transcript.transcript_status for transcript in transcripts}
+        if TranscriptStatus.RETRYING in statuses:
+            # The retry sweeper re-runs the call; build the summary once every transcript is in
+            call.call_status = CallStatus.UPLOADED
+            call_repository.save(db, call)
+            call_view_service.refresh(db, call.id)
+            return
 
-    call.ai_summary_updated_at = datetime.now(timezone.utc)
+        # Re-runs the LLM only if the set of transcript summaries changed
+        await call_summary_service.refresh_call_summary(db, call, ai_summary=call_summary)
+    except CircuitOpenError:
+        # Nothing was written for the remaining transcripts; the job is retried as a whole
+        db.rollback()
+        call.call_status = CallStatus.UPLOADED
+        call_repository.save(db, call)
+        call_view_service.refresh(db, call.id)
+        raise
 
-    call.call_status = CallStatus.PROCESSED
+    call.call_status = CallStatus.PROCESSING_FAILED if TranscriptStatus.FAILED in statuses else CallStatus.PROCESSED
     call_repository.save(db, call)
+    call_view_service.refresh(db, call.id)
+
+    await asyncio.to_thread(similarity_service.index_call, db, call.id)
@@ -0,0 +1,186 @@
+# services/call_summary_service.py
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from clients import llm_client
+from clients.resilience import CircuitOpenError
+from constants.constants import CALL_SUMMARY_DEBOUNCE_SECONDS, CALL_SUMMARY_RETRY_SECONDS
+from database import get_db
+from models.entities.call import Call
+from models.entities.transcript import Transcript
+from models.enums import CallStatus, JobClass
+from repositories import call_repository, transcript_repository
+from services import call_view_service, scheduler_service, summary_service, usage_service
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Debounced recompute tasks, one per call
+_pending_refreshes: Dict[UUID, asyncio.Task] = {}
+
+
+def get_summary_inputs(transcripts: List[Transcript]) -> List[str]:
+    """
+    The per-transcript summaries a call summary is built from, in the order the transcripts were added.
+    A reviewer-refined summary takes precedence over the original AI summary.
+    """
+    summaries = []
+    for transcript in transcripts:
+        if not transcript.insight:
+            continue
+        summary = transcript.insight.refined_summary or transcript.insight.ai_summary
+        if summary:
+            summaries.append(summary)
+    return summaries
+
+
+def compute_inputs_hash(summaries: List[str]) -> str:
+    return hashlib.sha256("\x1f".join(summaries).encode("utf-8")).hexdigest()
+
+
+async def refresh_call_summary(db: Session, call: Call, force: bool = False, ai_summary: Optional[str] = None) -> bool:
+    """
+    Rebuild the call-level summary from its transcripts' summaries, but only re-run the
+    LLM when the set of input summaries actually changed since the last build.
+    `ai_summary` is a summary already produced alongside the extractions (batched
+    extraction), used instead of a separate LLM request.
+    Returns True if the summary was recomputed. If the LLM request fails, a placeholder is
+    shown, the inputs hash is not stored and the call stays flagged, so a retry is scheduled.
+    """
+    transcripts = transcript_repository.get_by_call_id(db, call.id)
+    raw_summaries = get_summary_inputs(transcripts)
+    inputs_hash = compute_inputs_hash(raw_summaries)
+
+    if not force and call.ai_summary and call.summary_inputs_hash == inputs_hash:
+        logger.info(f"Call {call.id} summary inputs unchanged, skipping recompute")
+        if call.llm_refinement_required:
+            call.llm_refinement_required = False
+            call_repository.save(db, call)
+        return False
+
+    is_refresh = call.ai_summary is not None
+
+    if not raw_summaries:
+        call.raw_summary = ""
+        call.ai_summary = "No transcript insights available!"
+    elif len(transcripts) == 1:
+        call.raw_summary = raw_summaries[0]
+        call.ai_summary = raw_summaries[0]
+    elif ai_summary:
+        call.raw_summary = " ||| ".join(raw_summaries)
+        call.ai_summary = ai_summary
+    else:
+        call.raw_summary = " ||| ".join(raw_summaries)
+        with usage_service.usage_scope(call_id=call.id):
+            ai_summary = await asyncio.to_thread(llm_client.process_call_summary, call.raw_summary)
+
+        if ai_summary is None:
+            if not call.ai_summary:
+                call.ai_summary = "Multiple transcript summary (error processing): " + " ".join(
+                    [f"[Transcript {i + 1}] {summary[:100]}..." for i, summary in enumerate(raw_summaries)]
+                )
+            call.summary_inputs_hash = None
+            call.llm_refinement_required = True
+            call_repository.save(db, call)
+            summary_service.invalidate(call.id)
+            call_view_service.refresh(db, call.id)
+            logger.warning(f"Call {call.id} summary failed, retrying in {CALL_SUMMARY_RETRY_SECONDS}s")
+            schedule_call_summary_refresh(call.id, CALL_SUMMARY_RETRY_SECONDS)
+            return False
+        call.ai_summary = ai_summary
+
+    call.ai_summary_updated_at = datetime.now(timezone.utc)
+    call.summary_inputs_hash = inputs_hash
+    call.llm_refinement_required = False
+    if is_refresh:
+        call.llm_refinement_count = (call.llm_refinement_count or 0) + 1
+
+    call_repository.save(db, call)
+    summary_service.invalidate(call.id)
+    call_view_service.refresh(db, call.id)
+    return True
+
+
+def mark_call_summary_stale(db: Session, call_id: UUID):
+    """
+    Flag a call whose transcript summaries changed and schedule a debounced recompute.
+    Several changes in quick succession (e.g. refining every transcript of a call)
+    collapse into a single recompute.
+    """
+    call = call_repository.get_by_id(db, call_id)
+    if not call:
+        return
+
+    call.llm_refinement_required = True
+    call_repository.save(db, call)
+    call_view_service.refresh(db, call_id)
+
+    schedule_call_summary_refresh(call_id)
+
+
+def schedule_call_summary_refresh(call_id: UUID, delay: float = CALL_SUMMARY_DEBOUNCE_SECONDS):
+    """Schedule (or push back) the recompute for a call. Must be called from the event loop."""
+    existing = _pending_refreshes.pop(call_id, None)
+    if existing:
+        existing.cancel()
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"No event loop to schedule call summary refresh for {call_id}")
+        return
+
+    _pending_refreshes[call_id] = loop.create_task(_debounced_refresh(call_id, delay))
+
+
+async def _debounced_refresh(call_id: UUID, delay: float):
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        return
+
+    # From here on the refresh runs to completion; a newer change schedules a new task
+    _pending_refreshes.pop(call_id, None)
+
+    db = next(get_db())
+    try:
+        call = call_repository.get_by_id(db, call_id)
+        if not call or not call.llm_refinement_required:
+            return
+
+        if call.call_status == CallStatus.PROCESSING:
+            # process_call rebuilds the summary when it finishes
+            return
+
+        await scheduler_service.run(
+            JobClass.REFINEMENT,
+            f"refresh_call_summary:{call_id}",
+            lambda: refresh_call_summary(db, call)
+        )
+    except CircuitOpenError as e:
+        logger.warning(f"Postponing call summary refresh for {call_id}: {str(e)}")
+        schedule_call_summary_refresh(call_id, e.retry_after)
+    except Exception as e:
+        logger.error(f"Failed to refresh call summary for {call_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def schedule_pending_refreshes():
+    """Pick up calls left flagged for recompute, e.g. by a restart before their refresh ran."""
+    db = next(get_db())
+    try:
+        call_ids = call_repository.get_ids_requiring_refinement(db)
+    finally:
+        db.close()
+
+    for call_id in call_ids:
+        schedule_call_summary_refresh(call_id)
+
+    if call_ids:
+        logger.info(f"Scheduled call summary refresh for {len(call_ids)} calls")
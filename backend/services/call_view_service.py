@@ -0,0 +1,117 @@
+# services/call_view_service.py
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from database import get_db
+from models.entities.call import Call
+from models.enums import CallStatus, TranscriptStatus
+from repositories import call_repository, call_summary_view_repository
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_LENGTH = 280
+
+
+def build_row(call: Call) -> dict:
+    """The call_summary_view row for a call loaded with its transcripts and insights."""
+    totals = defaultdict(Decimal)
+    processed_times = []
+    failed = 0
+    for transcript in call.transcripts:
+        if transcript.transcript_status == TranscriptStatus.FAILED:
+            failed += 1
+        if transcript.processed_at:
+            processed_times.append(transcript.processed_at)
+        insight = transcript.insight
+        if insight and insight.payment_amount is not None and insight.payment_currency is not None:
+            totals[insight.payment_currency.value] += Decimal(str(insight.payment_amount))
+
+    return {
+        "call_id": call.id,
+        "call_status": call.call_status,
+        "transcript_count": len(call.transcripts),
+        "processed_count": len(processed_times),
+        "failed_count": failed,
+        "totals_by_currency": {currency: f"{amount:.2f}" for currency, amount in sorted(totals.items())},
+        "summary_snippet": call.ai_summary[:SNIPPET_LENGTH] if call.ai_summary else None,
+        "llm_refinement_required": bool(call.llm_refinement_required),
+        "created_at": call.created_at,
+        "updated_at": call.updated_at,
+        "ai_summary_updated_at": call.ai_summary_updated_at,
+        "last_processed_at": max(processed_times) if processed_times else None,
+    }
+
+
+def refresh(db: Session, call_id: UUID):
+    """
+    Rebuild a call's read-model row. Called by the services after they change the call,
+    its transcripts or their insights; a failure here is logged, not raised, so it never
+    fails the write itself (the row is rebuilt on the call's next change). The rebuild runs
+    in a SAVEPOINT, so a failure undoes only the rebuild, not the caller's pending changes.
+    """
+    try:
+        with db.begin_nested():
+            calls = call_repository.get_with_insights(db, [call_id])
+            if calls:
+                call_summary_view_repository.upsert(db, build_row(calls[0]))
+    except Exception as e:
+        logger.error(f"Failed to refresh call_summary_view for call {call_id}: {str(e)}")
+        return
+    db.commit()
+
+
+def backfill():
+    """Create rows for calls that have none yet. Run at startup."""
+    db = next(get_db())
+    try:
+        call_ids = call_summary_view_repository.get_missing_call_ids(db)
+        for call_id in call_ids:
+            refresh(db, call_id)
+    finally:
+        db.close()
+
+    if call_ids:
+        logger.info(f"Backfilled call_summary_view for {len(call_ids)} calls")
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def get_call_list(
+        db: Session,
+        limit: int = 50,
+        call_status: Optional[CallStatus] = None,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+) -> dict:
+    rows = call_summary_view_repository.get_page(db, limit, call_status, before, before_id)
+    calls: List[dict] = [
+        {
+            "call_id": str(row.call_id),
+            "call_status": row.call_status.value,
+            "transcript_count": row.transcript_count,
+            "processed_count": row.processed_count,
+            "failed_count": row.failed_count,
+            "totals_by_currency": row.totals_by_currency or {},
+            "summary_snippet": row.summary_snippet,
+            "llm_refinement_required": row.llm_refinement_required,
+            "created_at": _timestamp(row.created_at),
+            "updated_at": _timestamp(row.updated_at),
+            "ai_summary_updated_at": _timestamp(row.ai_summary_updated_at),
+            "last_processed_at": _timestamp(row.last_processed_at),
+        }
+        for row in rows
+    ]
+    return {
+        "calls": calls,
+        # Pass as `before` and `before_id` for the next page
+        "next_before": calls[-1]["created_at"] if len(calls) == limit else None,
+        "next_before_id": calls[-1]["call_id"] if len(calls) == limit else None,
+    }
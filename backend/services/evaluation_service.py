@@ -0,0 +1,157 @@
+# services/evaluation_service.py
+
+import json
+import logging
+import os
+import re
+import time
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from models.enums import ExtractionOutcome, PaymentCurrency, PaymentMethod, PaymentStatus
+from services import preprocessing_service, usage_service
+
+logger = logging.getLogger(__name__)
+
+# ISO 8601 month-day ("--03-14"), for labels of dates said without a year
+YEARLESS_DATE = re.compile(r"--\d{2}-\d{2}")
+
+FIELDS = ["payment_status", "payment_amount", "payment_currency", "payment_date", "payment_method"]
+
+
+def load_dataset(path: str) -> List[dict]:
+    """
+    Read a labelled dataset: JSONL with one case per line,
+        {"id": "...", "transcript": "..." | "file": "relative/path.txt", "labels": {field: value, ...}}
+    Label values use the display strings ("Collected", "Credit Card", "2025-03-14"); a date said
+    without a year is labelled "--03-14" and matches that day in any year. A null label expects
+    the field to be empty; fields missing from `labels` are not scored for that case.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    cases = []
+    with open(path, encoding="utf-8") as dataset_file:
+        for number, line in enumerate(dataset_file, start=1):
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            if "transcript" not in case:
+                with open(os.path.join(base_dir, case["file"]), encoding="utf-8") as transcript_file:
+                    case["transcript"] = transcript_file.read()
+            case.setdefault("id", case.get("file") or str(number))
+            cases.append(case)
+    return cases
+
+
+def normalize_field(field: str, value):
+    """Map an extracted or labelled value to what process_transcript would store."""
+    if value in (None, ""):
+        return None
+    if field == "payment_status":
+        return PaymentStatus.from_string(str(value)).value
+    if field == "payment_currency":
+        return PaymentCurrency.from_string(str(value)).value
+    if field == "payment_method":
+        return PaymentMethod.from_string(str(value)).value
+    if field == "payment_amount":
+        try:
+            return round(float(value), 2)
+        except (TypeError, ValueError):
+            return None
+    if field == "payment_date":
+        if YEARLESS_DATE.fullmatch(str(value)):
+            return str(value)
+        try:
+            return date.fromisoformat(str(value)).isoformat()
+        except ValueError:
+            return None
+    return value
+
+
+def field_matches(field: str, expected, actual) -> bool:
+    """Compare normalized values; a year-less date label only checks month and day."""
+    if field == "payment_date" and expected is not None and YEARLESS_DATE.fullmatch(expected):
+        return actual is not None and actual[4:] == expected[1:]
+    return expected == actual
+
+
+def evaluate(client, cases: List[dict], preprocess: bool = True) -> dict:
+    """
+    Run every case through `client.process_transcript_text` and score it against its labels.
+    Returns {"cases": [...], "summary": {...}}.
+    """
+    rows = []
+    for case in cases:
+        text = case["transcript"]
+        if preprocess:
+            text = preprocessing_service.preprocess_transcript(text).text
+
+        with usage_service.capture_usage() as usage:
+            started_at = time.monotonic()
+            result = client.process_transcript_text(text)
+            wall_ms = int((time.monotonic() - started_at) * 1000)
+
+        row = {
+            "id": case["id"],
+            "outcome": result.outcome.value,
+            "succeeded": result.outcome == ExtractionOutcome.SUCCESS,
+            "error": result.error,
+            # Replayed requests report their recorded latency rather than the lookup time
+            "latency_ms": sum(entry["latency_ms"] for entry in usage) if usage else wall_ms,
+            "requests": len(usage),
+            "prompt_tokens": sum(entry["prompt_tokens"] for entry in usage),
+            "completion_tokens": sum(entry["completion_tokens"] for entry in usage),
+            "cost_usd": float(sum((entry["cost_usd"] for entry in usage), Decimal(0))),
+            "fields": {},
+        }
+
+        if row["succeeded"]:
+            for field, expected in case.get("labels", {}).items():
+                expected = normalize_field(field, expected)
+                actual = normalize_field(field, result.data.get(field))
+                row["fields"][field] = {
+                    "expected": expected,
+                    "actual": actual,
+                    "correct": field_matches(field, expected, actual),
+                }
+        else:
+            logger.warning(f"Extraction failed for case {case['id']}: {result.error}")
+
+        rows.append(row)
+
+    return {"cases": rows, "summary": summarize(rows)}
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+
+def summarize(rows: List[dict]) -> dict:
+    """Per-field accuracy (failed extractions count as wrong) next to latency, tokens and cost."""
+    accuracy = {}
+    for field in FIELDS:
+        scored = [row for row in rows if field in row["fields"] or not row["succeeded"]]
+        correct = sum(1 for row in scored if row["fields"].get(field, {}).get("correct"))
+        accuracy[field] = round(correct / len(scored), 4) if scored else None
+
+    scored_cases = [row for row in rows if row["fields"] or not row["succeeded"]]
+    exact = sum(1 for row in scored_cases
+                if row["fields"] and all(value["correct"] for value in row["fields"].values()))
+    latencies = [row["latency_ms"] for row in rows]
+    count = len(rows) or 1
+
+    return {
+        "cases": len(rows),
+        "failures": sum(1 for row in rows if not row["succeeded"]),
+        "accuracy": accuracy,
+        "exact_match": round(exact / len(scored_cases), 4) if scored_cases else None,
+        "latency_ms_p50": _percentile(latencies, 0.5),
+        "latency_ms_p95": _percentile(latencies, 0.95),
+        "prompt_tokens_per_transcript": round(sum(row["prompt_tokens"] for row in rows) / count, 1),
+        "completion_tokens_per_transcript": round(sum(row["completion_tokens"] for row in rows) / count, 1),
+        "cost_usd_per_transcript": round(sum(row["cost_usd"] for row in rows) / count, 6),
+        "cost_usd_total": round(sum(row["cost_usd"] for row in rows), 6),
+    }
@@ -0,0 +1,140 @@
+# services/export_service.py
+
+import csv
+import enum
+import io
+import logging
+from datetime import date, datetime, timezone
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from config import loaded_config
+from database import read_session
+from repositories import export_repository
+from repositories.export_repository import EXPORT_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional: only needed for Parquet exports
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+EXPORT_FORMATS = ["csv", "parquet"]
+
+_TIMESTAMP_COLUMNS = {"uploaded_at", "processed_at", "ai_summary_updated_at", "user_summary_updated_at",
+                      "refined_summary_updated_at", "call_summary_updated_at"}
+
+
+def start_export() -> datetime:
+    """
+    The watermark for an export starting now. Passing it as `since` to the next export
+    picks up every row changed after this one started; rows that change while an export
+    is running can appear in both (at-least-once).
+    """
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _batches(since: Optional[datetime]) -> Iterator[List[dict]]:
+    # Own session: a streaming response outlives the request's session
+    with read_session() as db:
+        for batch in export_repository.stream_rows(db, since, config.EXPORT_BATCH_SIZE):
+            yield [{name: _plain(value) for name, value in row.items()} for row in batch]
+
+
+def stream_csv(since: Optional[datetime] = None) -> Iterator[str]:
+    """Yield the export as CSV text, one chunk per batch of rows."""
+    return _csv_chunks(_batches(since))
+
+
+def _csv_chunks(batches: Iterator[List[dict]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+
+    for batch in batches:
+        for row in batch:
+            writer.writerow([
+                value.isoformat() if isinstance(value, (date, datetime)) else value
+                for value in row.values()
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _parquet_schema():
+    string, timestamp = pyarrow.string(), pyarrow.timestamp("us")
+    types = {
+        "payment_amount": pyarrow.decimal128(10, 2),
+        "payment_date": pyarrow.date32(),
+        "llm_refinement_count": pyarrow.int32(),
+    }
+    return pyarrow.schema([
+        (name, timestamp if name in _TIMESTAMP_COLUMNS else types.get(name, string))
+        for name, _ in EXPORT_COLUMNS
+    ])
+
+
+def write_parquet(sink: BinaryIO, since: Optional[datetime] = None) -> int:
+    """
+    Write the export to `sink` as zstd-compressed Parquet, one row group per batch,
+    so memory use stays bounded by the batch size. Returns the number of rows written.
+    """
+    if pyarrow is None:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = _parquet_schema()
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in _batches(since):
+            columns = [pyarrow.array([row[field.name] for row in batch], type=field.type) for field in schema]
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(columns, schema=schema))
+            rows += len(batch)
+
+    logger.info(f"Exported {rows} rows to Parquet")
+    return rows
+
+
+def write_csv(sink: BinaryIO, since: Optional[datetime] = None) -> int:
+    rows = 0
+
+    def counted_batches():
+        nonlocal rows
+        for batch in _batches(since):
+            rows += len(batch)
+            yield batch
+
+    for chunk in _csv_chunks(counted_batches()):
+        sink.write(chunk.encode("utf-8"))
+
+    logger.info(f"Exported {rows} rows to CSV")
+    return rows
+
+
+def export_to_file(path: str, export_format: str, since: Optional[datetime] = None) -> Tuple[int, datetime]:
+    """Export to a file; returns (rows written, watermark for the next incremental export)."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    watermark = start_export()
+    with open(path, "wb") as sink:
+        if export_format == "parquet":
+            rows = write_parquet(sink, since)
+        else:
+            rows = write_csv(sink, since)
+    return rows, watermark
@@ -0,0 +1,109 @@
+# services/idempotency_service.py
+
+import hashlib
+import logging
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from config import loaded_config
+from fastapi import HTTPException
+from repositories import idempotency_repository
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+CLEANUP_INTERVAL_SECONDS = 600
+_last_cleanup = 0.0
+
+
+def compute_content_hash(files: List[Tuple[str, bytes]]) -> str:
+    """
+    Hash an upload by its (file name, content) pairs. File order does not matter,
+    so a retry that re-sends the same files in a different order still matches.
+    """
+    digests = sorted(
+        f"{file_name}:{hashlib.sha256(content).hexdigest()}"
+        for file_name, content in files
+    )
+    return hashlib.sha256("\n".join(digests).encode("utf-8")).hexdigest()
+
+
+def reserve(db: Session, idempotency_key: Optional[str], content_hash: str) -> Tuple[UUID, bool]:
+    """
+    Claim the idempotency key for a new call, or find the call a previous attempt created.
+    Without a client-supplied key, the content hash is used as the key.
+
+    Returns (call_id, created): created is False when the request is a retry.
+    """
+    key = idempotency_key.strip() if idempotency_key and idempotency_key.strip() else f"content:{content_hash}"
+    now = datetime.now(timezone.utc)
+
+    cleanup_expired(db)
+
+    existing = idempotency_repository.get_by_key(db, key)
+    if existing and _is_expired(existing.expires_at, now):
+        idempotency_repository.delete(db, existing)
+        existing = None
+
+    if not existing:
+        try:
+            record = idempotency_repository.create(
+                db,
+                key=key,
+                content_hash=content_hash,
+                call_id=uuid.uuid4(),
+                expires_at=now + timedelta(hours=config.IDEMPOTENCY_KEY_TTL_HOURS),
+            )
+            return record.call_id, True
+        except IntegrityError:
+            # A concurrent retry claimed the key first, fall through and reuse its call
+            db.rollback()
+            existing = idempotency_repository.get_by_key(db, key)
+
+    if existing.content_hash != content_hash:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different upload."
+        )
+
+    logger.info(f"Duplicate upload detected for key {key}, returning call {existing.call_id}")
+    return existing.call_id, False
+
+
+def release(db: Session, call_id: UUID, idempotency_key: Optional[str], content_hash: str):
+    """Drop a reservation whose call could not be created, so the client can retry."""
+    key = idempotency_key.strip() if idempotency_key and idempotency_key.strip() else f"content:{content_hash}"
+    record = idempotency_repository.get_by_key(db, key)
+    if record and record.call_id == call_id:
+        idempotency_repository.delete(db, record)
+
+
+def cleanup_expired(db: Session, force: bool = False) -> int:
+    """Delete expired idempotency records, at most once every CLEANUP_INTERVAL_SECONDS."""
+    global _last_cleanup
+    if not force and time.monotonic() - _last_cleanup < CLEANUP_INTERVAL_SECONDS:
+        return 0
+    _last_cleanup = time.monotonic()
+
+    try:
+        # Stored as naive UTC on SQLite, so compare against naive UTC
+        count = idempotency_repository.delete_expired(db, datetime.now(timezone.utc).replace(tzinfo=None))
+        if count:
+            logger.info(f"Deleted {count} expired idempotency keys")
+        return count
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to clean up idempotency keys: {str(e)}")
+        return 0
+
+
+def _is_expired(expires_at: datetime, now: datetime) -> bool:
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= now
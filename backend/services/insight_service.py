@@ -3,17 +3,25 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
 from clients import llm_client
+from clients.resilience import CircuitOpenError
 from constants.constants import MAX_LLM_RETRY_COUNT
 from models.entities.insight import Insight
-from repositories import insight_repository
+from repositories import insight_repository, insight_summary_version_repository
+from services import call_summary_service, search_service, similarity_service, summary_service, usage_service
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 logger = logging.getLogger(__name__)
 
 
+class ConflictError(Exception):
+    """An insight was changed by someone else between reading and writing it."""
+
+
 def create_insight(
         db: Session,
         transcript_id: UUID,
@@ -24,8 +32,7 @@ def create_insight(
         payment_method,
         ai_summary,
         ai_summary_updated_at,
-        comments,
-        summary_history
+        comments
 ) -> Insight:
     """
     Create a new insight based on transcript processing results.
@@ -41,9 +48,52 @@ def create_insight(
         ai_summary=ai_summary,
         ai_summary_updated_at=ai_summary_updated_at,
         comments=comments,
-        summary_history=summary_history,
     )
 
+    insight_summary_version_repository.append(
+        db, insight.id, "extracted", ai_summary_updated_at, ai_summary, None, None
+    )
+    db.commit()
+
+    return insight
+
+
+def replace_extraction(
+        db: Session,
+        insight: Insight,
+        payment_status,
+        payment_amount,
+        payment_currency,
+        payment_date,
+        payment_method,
+        ai_summary,
+        ai_summary_updated_at,
+        comments
+) -> Insight:
+    """
+    Overwrite the extracted fields of an insight after its transcript was replaced.
+    The previous summaries are kept in the history; the refined summary was built on
+    the old text, so it is cleared and a refinement is requested if the user edited it.
+    """
+    migrate_legacy_summary_history(db, insight.id)
+    insight_summary_version_repository.append(
+        db, insight.id, "re-extracted", ai_summary_updated_at,
+        insight.ai_summary, insight.user_summary, insight.refined_summary
+    )
+
+    insight.payment_status = payment_status
+    insight.payment_amount = payment_amount
+    insight.payment_currency = payment_currency
+    insight.payment_date = payment_date
+    insight.payment_method = payment_method
+    insight.comments = comments
+    insight.ai_summary = ai_summary
+    insight.ai_summary_updated_at = ai_summary_updated_at
+    insight.refined_summary = None
+    insight.refined_summary_updated_at = None
+    insight.llm_refinement_required = bool(insight.user_summary)
+
+    save_insight(db, insight)
     return insight
 
 
@@ -58,10 +108,59 @@ def save_insight(db: Session, insight: Insight) -> Insight:
     """
     Save an existing insight object to the database.
     """
-    insight = insight_repository.save(db, insight)
+    insight_repository.save(db, insight)
+    summary_service.invalidate(insight.transcript.call_id)
     return insight
 
 
+def migrate_legacy_summary_history(db: Session, insight_id: UUID):
+    """
+    Move an insight's history from the legacy JSON column into the history table, if it is
+    still there. Runs in the caller's transaction, which must commit it.
+    """
+    legacy = insight_repository.take_legacy_summary_history(db, insight_id)
+    if legacy:
+        insight_summary_version_repository.bulk_append(db, insight_id, [
+            {
+                "event": "legacy",
+                "recorded_at": datetime.fromisoformat(entry["timestamp"]),
+                "ai_summary": entry.get("ai_summary") or None,
+                "user_summary": entry.get("user_summary") or None,
+                "refined_summary": entry.get("refined_summary") or None,
+            }
+            for entry in legacy
+        ])
+
+
+def get_summary_history(db: Session, insight_id: UUID, page: int = 1, page_size: int = 20) -> dict:
+    """
+    One page of an insight's summary history, newest first. Insights whose history is
+    still in the legacy JSON column are migrated to the history table first.
+    """
+    migrate_legacy_summary_history(db, insight_id)
+    db.commit()
+
+    total = insight_summary_version_repository.count_for_insight(db, insight_id)
+    versions = insight_summary_version_repository.get_page(db, insight_id, (page - 1) * page_size, page_size)
+    return {
+        "insight_id": str(insight_id),
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "versions": [
+            {
+                "version_id": version.id,
+                "event": version.event,
+                "recorded_at": version.recorded_at.isoformat(),
+                "ai_summary": version.ai_summary,
+                "user_summary": version.user_summary,
+                "refined_summary": version.refined_summary,
+            }
+            for version in versions
+        ],
+    }
+
+
 def get_insight_by_transcript_id(db: Session, transcript_id: UUID) -> Insight:
     """
     Get an insight by its transcript ID.
@@ -69,21 +168,40 @@ def get_insight_by_transcript_id(db: Session, transcript_id: UUID) -> Insight:
     return insight_repository.get_by_transcript_id(db, transcript_id)
 
 
-def update_user_summary(db: Session, insight_id: str, user_summary: str) -> Insight:
+def update_user_summary(
+        db: Session,
+        insight_id: str,
+        user_summary: str,
+        expected_version: Optional[int] = None
+) -> Insight:
     """
     Update the user-modified summary for a transcript insight.
     This sets a flag indicating that an LLM redo might be required.
+    With `expected_version`, the update is rejected if the insight changed since the
+    client read that version.
     """
     insight = get_insight(db, UUID(insight_id))
 
     if not insight:
         raise Exception("Insight not found")
 
+    if expected_version is not None and insight.version != expected_version:
+        raise ConflictError(
+            f"Insight was modified (version {insight.version}, expected {expected_version}); reload and try again"
+        )
+
     insight.user_summary = user_summary
     insight.user_summary_updated_at = datetime.now(timezone.utc)
     insight.llm_refinement_required = True
 
-    save_insight(db, insight)
+    try:
+        save_insight(db, insight)
+    except StaleDataError:
+        db.rollback()
+        raise ConflictError("Insight was modified while saving; reload and try again")
+
+    search_service.index_transcript(db, insight.transcript_id)
+    db.commit()
     return insight
 
 
@@ -111,33 +229,44 @@ async def generate_refined_summary(db: Session, insight_id: str) -> Insight:
 
         base_summary = insight.refined_summary if insight.refined_summary else insight.ai_summary
 
-        refined_summary = await asyncio.to_thread(
-            llm_client.generate_refined_summary,
-            base_summary=base_summary,
-            user_summary=insight.user_summary
-        )
+        with usage_service.usage_scope(call_id=insight.transcript.call_id, transcript_id=insight.transcript_id):
+            refined_summary = await asyncio.to_thread(
+                llm_client.generate_refined_summary,
+                base_summary=base_summary,
+                user_summary=insight.user_summary
+            )
 
         current_time = datetime.now(timezone.utc)
 
-        history_entry = {
-            "timestamp": current_time.isoformat(),
-            "ai_summary": insight.ai_summary,
-            "user_summary": insight.user_summary,
-            "refined_summary": insight.refined_summary
-        }
-
-        current_history = insight.summary_history.copy() if insight.summary_history else []
-        current_history.append(history_entry)
-        insight.summary_history = current_history
+        migrate_legacy_summary_history(db, insight.id)
+        insight_summary_version_repository.append(
+            db, insight.id, "refined", current_time,
+            insight.ai_summary, insight.user_summary, insight.refined_summary
+        )
 
         insight.refined_summary = refined_summary
         insight.refined_summary_updated_at = current_time
         insight.llm_refinement_required = False
         insight.llm_refinement_count += 1
 
+        try:
+            db.commit()
+        except StaleDataError:
+            # The user summary (or a concurrent refinement) changed while the LLM was running
+            db.rollback()
+            raise ConflictError("Insight was modified during refinement; reload and try again")
+        summary_service.invalidate(insight.transcript.call_id)
+
+        search_service.index_transcript(db, insight.transcript_id)
         db.commit()
+        await asyncio.to_thread(similarity_service.index_insight, db, insight)
+
+        # The call summary is built from transcript summaries, so it is now stale
+        call_summary_service.mark_call_summary_stale(db, insight.transcript.call_id)
         return insight
 
+    except (CircuitOpenError, ConflictError):
+        raise
     except Exception as e:
         logger.error(f"Failed to generate refined summary: {str(e)}")
         raise Exception(f"Failed to generate refined summary: {str(e)}")
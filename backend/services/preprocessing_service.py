@@ -0,0 +1,245 @@
+# services/preprocessing_service.py
+
+import logging
+import math
+import re
+from typing import List, NamedTuple, Optional
+
+from config import loaded_config
+from models.enums import SpeakerRole
+
+try:
+    import tiktoken
+except ImportError:  # Optional: token counts fall back to a character-based estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+
+class Turn(NamedTuple):
+    speaker: Optional[str]
+    role: SpeakerRole
+    text: str
+    start: int  # Character offsets of the turn's text (after the speaker label) in the parsed text
+    end: int
+
+
+class PreparedTranscript(NamedTuple):
+    text: str
+    original_tokens: int
+    prompt_tokens: int
+    steps: List[str]
+
+
+# "[00:01:23]", "(00:12)", "00:01:23.450" and "12:01 PM" style stamps
+_TIMESTAMP = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?(?:\s?[AaPp][Mm])?"
+_BRACKETED_TIMESTAMP_PATTERN = re.compile(r"[\[(]\s*" + _TIMESTAMP + r"(?:\s*[-–]\s*" + _TIMESTAMP + r")?\s*[\])]")
+_LEADING_TIMESTAMP_PATTERN = re.compile(r"^\s*" + _TIMESTAMP + r"(?:\s*[-–]\s*" + _TIMESTAMP + r")?\s*[-–|]?\s*")
+
+# "Agent:", "Customer:", "Speaker 2:", "Agent (XYZ Collections - Card Division):"
+_SPEAKER_PATTERN = re.compile(
+    r"^\s*(?:[\[(]?\s*" + _TIMESTAMP + r"\s*[\])]?\s*[-–|]?\s*)?"
+    r"(?P<speaker>[A-Za-z][\w .'&/-]{0,40}?(?:\s*\([^)]{0,80}\))?)\s*:\s*(?P<text>.*)$"
+)
+
+_FILLER_PATTERN = re.compile(
+    r"(?<![\w'])(?:u+h+m*|u+m+|e+r+m*|a+h+|h+m+|mm+-?hmm+|uh-?huh)(?![\w'])[,.]?\s*",
+    re.IGNORECASE
+)
+# Stutters ("I I think"): purely alphabetic words repeated with only spaces between them.
+# Digits and commas are never touched, so "1,000,000" and "4 4 5 6" reach the LLM intact
+_REPEATED_WORD_PATTERN = re.compile(r"(?<![\w',])([A-Za-z]+)(?:[ \t]+\1)+(?![\w',])", re.IGNORECASE)
+_STAGE_DIRECTION_PATTERN = re.compile(
+    r"[\[(][^\])]{0,60}\b(?:pause|laugh|inaudible|crosstalk|silence|sigh|noise|music|on hold|unintelligible)"
+    r"[^\])]{0,60}[\])]\s*",
+    re.IGNORECASE
+)
+_WHITESPACE_PATTERN = re.compile(r"[ \t ]+")
+
+# Turns mentioning any of these are kept when pruning; everything else is small talk
+_RELEVANT_TURN_PATTERN = re.compile(
+    r"[$₹€£¥]|\d|\b(?:pay|paid|payment|amount|balance|due|owe|outstanding|card|debit|credit|ach|check|cheque|"
+    r"cash|wire|transfer|bank|account|collect|commit|promise|prepaid|already|today|tomorrow|week|month|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|january|february|march|april|may|june|july|"
+    r"august|september|october|november|december|installment|plan|settle|refund|dispute|cannot|can't|unable)\w*",
+    re.IGNORECASE
+)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens with tiktoken when available, else estimate at ~4 characters per token."""
+    global _encoding
+    if not text:
+        return 0
+
+    if tiktoken is not None:
+        if _encoding is None:
+            try:
+                _encoding = tiktoken.encoding_for_model(config.LLM_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text))
+
+    return math.ceil(len(text) / 4)
+
+
+def strip_timestamps(text: str) -> str:
+    text = _BRACKETED_TIMESTAMP_PATTERN.sub("", text)
+    return "\n".join(_LEADING_TIMESTAMP_PATTERN.sub("", line) for line in text.split("\n"))
+
+
+def remove_disfluencies(text: str) -> str:
+    text = _STAGE_DIRECTION_PATTERN.sub("", text)
+    text = _FILLER_PATTERN.sub("", text)
+    return _REPEATED_WORD_PATTERN.sub(r"\1", text)
+
+
+def collapse_whitespace(text: str) -> str:
+    lines = (_WHITESPACE_PATTERN.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_turns(text: str) -> List[Turn]:
+    """
+    Split a transcript into speaker turns. Lines without a "Speaker:" prefix continue
+    the previous turn; text before the first speaker label becomes a turn with no speaker.
+    """
+    turns: List[Turn] = []
+    offset = 0
+
+    for line in text.splitlines(keepends=True):
+        line_start, line_end = offset, offset + len(line.rstrip("\r\n"))
+        offset += len(line)
+
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        match = _SPEAKER_PATTERN.match(line)
+        if match and match.group("text").strip():
+            speaker = " ".join(match.group("speaker").split())
+            turns.append(Turn(
+                speaker=speaker,
+                role=SpeakerRole.from_speaker(speaker),
+                text=match.group("text").strip(),
+                start=line_start + match.start("text"),
+                end=line_end,
+            ))
+        elif turns:
+            previous = turns[-1]
+            turns[-1] = previous._replace(text=f"{previous.text} {stripped}", end=line_end)
+        else:
+            turns.append(Turn(speaker=None, role=SpeakerRole.OTHER, text=stripped, start=line_start, end=line_end))
+
+    return turns
+
+
+def merge_consecutive_turns(turns: List[Turn]) -> List[Turn]:
+    merged: List[Turn] = []
+    for turn in turns:
+        if merged and turn.speaker and merged[-1].speaker == turn.speaker:
+            merged[-1] = merged[-1]._replace(text=f"{merged[-1].text} {turn.text}", end=turn.end)
+        else:
+            merged.append(turn)
+    return merged
+
+
+def prune_turns(turns: List[Turn], context: int = 1) -> List[Turn]:
+    """
+    Keep only turns relevant to payments, plus `context` neighbouring turns on each side
+    and the opening turn (which usually identifies the caller and division).
+    Falls back to all turns when nothing looks relevant.
+    """
+    relevant = [index for index, turn in enumerate(turns) if _RELEVANT_TURN_PATTERN.search(turn.text)]
+    if not relevant:
+        return turns
+
+    keep = {0}
+    for index in relevant:
+        keep.update(range(max(0, index - context), min(len(turns), index + context + 1)))
+
+    return [turn for index, turn in enumerate(turns) if index in keep]
+
+
+def filter_roles(turns: List[Turn], roles: List[SpeakerRole]) -> List[Turn]:
+    """Keep only turns spoken by the given roles (e.g. drop IVR or system messages)."""
+    kept = [turn for turn in turns if turn.role in roles]
+    return kept or turns
+
+
+def chunk_turns(turns: List[Turn], max_tokens: int) -> List[List[Turn]]:
+    """
+    Group consecutive turns into chunks of at most `max_tokens` prompt tokens, splitting
+    only on turn boundaries. A single turn larger than the budget becomes its own chunk.
+    """
+    chunks: List[List[Turn]] = []
+    current: List[Turn] = []
+    current_tokens = 0
+
+    for turn in turns:
+        turn_tokens = count_tokens(render_turns([turn])) + 1
+        if current and current_tokens + turn_tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(turn)
+        current_tokens += turn_tokens
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_prompt(text: str, max_tokens: int) -> List[str]:
+    """Split a prepared prompt into parts of at most `max_tokens` tokens on turn boundaries."""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    return [render_turns(chunk) for chunk in chunk_turns(parse_turns(text), max_tokens)]
+
+
+def render_turns(turns: List[Turn]) -> str:
+    return "\n".join(f"{turn.speaker}: {turn.text}" if turn.speaker else turn.text for turn in turns)
+
+
+def preprocess_transcript(text: str) -> PreparedTranscript:
+    """
+    Normalise and compress a transcript before it is sent to the LLM.
+    The steps that run are configured by PREPROCESSING_STEPS; token counts before and
+    after are returned so callers can record the savings.
+    """
+    steps = [step for step in config.PREPROCESSING_STEPS if step] if config.PREPROCESSING_ENABLED else []
+    original_tokens = count_tokens(text)
+    prepared = text
+
+    if "timestamps" in steps:
+        prepared = strip_timestamps(prepared)
+    if "disfluencies" in steps:
+        prepared = remove_disfluencies(prepared)
+    if "whitespace" in steps:
+        prepared = collapse_whitespace(prepared)
+
+    if "turns" in steps:
+        prompt_turns = merge_consecutive_turns(parse_turns(prepared))
+        if "roles" in steps:
+            prompt_turns = filter_roles(prompt_turns, [SpeakerRole.AGENT, SpeakerRole.CUSTOMER])
+        if "prune" in steps:
+            prompt_turns = prune_turns(prompt_turns)
+        if prompt_turns:
+            prepared = render_turns(prompt_turns)
+
+    if not prepared.strip():
+        # Never send an empty prompt because of over-eager cleanup
+        prepared, steps = text, []
+
+    prompt_tokens = count_tokens(prepared)
+    logger.info(f"Preprocessed transcript: {original_tokens} -> {prompt_tokens} tokens ({', '.join(steps) or 'none'})")
+
+    return PreparedTranscript(
+        text=prepared,
+        original_tokens=original_tokens,
+        prompt_tokens=prompt_tokens,
+        steps=steps,
+    )
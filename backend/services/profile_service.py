@@ -0,0 +1,123 @@
+# services/profile_service.py
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from config import PERFORMANCE_DEFAULTS, PERFORMANCE_SETTINGS, apply_performance_profile, check_performance_profile, \
+    loaded_config, load_performance_profile
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+_reloader_task: Optional[asyncio.Task] = None
+_profile_mtime: Optional[float] = None
+_checked_at: Optional[float] = None
+_loaded_at = datetime.now(timezone.utc)
+# Profile values that differ from the running ones but only take effect after a restart
+_restart_required: Dict[str, object] = {}
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+if config.PERFORMANCE_PROFILE_PATH:
+    _profile_mtime = _mtime(config.PERFORMANCE_PROFILE_PATH)
+
+
+def reload_profile(force: bool = False) -> bool:
+    """
+    Re-read the profile file if it changed and apply its hot-reloadable settings; settings no
+    longer in the file (or a deleted file) go back to their environment values. An invalid file is logged and
+    ignored, keeping the running values. Returns whether anything was applied.
+    """
+    global _profile_mtime, _loaded_at
+    path = config.PERFORMANCE_PROFILE_PATH
+    if not path:
+        return False
+
+    mtime = _mtime(path)
+    if mtime == _profile_mtime and not force:
+        return False
+    _profile_mtime = mtime
+
+    try:
+        # A deleted file counts as empty. Per-method values merge over the environment's,
+        # so a method removed from the file reverts too
+        profile = check_performance_profile(
+            load_performance_profile(path) if mtime is not None else {}, SimpleNamespace(**PERFORMANCE_DEFAULTS)
+        )
+    except (OSError, ValueError) as e:
+        logger.error(f"Performance profile {path} not reloaded: {str(e)}")
+        return False
+    settings = {**PERFORMANCE_DEFAULTS, **profile}
+
+    applied, restart_required = apply_performance_profile(config, settings, hot_only=True)
+    _restart_required.clear()
+    _restart_required.update({name: settings[name] for name in restart_required})
+    _loaded_at = datetime.now(timezone.utc)
+
+    if applied:
+        logger.info(f"Performance profile reloaded: {', '.join(applied)}")
+    if restart_required:
+        logger.warning(f"Performance profile changes needing a restart: {', '.join(restart_required)}")
+    return bool(applied)
+
+
+def reload_if_due() -> bool:
+    """
+    Reload the profile if PERFORMANCE_PROFILE_RELOAD_SECONDS passed since the last check.
+    For processes with no event loop to run the reloader on, i.e. the worker and its pool.
+    """
+    global _checked_at
+    if not config.PERFORMANCE_PROFILE_PATH or config.PERFORMANCE_PROFILE_RELOAD_SECONDS <= 0:
+        return False
+    if _checked_at is not None and time.monotonic() - _checked_at < config.PERFORMANCE_PROFILE_RELOAD_SECONDS:
+        return False
+    _checked_at = time.monotonic()
+
+    try:
+        return reload_profile()
+    except Exception as e:
+        logger.error(f"Performance profile reload failed: {str(e)}")
+        return False
+
+
+async def _run_reloader():
+    while True:
+        await asyncio.sleep(config.PERFORMANCE_PROFILE_RELOAD_SECONDS)
+        try:
+            reload_profile()
+        except Exception as e:
+            logger.error(f"Performance profile reload failed: {str(e)}")
+
+
+def start_profile_reloader():
+    """Start watching the profile file on the running event loop (once per process)."""
+    global _reloader_task
+    if not config.PERFORMANCE_PROFILE_PATH or config.PERFORMANCE_PROFILE_RELOAD_SECONDS <= 0:
+        return
+    if _reloader_task is None or _reloader_task.done():
+        _reloader_task = asyncio.get_running_loop().create_task(_run_reloader())
+
+
+def get_profile() -> dict:
+    """The running performance settings of this process, and profile changes waiting for a restart."""
+    return {
+        "profile_path": config.PERFORMANCE_PROFILE_PATH or None,
+        "loaded_at": _loaded_at.isoformat(),
+        "settings": {
+            name: {"value": getattr(config, name), "hot_reload": setting.hot_reload}
+            for name, setting in PERFORMANCE_SETTINGS.items()
+        },
+        "restart_required": dict(_restart_required),
+    }
@@ -0,0 +1,73 @@
+# services/retry_service.py
+
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+from uuid import UUID
+
+from config import loaded_config
+from database import get_db
+from models.enums import JobClass
+from repositories import transcript_repository
+from services import call_service, call_view_service
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+def sweep_due_retries() -> int:
+    """
+    Schedule processing for every call with a transcript whose retry backoff has elapsed.
+    Must be called from the event loop.
+    """
+    now = datetime.now(timezone.utc)
+    db = next(get_db())
+    try:
+        call_ids = transcript_repository.claim_due_retries(
+            db, now, now + timedelta(seconds=config.TRANSCRIPT_RETRY_LEASE_SECONDS)
+        )
+    finally:
+        db.close()
+
+    for call_id in call_ids:
+        call_service.schedule_process_call(call_id, JobClass.BACKFILL)
+
+    if call_ids:
+        logger.info(f"Scheduled transcript retries for {len(call_ids)} calls")
+    return len(call_ids)
+
+
+async def _run_sweeper():
+    while True:
+        await asyncio.sleep(config.TRANSCRIPT_RETRY_SWEEP_SECONDS)
+        try:
+            sweep_due_retries()
+        except Exception as e:
+            logger.error(f"Transcript retry sweep failed: {str(e)}")
+
+
+def start_retry_sweeper():
+    """Start the periodic retry sweep on the running event loop (once per process)."""
+    global _sweeper_task
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.get_running_loop().create_task(_run_sweeper())
+
+
+def reprocess_failed(db: Session, call_id: Optional[UUID] = None) -> dict:
+    """
+    Reset failed transcripts, of one call or of all calls, and schedule their calls
+    for processing again. A single call goes in the interactive class, bulk runs as backfill.
+    """
+    transcript_count, call_ids = transcript_repository.reset_failed(db, call_id)
+
+    job_class = JobClass.INTERACTIVE if call_id is not None else JobClass.BACKFILL
+    for failed_call_id in call_ids:
+        call_view_service.refresh(db, failed_call_id)
+        call_service.schedule_process_call(failed_call_id, job_class)
+
+    return {"transcript_count": transcript_count, "call_count": len(call_ids)}
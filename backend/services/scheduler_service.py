@@ -0,0 +1,250 @@
+# services/scheduler_service.py
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import loaded_config
+from models.enums import JobClass
+from repositories import processing_job_repository
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+
+class _Job:
+    __slots__ = ("job_class", "name", "factory", "deadline", "future", "submitted_at")
+
+    def __init__(self, job_class: JobClass, name: str, factory: Callable[[], Awaitable[Any]],
+                 deadline: float, future: asyncio.Future):
+        self.job_class = job_class
+        self.name = name
+        self.factory = factory
+        self.deadline = deadline
+        self.future = future
+        self.submitted_at = time.monotonic()
+
+
+class JobScheduler:
+    """
+    In-process scheduler for processing jobs with priority classes.
+
+    - Weighted fair scheduling across classes (stride scheduling): each dispatch
+      advances the class's virtual time by 1 / weight, and the runnable class with
+      the lowest virtual time goes next. A class that was idle re-enters at the
+      current minimum, so it cannot bank credit while idle.
+    - Per-class concurrency caps plus a global cap.
+    - Per-class deadlines: within a class jobs run earliest-deadline-first, and any
+      job already past its deadline jumps ahead of the fair-share order.
+
+    Dispatch is event-driven (on submit and on job completion); there is no polling loop.
+    """
+
+    def __init__(self, class_settings: Dict[JobClass, dict], max_concurrency: int):
+        self.class_settings = class_settings
+        self.max_concurrency = max_concurrency
+
+        self._sequence = itertools.count()
+        self._queues: Dict[JobClass, list] = {job_class: [] for job_class in class_settings}
+        self._running: Dict[JobClass, int] = {job_class: 0 for job_class in class_settings}
+        self._virtual_time: Dict[JobClass, float] = {job_class: 0.0 for job_class in class_settings}
+        self._completed: Dict[JobClass, int] = {job_class: 0 for job_class in class_settings}
+        self._failed: Dict[JobClass, int] = {job_class: 0 for job_class in class_settings}
+        self._deadline_misses: Dict[JobClass, int] = {job_class: 0 for job_class in class_settings}
+        self._tasks = set()
+
+    def submit(
+            self,
+            job_class: JobClass,
+            name: str,
+            factory: Callable[[], Awaitable[Any]],
+            deadline_seconds: Optional[float] = None,
+    ) -> asyncio.Future:
+        """
+        Queue a job and return a future for its result. Must be called from the event loop.
+        `factory` is called with no arguments when the job starts and must return an awaitable.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Fire-and-forget callers never read the result; mark failures as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        if deadline_seconds is None:
+            deadline_seconds = self.class_settings[job_class]["deadline_seconds"]
+
+        if not self._queues[job_class] and not self._running[job_class]:
+            active = [self._virtual_time[other] for other in self._queues
+                      if self._queues[other] or self._running[other]]
+            if active:
+                self._virtual_time[job_class] = max(self._virtual_time[job_class], min(active))
+
+        job = _Job(job_class, name, factory, time.monotonic() + deadline_seconds, future)
+        heapq.heappush(self._queues[job_class], (job.deadline, next(self._sequence), job))
+
+        self._dispatch()
+        return future
+
+    async def run(self, job_class: JobClass, name: str, factory: Callable[[], Awaitable[Any]],
+                  deadline_seconds: Optional[float] = None) -> Any:
+        """Queue a job and wait for its result."""
+        return await self.submit(job_class, name, factory, deadline_seconds)
+
+    def queue_depth(self, job_class: Optional[JobClass] = None) -> int:
+        if job_class is not None:
+            return len(self._queues[job_class])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def running_count(self) -> int:
+        return sum(self._running.values())
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running_count(),
+            "queued": self.queue_depth(),
+            "classes": {
+                job_class.value: {
+                    "weight": settings["weight"],
+                    "max_concurrency": settings["max_concurrency"],
+                    "deadline_seconds": settings["deadline_seconds"],
+                    "queued": len(self._queues[job_class]),
+                    "running": self._running[job_class],
+                    "completed": self._completed[job_class],
+                    "failed": self._failed[job_class],
+                    "deadline_misses": self._deadline_misses[job_class],
+                    "oldest_wait_seconds": round(
+                        now - min(job.submitted_at for _, _, job in self._queues[job_class]), 3
+                    ) if self._queues[job_class] else 0.0,
+                }
+                for job_class, settings in self.class_settings.items()
+            },
+        }
+
+    def _pick_class(self) -> Optional[JobClass]:
+        runnable = [
+            job_class for job_class, queue in self._queues.items()
+            if queue and self._running[job_class] < self.class_settings[job_class]["max_concurrency"]
+        ]
+        if not runnable:
+            return None
+
+        now = time.monotonic()
+        overdue = [job_class for job_class in runnable if self._queues[job_class][0][0] <= now]
+        if overdue:
+            return min(overdue, key=lambda job_class: self._queues[job_class][0][0])
+
+        return min(runnable, key=lambda job_class: self._virtual_time[job_class])
+
+    def _dispatch(self):
+        while self.running_count() < self.max_concurrency:
+            job_class = self._pick_class()
+            if job_class is None:
+                return
+
+            _, _, job = heapq.heappop(self._queues[job_class])
+            self._running[job_class] += 1
+            self._virtual_time[job_class] += 1.0 / self.class_settings[job_class]["weight"]
+
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _Job):
+        started_at = time.monotonic()
+        try:
+            result = await job.factory()
+            self._completed[job.job_class] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        except Exception as e:
+            self._failed[job.job_class] += 1
+            logger.error(f"Job {job.name} ({job.job_class.value}) failed: {str(e)}")
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            finished_at = time.monotonic()
+            if finished_at > job.deadline:
+                self._deadline_misses[job.job_class] += 1
+                logger.warning(
+                    f"Job {job.name} ({job.job_class.value}) missed its deadline: "
+                    f"waited {started_at - job.submitted_at:.1f}s, ran {finished_at - started_at:.1f}s"
+                )
+
+            self._running[job.job_class] -= 1
+            self._dispatch()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution: the first caller
+    starts it, later callers await the same result. A caller that gives up (e.g. a
+    disconnected client) does not cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Any, asyncio.Future] = {}
+
+    async def run(self, key: Any, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            logger.info(f"Joining in-flight run for {key}")
+        return await asyncio.shield(future)
+
+    def is_running(self, key: Any) -> bool:
+        return key in self._in_flight
+
+    def _finish(self, key: Any, future: asyncio.Future):
+        self._in_flight.pop(key, None)
+        # Mark failures as retrieved in case every caller has already gone away
+        if not future.cancelled():
+            future.exception()
+
+
+scheduler = JobScheduler(
+    class_settings={JobClass(name): settings for name, settings in config.JOB_CLASS_SETTINGS.items()},
+    max_concurrency=config.JOB_MAX_CONCURRENCY,
+)
+
+
+# Module-level functions that delegate to the scheduler instance
+def submit(job_class: JobClass, name: str, factory: Callable[[], Awaitable[Any]],
+           deadline_seconds: Optional[float] = None) -> asyncio.Future:
+    return scheduler.submit(job_class, name, factory, deadline_seconds)
+
+
+async def run(job_class: JobClass, name: str, factory: Callable[[], Awaitable[Any]],
+              deadline_seconds: Optional[float] = None) -> Any:
+    return await scheduler.run(job_class, name, factory, deadline_seconds)
+
+
+def get_stats() -> dict:
+    return scheduler.get_stats()
+
+
+def get_worker_stats(db: Session) -> dict:
+    """Durable queue counts and the last health report written by worker.py."""
+    health = None
+    if os.path.exists(config.WORKER_HEALTH_FILE):
+        try:
+            with open(config.WORKER_HEALTH_FILE) as health_file:
+                health = json.load(health_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read worker health file: {str(e)}")
+
+    return {
+        "processing_mode": config.PROCESSING_MODE,
+        "queue": processing_job_repository.count_by_status(db),
+        "worker_health": health,
+    }
@@ -0,0 +1,87 @@
+# services/search_service.py
+
+import logging
+from uuid import UUID
+
+from database import get_db
+from repositories import search_repository
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 100
+
+
+def index_transcript(db: Session, transcript_id: UUID):
+    """
+    Refresh the search index entry for a single transcript (and its insight, if any).
+    Called after every insert/update of the indexed fields; the caller commits. The write
+    runs in a savepoint and failures are logged rather than raised, so they never undo or
+    fail the write that triggered them.
+    """
+    try:
+        with db.begin_nested():
+            for doc_transcript_id, call_id, fields in search_repository.get_documents(db, transcript_id):
+                search_repository.upsert(db, doc_transcript_id, call_id, fields)
+    except Exception as e:
+        logger.error(f"Failed to index transcript {transcript_id}: {str(e)}")
+
+
+def remove_transcript(db: Session, transcript_id: UUID):
+    """Drop a deleted transcript from the search index. The caller commits."""
+    search_repository.delete(db, str(transcript_id))
+
+
+def rebuild_index(db: Session, batch_size: int = 1000) -> int:
+    """
+    Re-index every transcript from the source tables, committing once per batch.
+    Returns the number of documents indexed.
+    """
+    count = 0
+    for batch in search_repository.get_document_batches(db, batch_size):
+        for transcript_id, call_id, fields in batch:
+            search_repository.upsert(db, transcript_id, call_id, fields)
+        db.commit()
+        count += len(batch)
+
+    search_repository.mark_loaded()
+    logger.info(f"Search index rebuilt with {count} transcripts")
+    return count
+
+
+def backfill():
+    """Build the search index if it is empty, e.g. on a database created before it existed. Run at startup."""
+    db = next(get_db())
+    try:
+        if search_repository.is_empty(db):
+            rebuild_index(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to backfill the search index: {str(e)}")
+    finally:
+        db.close()
+
+
+def search(db: Session, query: str, page: int = 1, page_size: int = 20) -> dict:
+    """
+    Search transcripts and their summaries, returning one page of ranked, highlighted results.
+    """
+    if not query or not query.strip():
+        raise ValueError("Search query is required")
+
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+
+    # The in-process fallback index starts empty, so populate it on first use
+    if not search_repository.is_loaded(db):
+        rebuild_index(db)
+
+    total, results = search_repository.search(db, query, limit=page_size, offset=(page - 1) * page_size)
+
+    return {
+        "query": query,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "results": results,
+    }
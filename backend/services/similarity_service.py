@@ -0,0 +1,171 @@
+# services/similarity_service.py
+
+import asyncio
+import hashlib
+import logging
+from typing import List, Optional
+from uuid import UUID
+
+from clients import embedding_client
+from config import loaded_config
+from database import get_db
+from models.entities.insight import Insight
+from models.entities.transcript import Transcript
+from repositories.vector_repository import VectorIndex
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+vector_index = VectorIndex(config.VECTOR_INDEX_PATH, config.VECTOR_INDEX_ANN_THRESHOLD)
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+def _summary_text(insight: Insight) -> str:
+    """The text we embed for an insight: the refined summary when there is one, else the AI summary."""
+    return insight.refined_summary or insight.ai_summary or ""
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha1(f"{config.EMBEDDER}:{config.EMBEDDING_MODEL}:{text}".encode("utf-8")).hexdigest()
+
+
+def embed_insights(insights: List[Insight]) -> int:
+    """
+    Embed the given insights in batches and upsert them into the vector index.
+    Insights whose summary has not changed since they were last embedded are skipped.
+    Returns the number of insights (re-)embedded.
+    """
+    pending_ids, pending_texts, pending_hashes = [], [], []
+    for insight in insights:
+        text = _summary_text(insight)
+        if not text:
+            continue
+
+        text_hash = _text_hash(text)
+        if vector_index.get_hash(str(insight.id)) == text_hash:
+            continue
+
+        pending_ids.append(str(insight.id))
+        pending_texts.append(text)
+        pending_hashes.append(text_hash)
+
+    if not pending_ids:
+        return 0
+
+    vectors = embedding_client.embed_texts(pending_texts)
+    vector_index.upsert(pending_ids, vectors, pending_hashes)
+    vector_index.save()
+    return len(pending_ids)
+
+
+def index_call(db: Session, call_id: UUID) -> int:
+    """Embed every insight of a call. Failures are logged, never raised to the caller."""
+    try:
+        insights = db.query(Insight).join(Transcript).filter(Transcript.call_id == call_id).all()
+        return embed_insights(insights)
+    except Exception as e:
+        logger.error(f"Failed to embed insights for call {call_id}: {str(e)}")
+        return 0
+
+
+def index_insight(db: Session, insight: Insight) -> int:
+    try:
+        return embed_insights([insight])
+    except Exception as e:
+        logger.error(f"Failed to embed insight {insight.id}: {str(e)}")
+        return 0
+
+
+def sync_index(db: Session) -> int:
+    """
+    Embed every insight that is missing from, or stale in, the vector index, then fold the
+    per-process shards into the main index file. Returns the number of insights embedded.
+    """
+    count = 0
+    batch = []
+    for insight in db.query(Insight).yield_per(config.EMBEDDING_BATCH_SIZE * 4):
+        batch.append(insight)
+        if len(batch) >= config.EMBEDDING_BATCH_SIZE * 4:
+            count += embed_insights(batch)
+            batch = []
+
+    count += embed_insights(batch)
+    vector_index.compact()
+    logger.info(f"Vector index synced, {count} insights embedded")
+    return count
+
+
+def _sync_in_background():
+    db = next(get_db())
+    try:
+        sync_index(db)
+    except Exception as e:
+        logger.error(f"Vector index sync failed: {str(e)}")
+    finally:
+        db.close()
+
+
+def start_index_sync():
+    """
+    Sync the vector index in a background thread. Run at API startup only, so a single
+    process compacts the main index file while workers keep writing their own shards.
+    """
+    global _sync_task
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.get_running_loop().create_task(asyncio.to_thread(_sync_in_background))
+
+
+def find_similar_calls(db: Session, call_id: UUID, limit: int = 10) -> List[dict]:
+    """
+    Find the calls most similar to the given call.
+    Each of the call's insights is used as a query; a candidate call scores the best
+    similarity any of its insights reached against any of the source call's insights.
+    """
+    insights = db.query(Insight).join(Transcript).filter(Transcript.call_id == call_id).all()
+    if not insights:
+        return []
+
+    # Make sure the query vectors are present and current before searching
+    embed_insights(insights)
+
+    own_ids = {str(insight.id) for insight in insights}
+    _, vectors = vector_index.get_vectors(list(own_ids))
+    if len(vectors) == 0:
+        return []
+
+    # Over-fetch: the call's own insights and sibling transcripts of the same call collapse together
+    neighbours = vector_index.query(vectors, k=(limit + len(own_ids)) * 4)
+
+    best_by_insight = {}
+    for row in neighbours:
+        for insight_id, score in row:
+            if insight_id in own_ids:
+                continue
+            best_by_insight[insight_id] = max(score, best_by_insight.get(insight_id, float("-inf")))
+
+    if not best_by_insight:
+        return []
+
+    rows = db.query(Insight.id, Transcript.id, Transcript.call_id) \
+        .join(Transcript, Insight.transcript_id == Transcript.id) \
+        .filter(Insight.id.in_([UUID(insight_id) for insight_id in best_by_insight])) \
+        .all()
+
+    best_by_call = {}
+    for insight_id, transcript_id, similar_call_id in rows:
+        if similar_call_id == call_id:
+            continue
+        score = best_by_insight[str(insight_id)]
+        current = best_by_call.get(similar_call_id)
+        if current is None or score > current["similarity"]:
+            best_by_call[similar_call_id] = {
+                "call_id": str(similar_call_id),
+                "transcript_id": str(transcript_id),
+                "insight_id": str(insight_id),
+                "similarity": round(score, 4),
+            }
+
+    return sorted(best_by_call.values(), key=lambda item: item["similarity"], reverse=True)[:limit]
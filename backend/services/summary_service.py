@@ -0,0 +1,191 @@
+# services/summary_service.py
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from clients import cache_client
+from config import loaded_config
+from models.entities.call import Call
+from repositories import call_repository
+from sqlalchemy.orm import Session
+
+try:
+    import orjson
+except ImportError:  # Optional: faster serialization, the standard json module is used otherwise
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+
+class LocalCache:
+    """Thread-safe in-process LRU of serialized call fragments, keyed by call id."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, call_id: UUID, version: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(call_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(call_id)
+            return entry[1]
+
+    def set(self, call_id: UUID, version: str, fragment: bytes):
+        with self._lock:
+            self._entries[call_id] = (version, fragment)
+            self._entries.move_to_end(call_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, call_id: UUID):
+        with self._lock:
+            self._entries.pop(call_id, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+local_cache = LocalCache(config.SUMMARY_CACHE_MAX_ENTRIES)
+shared_cache = cache_client.init_cache()
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _shared_key(call_id: UUID, version: str) -> str:
+    return f"summaries:{call_id}:{version}"
+
+
+def serialize_call(call: Call) -> dict:
+    transcripts_list = []
+    for transcript in call.transcripts:
+        insight_data = None
+        insight = transcript.insight
+        if insight:
+            insight_data = {
+                "payment_status": insight.payment_status.value if insight.payment_status else None,
+                "payment_amount": str(insight.payment_amount),
+                "payment_currency": insight.payment_currency.value if insight.payment_currency else None,
+                "payment_date": insight.payment_date.isoformat() if insight.payment_date else None,
+                "payment_method": insight.payment_method.value if insight.payment_method else None,
+                "comments": insight.comments,
+
+                "ai_summary": insight.ai_summary,
+                "user_summary": insight.user_summary,
+                "refined_summary": insight.refined_summary,
+
+                "llm_refinement_count": insight.llm_refinement_count,
+                "llm_refinement_required": insight.llm_refinement_required,
+                "version": insight.version
+            }
+
+        transcripts_list.append({
+            "transcript_id": str(transcript.id),
+            "file_name": transcript.file_name,
+            "file_content": transcript.file_content,
+            "uploaded_at": transcript.uploaded_at.isoformat(),
+            "processed_at": transcript.processed_at.isoformat() if transcript.processed_at else None,
+            "transcript_status": transcript.transcript_status.value if transcript.transcript_status else None,
+            "attempts": transcript.attempts,
+            "last_error": transcript.last_error,
+            "next_attempt_at": transcript.next_attempt_at.isoformat() if transcript.next_attempt_at else None,
+            "original_token_count": transcript.original_token_count,
+            "prompt_token_count": transcript.prompt_token_count,
+            "insight": insight_data
+        })
+
+    return {
+        "call_id": str(call.id),
+        "call_status": call.call_status.value,
+        "raw_summary": call.raw_summary,
+        "ai_summary": call.ai_summary,
+        "ai_summary_updated_at": call.ai_summary_updated_at.isoformat() if call.ai_summary_updated_at else None,
+        "llm_refinement_required": call.llm_refinement_required,
+        "llm_refinement_count": call.llm_refinement_count,
+        "created_at": call.created_at.isoformat() if call.created_at else None,
+        "updated_at": call.updated_at.isoformat() if call.updated_at else None,
+        "transcripts": transcripts_list
+    }
+
+
+def _build_fragments(db: Session, call_ids: List[UUID], batch_size: int = 500) -> Dict[UUID, bytes]:
+    fragments = {}
+    for start in range(0, len(call_ids), batch_size):
+        for call in call_repository.get_with_insights(db, call_ids[start:start + batch_size]):
+            try:
+                fragments[call.id] = _dumps(serialize_call(call))
+            except Exception as e:
+                print(f"Error processing call {call.id}: {str(e)}")
+    return fragments
+
+
+def get_summaries_json(db: Session) -> bytes:
+    """
+    The /summaries response body. Each call's JSON fragment is served from the local LRU,
+    then the shared cache, and only rebuilt from the database when the call has changed
+    since it was cached (the fragment is keyed by the call's version).
+    """
+    versions = call_repository.get_versions(db)
+
+    fragments: Dict[UUID, bytes] = {}
+    missing = []
+    for call_id, version in versions:
+        fragment = local_cache.get(call_id, version)
+        if fragment is None:
+            missing.append((call_id, version))
+        else:
+            fragments[call_id] = fragment
+
+    if missing and shared_cache is not None:
+        try:
+            found = shared_cache.get_many([_shared_key(call_id, version) for call_id, version in missing])
+        except Exception as e:
+            logger.warning(f"Shared summary cache unavailable: {str(e)}")
+            found = {}
+        still_missing = []
+        for call_id, version in missing:
+            fragment = found.get(_shared_key(call_id, version))
+            if fragment is None:
+                still_missing.append((call_id, version))
+            else:
+                fragments[call_id] = fragment
+                local_cache.set(call_id, version, fragment)
+        missing = still_missing
+
+    if missing:
+        built = _build_fragments(db, [call_id for call_id, _ in missing])
+        for call_id, version in missing:
+            if call_id in built:
+                fragments[call_id] = built[call_id]
+                local_cache.set(call_id, version, built[call_id])
+
+        if shared_cache is not None:
+            try:
+                shared_cache.set_many({
+                    _shared_key(call_id, version): built[call_id] for call_id, version in missing if call_id in built
+                })
+            except Exception as e:
+                logger.warning(f"Shared summary cache unavailable: {str(e)}")
+
+    body = b",".join(fragments[call_id] for call_id, _ in versions if call_id in fragments)
+    return b'{"summaries":[' + body + b"]}"
+
+
+def invalidate(call_id: UUID):
+    """
+    Drop a call's cached fragment from this process. Not required for correctness, since
+    a changed call has a new version, but frees the stale entry straight away.
+    """
+    local_cache.invalidate(call_id)
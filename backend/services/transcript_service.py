@@ -1,20 +1,28 @@
 # services/transcript_service.py
 import asyncio
 import logging
-from datetime import datetime, timezone, date
+import random
+from datetime import datetime, timezone, date, timedelta
+from typing import List, Optional
 from uuid import UUID
 
 from clients import llm_client
+from config import loaded_config
+from database import get_db
 from fastapi import UploadFile, HTTPException
 from models.entities.insight import Insight
 from models.entities.transcript import Transcript
-from models.enums import PaymentStatus, PaymentCurrency, PaymentMethod
-from repositories import transcript_repository
-from services import insight_service
+from models.enums import PaymentStatus, PaymentCurrency, PaymentMethod, JobClass, SpeakerRole, ExtractionOutcome, \
+    TranscriptStatus, UnknownMode, CallStatus
+from repositories import transcript_repository, transcript_turn_repository
+from services import call_view_service, insight_service, preprocessing_service, scheduler_service, search_service, \
+    usage_service
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+config = loaded_config
+
 
 async def create_transcript(
         db: Session,
@@ -30,6 +38,8 @@ async def create_transcript(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read file {file.filename}") from e
 
+    check_transcript_length(file.filename, content)
+
     transcript = transcript_repository.create(
         db=db,
         call_id=call_id,
@@ -38,9 +48,68 @@ async def create_transcript(
         file_content=content.decode("utf-8")
     )
 
+    store_turns(db, transcript)
+    search_service.index_transcript(db, transcript.id)
+    db.commit()
+
     return transcript
 
 
+def check_transcript_length(file_name: str, content: bytes):
+    if len(content) > config.MAX_TRANSCRIPT_LENGTH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File {file_name} exceeds the maximum transcript size of {config.MAX_TRANSCRIPT_LENGTH} bytes"
+        )
+
+
+def store_turns(db: Session, transcript: Transcript) -> int:
+    """Parse a transcript into speaker turns and bulk-store them. Returns the number of turns."""
+    turns = preprocessing_service.parse_turns(transcript.transcript_text)
+    transcript_turn_repository.replace_for_transcript(db, transcript.id, [
+        {
+            "speaker": turn.speaker,
+            "speaker_role": turn.role,
+            "start_offset": turn.start,
+            "end_offset": turn.end,
+        }
+        for turn in turns
+    ])
+    return len(turns)
+
+
+def get_turns(
+        db: Session,
+        transcript_id: UUID,
+        start_index: int = 0,
+        end_index: Optional[int] = None,
+        roles: Optional[List[SpeakerRole]] = None
+) -> List[dict]:
+    """
+    Retrieve a range of speaker turns with their text, sliced from the stored transcript.
+    Transcripts uploaded before turns were stored are parsed on first access.
+    """
+    transcript = transcript_repository.get_by_id(db, transcript_id)
+    if not transcript:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    if not transcript_turn_repository.count_for_transcript(db, transcript_id):
+        store_turns(db, transcript)
+
+    turns = transcript_turn_repository.get_range(db, transcript_id, start_index, end_index, roles)
+    return [
+        {
+            "turn_index": turn.turn_index,
+            "speaker": turn.speaker,
+            "speaker_role": turn.speaker_role.value,
+            "start_offset": turn.start_offset,
+            "end_offset": turn.end_offset,
+            "text": " ".join(transcript.transcript_text[turn.start_offset:turn.end_offset].split()),
+        }
+        for turn in turns
+    ]
+
+
 def get_transcripts_by_call_id(
         db: Session,
         call_id: UUID
@@ -54,11 +123,108 @@ def get_transcripts_by_call_id(
     return transcripts
 
 
-async def process_transcript(db: Session, transcript: Transcript):
+async def process_transcript(db: Session, transcript: Transcript) -> Optional[Insight]:
     """
     Process a transcript using the LLM client and return the generated insight.
+    When extraction fails nothing is written to the insight; the transcript is marked
+    for retry or as failed and None is returned.
+    """
+    prepared = await _prepare(transcript)
+
+    with usage_service.usage_scope(call_id=transcript.call_id, transcript_id=transcript.id):
+        result = None
+        if config.EXTRACTION_CHUNK_TOKENS and prepared.prompt_tokens > config.EXTRACTION_CHUNK_TOKENS:
+            result = await asyncio.to_thread(_extract_in_parts, transcript.id, prepared.text)
+        if result is None:
+            result = await asyncio.to_thread(llm_client.process_transcript_text, prepared.text)
+
+    return apply_extraction(db, transcript, result)
+
+
+def _extract_in_parts(transcript_id: UUID, prompt_text: str) -> Optional[llm_client.ExtractionResult]:
     """
-    llm_data = await asyncio.to_thread(llm_client.process_transcript_text, transcript.transcript_text)
+    Extract a long transcript split on turn boundaries, sending its parts together in one
+    batched request. Returns None when it fits in one part or any part failed.
+    """
+    parts = preprocessing_service.split_prompt(prompt_text, config.EXTRACTION_CHUNK_TOKENS)
+    if len(parts) < 2:
+        return None
+
+    result = llm_client.process_call_transcripts(parts)
+    if result is None or any(extraction.outcome != ExtractionOutcome.SUCCESS for extraction in result.extractions):
+        logger.warning(f"Extraction in {len(parts)} parts failed for transcript {transcript_id}, sending it whole")
+        return None
+    return merge_part_extractions(result)
+
+
+def merge_part_extractions(result: llm_client.CallExtractionResult) -> llm_client.ExtractionResult:
+    """
+    Combine the extractions of consecutive parts of one transcript. Each field takes the last
+    value a part reported, as later turns settle what earlier ones discussed; a part with no
+    payment talk reports Pending, so that status never replaces one found earlier.
+    """
+    merged = {}
+    for extraction in result.extractions:
+        for field, value in extraction.data.items():
+            if value in (None, ""):
+                continue
+            if field == "payment_status" and merged.get(field) and \
+                    PaymentStatus.from_string(str(value)) == PaymentStatus.PENDING:
+                continue
+            merged[field] = value
+
+    merged["ai_summary"] = result.call_summary or " ".join(
+        extraction.data["ai_summary"] for extraction in result.extractions
+    )
+    return llm_client.ExtractionResult(ExtractionOutcome.SUCCESS, data=merged)
+
+
+async def process_transcripts_together(db: Session, call_id: UUID, transcripts: List[Transcript]) -> Optional[str]:
+    """
+    Extract all transcripts of a call and the call summary in a single LLM request, when
+    their prompts fit within BATCHED_EXTRACTION_MAX_TOKENS. Transcripts whose extraction
+    succeeded are saved; the rest are left unprocessed for the per-transcript path.
+    Returns the call summary, or None if any transcript still needs processing.
+    """
+    prepared = [await _prepare(transcript) for transcript in transcripts]
+    prompt_tokens = sum(item.prompt_tokens for item in prepared)
+    if prompt_tokens > config.BATCHED_EXTRACTION_MAX_TOKENS:
+        logger.info(f"Call {call_id} prompts ({prompt_tokens} tokens) exceed the batched extraction budget")
+        return None
+
+    with usage_service.usage_scope(call_id=call_id):
+        result = await asyncio.to_thread(llm_client.process_call_transcripts, [item.text for item in prepared])
+
+    if result is None:
+        logger.warning(f"Batched extraction failed for call {call_id}, falling back to per-transcript extraction")
+        return None
+
+    succeeded = 0
+    # The client matches entries to transcripts by the index the model echoes, in input order
+    for transcript, extraction in zip(transcripts, result.extractions):
+        if extraction.outcome == ExtractionOutcome.SUCCESS:
+            apply_extraction(db, transcript, extraction)
+            succeeded += 1
+
+    if succeeded < len(transcripts):
+        return None
+    return result.call_summary
+
+
+async def _prepare(transcript: Transcript) -> preprocessing_service.PreparedTranscript:
+    prepared = await asyncio.to_thread(preprocessing_service.preprocess_transcript, transcript.transcript_text)
+    transcript.original_token_count = prepared.original_tokens
+    transcript.prompt_token_count = prepared.prompt_tokens
+    return prepared
+
+
+def apply_extraction(db: Session, transcript: Transcript, result: llm_client.ExtractionResult) -> Optional[Insight]:
+    """Save an extraction result as the transcript's insight, or record the failure."""
+    if result.outcome != ExtractionOutcome.SUCCESS:
+        record_extraction_failure(db, transcript, result.outcome, result.error)
+        return None
+
+    llm_data = result.data
 
     payment_date = None
     if llm_data.get("payment_date"):
@@ -81,44 +247,154 @@ async def process_transcript(db: Session, transcript: Transcript):
             if comments \
             else f"Specific Payment Currency: {llm_data.get('payment_currency').split('Other - ')[1]}"
 
-    payment_status = PaymentStatus.from_string(llm_data.get("payment_status", "").capitalize())
-    payment_currency = PaymentCurrency.from_string(llm_data.get("payment_currency", ""))
-    payment_method = PaymentMethod.from_string(llm_data.get("payment_method", ""))
+    unknown = UnknownMode(config.ENUM_UNKNOWN_MODE)
+    try:
+        # Status and currency are required, so "none" still falls back to their defaults
+        payment_status = PaymentStatus.from_string(llm_data.get("payment_status", ""), unknown) \
+            or PaymentStatus.PENDING
+        payment_currency = PaymentCurrency.from_string(llm_data.get("payment_currency", ""), unknown) \
+            or PaymentCurrency.USD
+        payment_method = PaymentMethod.from_string(llm_data.get("payment_method", ""), unknown)
+    except ValueError as e:
+        record_extraction_failure(db, transcript, ExtractionOutcome.PERMANENT_FAILURE, str(e))
+        return None
 
     current_time = datetime.now(timezone.utc)
     ai_summary = llm_data.get("ai_summary", "")
 
-    history_entry = {
-        "timestamp": current_time.isoformat(),
-        "ai_summary": ai_summary,
-        "user_summary": "",
-        "refined_summary": "",
-    }
-
-    summary_history = [history_entry]
-
-    insight = insight_service.create_insight(
-        db,
-        transcript.id,
-        payment_status,
-        llm_data.get("payment_amount"),
-        payment_currency,
-        payment_date,
-        payment_method,
-        ai_summary,
-        current_time,
-        comments,
-        summary_history
-    )
+    if transcript.insight:
+        # Re-processing a replaced transcript, overwrite the existing insight in place
+        insight = insight_service.replace_extraction(
+            db,
+            transcript.insight,
+            payment_status,
+            llm_data.get("payment_amount"),
+            payment_currency,
+            payment_date,
+            payment_method,
+            ai_summary,
+            current_time,
+            comments
+        )
+    else:
+        insight = insight_service.create_insight(
+            db,
+            transcript.id,
+            payment_status,
+            llm_data.get("payment_amount"),
+            payment_currency,
+            payment_date,
+            payment_method,
+            ai_summary,
+            current_time,
+            comments
+        )
 
     transcript.processed_at = current_time
+    transcript.transcript_status = TranscriptStatus.PROCESSED
+    transcript.attempts = 0
+    transcript.last_error = None
+    transcript.next_attempt_at = None
+    db.commit()
+
+    search_service.index_transcript(db, transcript.id)
     db.commit()
     return insight
 
 
-def update_user_summary(db: Session, insight_id: str, user_summary: str) -> Insight:
-    return insight_service.update_user_summary(db, insight_id, user_summary)
+def record_extraction_failure(db: Session, transcript: Transcript, outcome: ExtractionOutcome, error: str):
+    """
+    Schedule a retry with exponential backoff and jitter for a retryable failure, or mark
+    the transcript failed once it is permanent or TRANSCRIPT_MAX_ATTEMPTS is used up.
+    """
+    transcript.attempts = (transcript.attempts or 0) + 1
+    transcript.last_error = error
+
+    if outcome == ExtractionOutcome.RETRYABLE and transcript.attempts < config.TRANSCRIPT_MAX_ATTEMPTS:
+        delay = min(config.TRANSCRIPT_RETRY_MAX_SECONDS,
+                    config.TRANSCRIPT_RETRY_BASE_SECONDS * 2 ** (transcript.attempts - 1))
+        transcript.transcript_status = TranscriptStatus.RETRYING
+        transcript.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=random.uniform(delay / 2, delay))
+        logger.warning(f"Extraction failed for transcript {transcript.id} (attempt {transcript.attempts}), "
+                       f"retrying in ~{delay:.0f}s: {error}")
+    else:
+        transcript.transcript_status = TranscriptStatus.FAILED
+        transcript.next_attempt_at = None
+        logger.error(f"Extraction failed for transcript {transcript.id} after {transcript.attempts} attempts: {error}")
+
+    db.commit()
+
+
+async def replace_transcript(db: Session, transcript_id: UUID, file: UploadFile) -> Transcript:
+    """
+    Replace the text of an existing transcript. The transcript is marked unprocessed
+    so the next process_call run re-extracts its insight.
+    """
+    transcript = transcript_repository.get_by_id(db, transcript_id)
+    if not transcript:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    if transcript.call.call_status == CallStatus.PROCESSING:
+        raise HTTPException(status_code=409, detail="Call is currently being processed.")
+
+    try:
+        content = await file.read()
+        transcript_text = content.decode("utf-8")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to read file {file.filename}") from e
+
+    check_transcript_length(file.filename, content)
+
+    transcript.file_name = file.filename
+    transcript.transcript_text = transcript_text
+    transcript.file_content = transcript_text
+    transcript.uploaded_at = datetime.now(timezone.utc)
+    transcript.processed_at = None
+    transcript.transcript_status = TranscriptStatus.PENDING
+    transcript.attempts = 0
+    transcript.last_error = None
+    transcript.next_attempt_at = None
+    transcript_repository.save(db, transcript)
+
+    store_turns(db, transcript)
+    search_service.index_transcript(db, transcript.id)
+    db.commit()
+    call_view_service.refresh(db, transcript.call_id)
+
+    return transcript
+
+
+def update_user_summary(
+        db: Session,
+        insight_id: str,
+        user_summary: str,
+        expected_version: Optional[int] = None
+) -> Insight:
+    return insight_service.update_user_summary(db, insight_id, user_summary, expected_version)
+
+
+# Concurrent refinement requests for the same insight share one LLM call
+_refinements = scheduler_service.SingleFlight()
 
 
 async def generate_refined_summary(db: Session, insight_id: str) -> Insight:
-    return await insight_service.generate_refined_summary(db, insight_id)
+    # A reviewer is waiting on this, so it runs in the refinement class ahead of backfills
+    await _refinements.run(insight_id, lambda: scheduler_service.run(
+        JobClass.REFINEMENT,
+        f"generate_refined_summary:{insight_id}",
+        lambda: _refine_in_own_session(insight_id)
+    ))
+
+    # The refinement ran in its own session; read back the committed result
+    insight = insight_service.get_insight(db, UUID(insight_id))
+    db.refresh(insight)
+    return insight
+
+
+async def _refine_in_own_session(insight_id: str):
+    # Shared by every joined caller, so it must not depend on any one request's session
+    db = next(get_db())
+    try:
+        await insight_service.generate_refined_summary(db, insight_id)
+    finally:
+        db.close()
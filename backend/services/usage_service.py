@@ -0,0 +1,225 @@
+# services/usage_service.py
+
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from clients import usage_recorder
+from config import loaded_config
+from constants.constants import LLM_PRICING_PER_MILLION_TOKENS
+from database import SessionLocal
+from repositories import llm_usage_repository
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+config = loaded_config
+
+# Which call/transcript the current LLM request is for. Set by the services around
+# their LLM calls; asyncio.to_thread copies it into the worker thread.
+_usage_context: contextvars.ContextVar[dict] = contextvars.ContextVar("llm_usage_context", default={})
+
+# Set by capture_usage(): entries are collected into this list instead of the ledger
+_captured_usage: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("llm_captured_usage", default=None)
+
+
+@contextmanager
+def usage_scope(call_id: Optional[UUID] = None, transcript_id: Optional[UUID] = None):
+    """Attribute every LLM request made inside this block to the given call/transcript."""
+    token = _usage_context.set({**_usage_context.get(), "call_id": call_id, "transcript_id": transcript_id})
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+@contextmanager
+def capture_usage():
+    """
+    Collect the usage entries of every LLM request made inside this block into the yielded
+    list instead of writing them to the ledger, e.g. for evaluation runs.
+    """
+    entries = []
+    token = _captured_usage.set(entries)
+    try:
+        yield entries
+    finally:
+        _captured_usage.reset(token)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> Decimal:
+    # Dated snapshots ("gpt-4o-2024-08-06") are priced like their base model
+    pricing = LLM_PRICING_PER_MILLION_TOKENS.get(model)
+    if pricing is None:
+        base = max((name for name in LLM_PRICING_PER_MILLION_TOKENS if model.startswith(name + "-")),
+                   key=len, default=None)
+        pricing = LLM_PRICING_PER_MILLION_TOKENS.get(base, (0.0, 0.0, 0.0))
+
+    prompt_price, cached_price, completion_price = pricing
+    cost = ((prompt_tokens - cached_tokens) * prompt_price
+            + cached_tokens * cached_price
+            + completion_tokens * completion_price) / 1_000_000
+    return Decimal(str(round(cost, 6)))
+
+
+class UsageWriter:
+    """
+    Buffers ledger records in memory and writes them from a background thread in
+    batches, so recording usage never adds a DB round trip to an LLM request.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict):
+        self._ensure_started()
+        self._queue.put(entry)
+
+    def _ensure_started(self):
+        # Also restarts the thread in forked worker processes, which do not inherit it
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="llm-usage-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def _drain(self, block: bool) -> List[dict]:
+        batch = []
+        try:
+            batch.append(self._queue.get(block=block, timeout=self.flush_interval if block else None))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: List[dict]):
+        try:
+            with SessionLocal() as db:
+                llm_usage_repository.bulk_create(db, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} LLM usage records: {str(e)}")
+
+    def flush(self):
+        """Write everything still buffered. Called at interpreter exit and by flush_usage()."""
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+
+_writer = UsageWriter(config.USAGE_LEDGER_BATCH_SIZE, config.USAGE_LEDGER_FLUSH_SECONDS)
+atexit.register(_writer.flush)
+
+
+def flush_usage():
+    """
+    Write every buffered ledger entry now. atexit handlers do not run in process-pool
+    children, so the worker calls this after each job.
+    """
+    _writer.flush()
+
+
+def record_llm_usage(
+        method: str,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency_ms: int = 0,
+        cache_hit: bool = False,
+        success: bool = True,
+        replayed: bool = False
+):
+    """
+    Queue one ledger entry, attributed to the current usage_scope(). A `replayed` request was
+    answered from the cassette store: it keeps its recorded cost inside capture_usage(), so
+    evaluation reports compare with the live run, and is a zero-cost cache hit in the ledger.
+    """
+    captured = _captured_usage.get()
+    if replayed and captured is None:
+        cache_hit = True
+
+    context = _usage_context.get()
+    entry = {
+        "call_id": context.get("call_id"),
+        "transcript_id": context.get("transcript_id"),
+        "method": method,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "latency_ms": latency_ms,
+        "cost_usd": Decimal(0) if cache_hit else estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+        "cache_hit": cache_hit,
+        "success": success,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+    if captured is not None:
+        captured.append(entry)
+        return
+    _writer.record(entry)
+
+
+# The LLM clients report every request through this hook
+usage_recorder.set_recorder(record_llm_usage)
+
+
+def _totals(row) -> dict:
+    return {
+        "requests": row.requests,
+        "prompt_tokens": int(row.prompt_tokens or 0),
+        "completion_tokens": int(row.completion_tokens or 0),
+        "cached_tokens": int(row.cached_tokens or 0),
+        "cost_usd": float(row.cost_usd or 0),
+        "avg_latency_ms": round(float(row.avg_latency_ms or 0), 1),
+    }
+
+
+def get_daily_usage(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> List[dict]:
+    return [
+        {"day": str(row.day), "method": row.method, "model": row.model, **_totals(row)}
+        for row in llm_usage_repository.get_daily_rollup(db, start, end)
+    ]
+
+
+def get_call_usage(db: Session, call_id: UUID) -> dict:
+    rows = llm_usage_repository.get_call_rollup(db, call_id)
+    by_method = [{"method": row.method, "model": row.model, **_totals(row)} for row in rows]
+    return {
+        "call_id": str(call_id),
+        "total_cost_usd": round(sum(item["cost_usd"] for item in by_method), 6),
+        "total_requests": sum(item["requests"] for item in by_method),
+        "by_method": by_method,
+    }
+
+
+def get_top_calls(db: Session, limit: int = 20) -> List[dict]:
+    return [
+        {"call_id": str(row.call_id), **_totals(row)}
+        for row in llm_usage_repository.get_top_calls(db, limit)
+    ]
@@ -0,0 +1,32 @@
+# tests/test_admission_service.py
+
+import pytest
+from services import admission_service
+
+
+@pytest.fixture(autouse=True)
+def trusted_proxies(monkeypatch):
+    monkeypatch.setattr(admission_service.config, "ADMISSION_TRUSTED_PROXIES", ["10.0.0.1", "10.0.0.2"])
+
+
+def test_untrusted_peer_headers_are_ignored():
+    scope = {"client": ("203.0.113.7", 5000)}
+    headers = {"x-forwarded-for": "198.51.100.1", "x-client-id": "someone-else"}
+    assert admission_service.client_identity(scope, headers) == "203.0.113.7"
+
+
+def test_forwarded_for_uses_first_untrusted_hop_from_the_right():
+    scope = {"client": ("10.0.0.1", 5000)}
+    headers = {"x-forwarded-for": "192.0.2.99, 198.51.100.1, 10.0.0.2"}
+    assert admission_service.client_identity(scope, headers) == "198.51.100.1"
+
+
+def test_forged_leftmost_hop_does_not_change_the_identity():
+    scope = {"client": ("10.0.0.1", 5000)}
+    first = admission_service.client_identity(scope, {"x-forwarded-for": "192.0.2.1, 198.51.100.1"})
+    second = admission_service.client_identity(scope, {"x-forwarded-for": "192.0.2.2, 198.51.100.1"})
+    assert first == second == "198.51.100.1"
+
+
+def test_trusted_peer_without_forwarded_for_is_the_client():
+    assert admission_service.client_identity({"client": ("10.0.0.1", 5000)}, {}) == "10.0.0.1"
@@ -0,0 +1,78 @@
+# tests/test_call_repository.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from models.entities.base import Base
+from models.entities.call import Call
+from models.entities.insight import Insight
+from models.entities.transcript import Transcript
+from models.enums import CallStatus, PaymentCurrency, PaymentStatus, TranscriptStatus
+from repositories import call_repository, transcript_repository
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'calls.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    event.listen(factory, "before_flush", call_repository.touch_parent_calls)
+    session = factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def call(db):
+    call = Call(call_status=CallStatus.PROCESSED)
+    db.add(call)
+    db.flush()
+    transcript = Transcript(call_id=call.id, file_name="call.txt", transcript_text="Agent: Hello.",
+                            file_content="Agent: Hello.", transcript_status=TranscriptStatus.FAILED,
+                            uploaded_at=datetime.now(timezone.utc))
+    db.add(transcript)
+    db.flush()
+    db.add(Insight(transcript_id=transcript.id, payment_status=PaymentStatus.PENDING,
+                   payment_currency=PaymentCurrency.USD, ai_summary="Pending."))
+    db.commit()
+
+    # Backdate the call so a touch is always a new version
+    db.query(Call).update({Call.updated_at: datetime.now(timezone.utc) - timedelta(hours=1)},
+                          synchronize_session=False)
+    db.commit()
+    db.expire_all()
+    return call
+
+
+def _version(db):
+    db.expire_all()
+    return call_repository.get_versions(db)[0][1]
+
+
+def test_insight_edit_changes_call_version(db, call):
+    before = _version(db)
+    db.query(Insight).one().payment_status = PaymentStatus.COLLECTED
+    db.commit()
+    assert _version(db) != before
+
+
+def test_transcript_edit_changes_call_version(db, call):
+    before = _version(db)
+    db.query(Transcript).one().attempts = 3
+    db.commit()
+    assert _version(db) != before
+
+
+def test_bulk_transcript_reset_changes_call_version(db, call):
+    before = _version(db)
+    assert transcript_repository.reset_failed(db, call.id)[0] == 1
+    assert _version(db) != before
+
+
+def test_reading_a_call_keeps_its_version(db, call):
+    before = _version(db)
+    call_repository.get_with_insights(db, [call.id])
+    db.commit()
+    assert _version(db) == before
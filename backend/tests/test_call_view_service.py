@@ -0,0 +1,46 @@
+# tests/test_call_view_service.py
+
+import pytest
+from models.entities.base import Base
+from models.entities.call import Call
+from models.entities.call_summary_view import CallSummaryView
+from models.enums import CallStatus
+from services import call_view_service
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'view.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def call(db):
+    call = Call(call_status=CallStatus.UPLOADED)
+    db.add(call)
+    db.commit()
+    return call
+
+
+def test_refresh_writes_the_row(db, call):
+    call_view_service.refresh(db, call.id)
+    assert db.get(CallSummaryView, call.id).call_status == CallStatus.UPLOADED
+
+
+def test_failed_refresh_keeps_the_callers_changes(db, call, monkeypatch):
+    def fail(call):
+        raise ValueError("broken row")
+
+    monkeypatch.setattr(call_view_service, "build_row", fail)
+    call.call_status = CallStatus.PROCESSING
+    call_view_service.refresh(db, call.id)
+    db.commit()
+
+    db.expire_all()
+    assert db.get(Call, call.id).call_status == CallStatus.PROCESSING
+    assert db.get(CallSummaryView, call.id) is None
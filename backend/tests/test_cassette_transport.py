@@ -0,0 +1,58 @@
+# tests/test_cassette_transport.py
+
+import json
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+
+import httpx
+from clients import llm_client
+from config import loaded_config
+from services import evaluation_service
+
+CASES = [{"id": "case", "transcript": "Agent: Your $520 payment went through.", "labels": {"payment_status": "Collected"}}]
+
+
+def _completion(request):
+    time.sleep(0.05)
+    content = json.dumps({"payment_status": "Collected", "payment_amount": 520, "ai_summary": "Paid $520."})
+    return httpx.Response(200, json={
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150},
+    })
+
+
+def _offline(request):
+    raise AssertionError("replay must not reach the network")
+
+
+def _client(monkeypatch, mode, directory, wrapped):
+    # Replays run without a key
+    monkeypatch.setattr(loaded_config, "LLM_API_KEY", "test-key" if mode == "record" else "")
+    monkeypatch.setattr(loaded_config, "LLM_CASSETTE_MODE", mode)
+    monkeypatch.setattr(loaded_config, "LLM_CASSETTE_DIR", str(directory))
+    monkeypatch.setattr(loaded_config, "LLM_CASSETTE_LATENCY_SCALE", 0.0)
+    monkeypatch.setattr(loaded_config, "LLM_HEDGE_METHODS", [])
+    client = llm_client.init_llm("openai")
+    client.cassette.wrapped = httpx.MockTransport(wrapped)
+    return client
+
+
+def test_evaluation_replays_recorded_run(monkeypatch, tmp_path):
+    recorded = evaluation_service.evaluate(_client(monkeypatch, "record", tmp_path, _completion), CASES, preprocess=False)
+    replayed = evaluation_service.evaluate(_client(monkeypatch, "replay", tmp_path, _offline), CASES, preprocess=False)
+
+    live, replay = recorded["cases"][0], replayed["cases"][0]
+    assert replay["succeeded"] and replay["fields"]["payment_status"]["correct"]
+    assert (replay["prompt_tokens"], replay["completion_tokens"]) == (120, 30)
+    # Recorded latency and cost are reported, so the two runs compare directly
+    assert replay["latency_ms"] >= 50
+    assert replay["cost_usd"] == live["cost_usd"] > 0
+
+
+def test_replay_without_recording_fails_the_case(monkeypatch, tmp_path):
+    report = evaluation_service.evaluate(_client(monkeypatch, "replay", tmp_path, _offline), CASES, preprocess=False)
+    assert report["summary"]["failures"] == 1
@@ -0,0 +1,36 @@
+# tests/test_evaluation_service.py
+
+from types import SimpleNamespace
+
+from models.enums import ExtractionOutcome
+from services import evaluation_service
+
+
+class FixedClient:
+    def __init__(self, data):
+        self.data = data
+
+    def process_transcript_text(self, transcript_text):
+        return SimpleNamespace(outcome=ExtractionOutcome.SUCCESS, data=self.data, error=None)
+
+
+def _evaluate(labels, data):
+    cases = [{"id": "case", "transcript": "Agent: Hello.", "labels": labels}]
+    return evaluation_service.evaluate(FixedClient(data), cases, preprocess=False)
+
+
+def test_yearless_date_label_matches_any_year():
+    report = _evaluate({"payment_date": "--03-14"}, {"payment_date": "2031-03-14"})
+    assert report["summary"]["accuracy"]["payment_date"] == 1.0
+
+    report = _evaluate({"payment_date": "--03-14"}, {"payment_date": "2031-03-15"})
+    assert report["summary"]["accuracy"]["payment_date"] == 0.0
+
+
+def test_null_label_expects_empty_field():
+    report = _evaluate({"payment_method": None}, {"payment_method": "Cash"})
+    assert report["cases"][0]["fields"]["payment_method"]["correct"] is False
+
+    report = _evaluate({"payment_method": None}, {"payment_method": None})
+    assert report["summary"]["accuracy"]["payment_method"] == 1.0
+    assert report["summary"]["accuracy"]["payment_status"] is None
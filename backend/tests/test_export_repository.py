@@ -0,0 +1,70 @@
+# tests/test_export_repository.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from models.entities.base import Base
+from models.entities.call import Call
+from models.entities.insight import Insight
+from models.entities.transcript import Transcript
+from models.enums import CallStatus, PaymentCurrency, PaymentStatus, TranscriptStatus
+from repositories import export_repository
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def watermark(db):
+    now = datetime.now(timezone.utc)
+    call = Call(call_status=CallStatus.PROCESSING)
+    db.add(call)
+    db.flush()
+    transcript = Transcript(call_id=call.id, file_name="call.txt", transcript_text="Agent: Hello.",
+                            file_content="Agent: Hello.", transcript_status=TranscriptStatus.PROCESSED,
+                            uploaded_at=now - timedelta(hours=1))
+    db.add(transcript)
+    db.flush()
+    db.add(Insight(transcript_id=transcript.id, payment_status=PaymentStatus.PENDING,
+                   payment_currency=PaymentCurrency.USD, ai_summary="Pending."))
+    db.commit()
+
+    # Backdate the rows so the watermark falls after their last change
+    for entity in (Call, Transcript, Insight):
+        db.query(entity).update({entity.updated_at: now - timedelta(hours=1)}, synchronize_session=False)
+    db.commit()
+    return now - timedelta(minutes=1)
+
+
+def _exported(db, since):
+    return [row for batch in export_repository.stream_rows(db, since) for row in batch]
+
+
+def test_unchanged_rows_are_not_exported(db, watermark):
+    assert _exported(db, watermark) == []
+
+
+def test_call_status_change_is_exported(db, watermark):
+    db.query(Call).one().call_status = CallStatus.PROCESSED
+    db.commit()
+    assert [row["call_status"] for row in _exported(db, watermark)] == [CallStatus.PROCESSED]
+
+
+def test_failed_transcript_without_processed_at_is_exported(db, watermark):
+    db.query(Transcript).one().transcript_status = TranscriptStatus.FAILED
+    db.commit()
+    assert [row["transcript_status"] for row in _exported(db, watermark)] == [TranscriptStatus.FAILED]
+
+
+def test_insight_field_edit_is_exported(db, watermark):
+    db.query(Insight).one().payment_status = PaymentStatus.COMMITTED
+    db.commit()
+    assert [row["payment_status"] for row in _exported(db, watermark)] == [PaymentStatus.COMMITTED]
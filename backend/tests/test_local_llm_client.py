@@ -0,0 +1,19 @@
+# tests/test_local_llm_client.py
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_local_client_imports_first_with_local_provider():
+    # Run in a fresh interpreter: the provider is chosen from the environment at import time
+    result = subprocess.run(
+        [sys.executable, "-c", "from clients.local_llm_client import LocalLLMClient\n"
+                               "from clients import llm_client\n"
+                               "print(llm_client.get_health()['provider'])"],
+        cwd=BACKEND_DIR, env={**os.environ, "LLM": "local"}, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "local"
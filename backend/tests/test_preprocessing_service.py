@@ -0,0 +1,58 @@
+# tests/test_preprocessing_service.py
+
+from services import preprocessing_service
+
+
+def test_disfluencies_keep_large_amounts():
+    text = "Customer: I can pay 1,000,000 rupees by Friday."
+    assert "1,000,000 rupees" in preprocessing_service.remove_disfluencies(text)
+
+
+def test_disfluencies_keep_amounts_with_repeated_groups():
+    text = "Customer: The balance is $1,500,500 and I paid 200, 200 last week."
+    cleaned = preprocessing_service.remove_disfluencies(text)
+    assert "$1,500,500" in cleaned
+    assert "200, 200" in cleaned
+
+
+def test_disfluencies_keep_card_digits():
+    text = "Customer: It's the card ending 4 4 5 6."
+    assert "4 4 5 6" in preprocessing_service.remove_disfluencies(text)
+
+
+def test_disfluencies_keep_phrases_like_you_know():
+    text = "Agent: Do you know your balance is 200?"
+    assert preprocessing_service.remove_disfluencies(text) == text
+
+
+def test_disfluencies_collapse_stutters_and_fillers():
+    text = "Customer: Um, I I think, uh, the the payment went through."
+    assert preprocessing_service.remove_disfluencies(text) == "Customer: I think, the payment went through."
+
+
+def test_disfluencies_keep_words_joined_by_commas():
+    text = "Customer: No, no, I already paid."
+    assert preprocessing_service.remove_disfluencies(text) == text
+
+
+def test_chunk_turns_splits_on_turn_boundaries():
+    turns = preprocessing_service.parse_turns("\n".join(
+        f"{'Agent' if index % 2 else 'Customer'}: Turn number {index} about the balance." for index in range(20)
+    ))
+    chunks = preprocessing_service.chunk_turns(turns, max_tokens=40)
+
+    assert len(chunks) > 1
+    assert [turn for chunk in chunks for turn in chunk] == turns
+    for chunk in chunks:
+        assert len(chunk) == 1 or preprocessing_service.count_tokens(preprocessing_service.render_turns(chunk)) <= 40
+
+
+def test_chunk_turns_keeps_an_oversized_turn_whole():
+    turns = preprocessing_service.parse_turns("Agent: Hello.\nCustomer: " + "I will pay next week. " * 50)
+    chunks = preprocessing_service.chunk_turns(turns, max_tokens=20)
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+
+
+def test_split_prompt_leaves_short_prompts_whole():
+    text = "Agent: Hello.\nCustomer: I paid yesterday."
+    assert preprocessing_service.split_prompt(text, max_tokens=1000) == [text]
@@ -0,0 +1,44 @@
+# tests/test_search_repository.py
+
+import pytest
+from repositories import search_repository
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    if search_repository.init_index(engine) != "fts5":
+        pytest.skip("SQLite was built without FTS5")
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _fields(text_value):
+    return {"transcript_text": text_value, "ai_summary": None, "refined_summary": None, "user_summary": None}
+
+
+def test_upsert_replaces_document_under_its_rowid(db):
+    search_repository.upsert(db, "t1", "c1", _fields("wire transfer tomorrow"))
+    search_repository.upsert(db, "t2", "c2", _fields("card payment"))
+    rowid = db.execute(text("SELECT rowid FROM transcript_search WHERE transcript_id = 't1'")).scalar()
+
+    search_repository.upsert(db, "t1", "c1", _fields("cash payment"))
+    db.commit()
+
+    assert db.execute(text("SELECT COUNT(*) FROM transcript_search")).scalar() == 2
+    assert db.execute(text("SELECT rowid FROM transcript_search WHERE transcript_id = 't1'")).scalar() == rowid
+    total, results = search_repository.search(db, "payment", limit=10, offset=0)
+    assert total == 2
+    assert search_repository.search(db, "wire", limit=10, offset=0)[0] == 0
+
+
+def test_delete_removes_document_and_mapping(db):
+    search_repository.upsert(db, "t1", "c1", _fields("wire transfer"))
+    search_repository.delete(db, "t1")
+    db.commit()
+
+    assert search_repository.is_empty(db)
+    assert db.execute(text("SELECT COUNT(*) FROM transcript_search_rowid")).scalar() == 0
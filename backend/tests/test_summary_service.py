@@ -0,0 +1,50 @@
+# tests/test_summary_service.py
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from models.enums import CallStatus, PaymentCurrency, PaymentStatus, TranscriptStatus
+from services import summary_service
+
+
+def _call(**insight_fields):
+    now = datetime.now(timezone.utc)
+    insight = SimpleNamespace(**{
+        "payment_status": PaymentStatus.PENDING,
+        "payment_amount": Decimal("100.00"),
+        "payment_currency": PaymentCurrency.USD,
+        "payment_date": None,
+        "payment_method": None,
+        "comments": None,
+        "ai_summary": "Customer will pay next week.",
+        "user_summary": None,
+        "refined_summary": None,
+        "llm_refinement_count": 0,
+        "llm_refinement_required": False,
+        "version": 1,
+        **insight_fields,
+    })
+    transcript = SimpleNamespace(
+        id=uuid4(), file_name="call.txt", file_content="Agent: Hello.", uploaded_at=now, processed_at=now,
+        transcript_status=TranscriptStatus.PROCESSED, attempts=0, last_error=None, next_attempt_at=None,
+        original_token_count=10, prompt_token_count=8, insight=insight
+    )
+    return SimpleNamespace(
+        id=uuid4(), call_status=CallStatus.PROCESSED, raw_summary=None, ai_summary=None,
+        ai_summary_updated_at=None, llm_refinement_required=False, llm_refinement_count=0,
+        created_at=now, updated_at=now, transcripts=[transcript]
+    )
+
+
+def test_serialize_call_without_payment_method():
+    insight = summary_service.serialize_call(_call())["transcripts"][0]["insight"]
+    assert insight["payment_method"] is None
+    assert insight["payment_status"] == "Pending"
+
+
+def test_serialize_call_without_payment_enums():
+    insight = summary_service.serialize_call(_call(payment_status=None, payment_currency=None))["transcripts"][0]["insight"]
+    assert insight["payment_status"] is None
+    assert insight["payment_currency"] is None
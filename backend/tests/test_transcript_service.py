@@ -0,0 +1,31 @@
+# tests/test_transcript_service.py
+
+from clients.llm_client import CallExtractionResult, ExtractionResult
+from models.enums import ExtractionOutcome
+from services import transcript_service
+
+
+def _part(**data):
+    return ExtractionResult(ExtractionOutcome.SUCCESS, data={"ai_summary": "Part.", **data})
+
+
+def test_merge_part_extractions_keeps_the_settled_values():
+    result = CallExtractionResult([
+        _part(payment_status="pending", payment_amount=480.0, payment_currency="USD"),
+        _part(payment_status="committed", payment_method="Credit Card", payment_date="2025-03-14"),
+        _part(payment_status="pending", payment_amount=None),
+    ], call_summary="Customer committed to pay $480 by card.")
+
+    data = transcript_service.merge_part_extractions(result).data
+    assert data["payment_status"] == "committed"
+    assert data["payment_amount"] == 480.0
+    assert data["payment_method"] == "Credit Card"
+    assert data["payment_date"] == "2025-03-14"
+    assert data["ai_summary"] == "Customer committed to pay $480 by card."
+
+
+def test_merge_part_extractions_joins_part_summaries_without_call_summary():
+    result = CallExtractionResult([_part(payment_status="pending"), _part(ai_summary="Second.")])
+    data = transcript_service.merge_part_extractions(result).data
+    assert data["payment_status"] == "pending"
+    assert data["ai_summary"] == "Part. Second."
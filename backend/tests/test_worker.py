@@ -0,0 +1,56 @@
+# tests/test_worker.py
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so the worker's database is the temporary one
+SCRIPT = """
+import os, threading, uuid
+import worker
+from database import SessionLocal, init_database
+from models.entities.processing_job import ProcessingJob
+from models.enums import JobClass
+from repositories import processing_job_repository
+
+init_database()
+with SessionLocal() as db:
+    crashing = processing_job_repository.enqueue(db, uuid.uuid4(), JobClass.INTERACTIVE)
+    healthy = processing_job_repository.enqueue(db, uuid.uuid4(), JobClass.INTERACTIVE)
+    crashing_call_id = str(crashing.call_id)
+
+def run_job(call_id):
+    if call_id == crashing_call_id:
+        os._exit(1)
+    return 0.0
+
+worker._run_job = run_job
+instance = worker.Worker(1, [JobClass.INTERACTIVE])
+threading.Timer(3, instance.stop).start()
+instance.run()
+
+with SessionLocal() as db:
+    for job_id in (crashing.id, healthy.id):
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).one()
+        print(job.job_status.value, job.attempts)
+"""
+
+
+def test_worker_survives_a_dead_pool_process(tmp_path):
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'worker.db'}",
+        "WORKER_MAX_ATTEMPTS": "2",
+        "WORKER_POLL_INTERVAL_SECONDS": "0.2",
+        "WORKER_HEALTH_FILE": str(tmp_path / "health.json"),
+    }
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=str(tmp_path), env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    # The crashing job is requeued once, then failed when its attempts run out; the
+    # worker keeps going on a new pool and completes the next job
+    assert result.stdout.strip().splitlines()[-2:] == ["Failed 2", "Completed 1"]
@@ -0,0 +1,279 @@
+# worker.py
+"""
+Processing worker: consumes the processing_job queue (PROCESSING_MODE=worker) and
+runs call processing across a pool of processes, so pipeline throughput scales with
+cores instead of sharing the API's event loop.
+
+Run from the backend directory:
+    python worker.py [--processes N] [--per-core 1.0] [--classes interactive,backfill]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from clients.resilience import CircuitOpenError
+from config import loaded_config
+from database import SessionLocal, reset_engine_for_worker
+# Not used directly: Transcript (imported via the search index) relates to Call, and the mappers
+# cannot be configured for the first query unless Call is registered too
+from models.entities.call import Call
+from models.enums import JobClass
+from repositories import processing_job_repository
+from services import profile_service
+
+logger = logging.getLogger("worker")
+
+config = loaded_config
+
+
+# --- Pool process side ---
+def _init_pool_process():
+    # Only the parent reacts to signals; it drains the pool on shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    reset_engine_for_worker()
+
+
+def _run_job(call_id: str) -> float:
+    # Imported here so the parent process never initialises the LLM/embedding clients
+    from services import call_service, profile_service, usage_service
+
+    profile_service.reload_if_due()
+    started_at = time.monotonic()
+    try:
+        asyncio.run(call_service.setup_and_initiate_process_call(UUID(call_id)))
+    finally:
+        # Pool processes exit without running atexit, which would drop the buffered ledger entries
+        usage_service.flush_usage()
+    return time.monotonic() - started_at
+
+
+# --- Parent process side ---
+class Worker:
+    def __init__(self, processes: int, job_classes: List[JobClass]):
+        self.processes = processes
+        self.job_classes = job_classes
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.stopping = False
+        self.started_at = datetime.now(timezone.utc)
+        self.in_flight: Dict[Future, Tuple[UUID, JobClass]] = {}
+        self.virtual_time: Dict[JobClass, float] = {job_class: 0.0 for job_class in job_classes}
+        self.completed = 0
+        self.failed = 0
+        self.last_maintenance = 0.0
+        # Set when a pool process died; the pool is replaced before claiming more jobs
+        self.pool_broken = False
+
+    def stop(self, signum=None, frame=None):
+        if not self.stopping:
+            logger.info("Shutdown requested, finishing in-flight jobs...")
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        logger.info(f"Worker {self.worker_id} starting {self.processes} processes "
+                    f"for classes {[job_class.value for job_class in self.job_classes]}")
+
+        pool = self._start_pool()
+        try:
+            while not self.stopping:
+                self._reap(timeout=0)
+                if self.pool_broken:
+                    pool = self._restart_pool(pool)
+                claimed = self._fill(pool)
+                self._maintain()
+
+                if not claimed:
+                    # Wake early if a job finishes, otherwise poll the queue again
+                    self._reap(timeout=config.WORKER_POLL_INTERVAL_SECONDS)
+
+            while self.in_flight:
+                self._reap(timeout=config.WORKER_HEARTBEAT_SECONDS)
+                self._maintain(force=True)
+        finally:
+            pool.shutdown(wait=True)
+
+        self._write_health()
+        logger.info(f"Worker {self.worker_id} stopped ({self.completed} completed, {self.failed} failed)")
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.processes, initializer=_init_pool_process)
+
+    def _restart_pool(self, pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace a pool broken by a dead process, putting its in-flight jobs back on the queue."""
+        logger.warning("A pool process died, restarting the process pool")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        # A broken pool fails all of its futures; reaping requeues them
+        wait(list(self.in_flight), timeout=config.WORKER_HEARTBEAT_SECONDS)
+        self._reap(timeout=0)
+        if self.in_flight:
+            with SessionLocal() as db:
+                processing_job_repository.requeue(
+                    db, [job_id for job_id, _ in self.in_flight.values()], config.WORKER_MAX_ATTEMPTS,
+                    "Worker process pool restarted"
+                )
+            self.in_flight.clear()
+
+        self.pool_broken = False
+        return self._start_pool()
+
+    def _class_capacity(self, job_class: JobClass) -> int:
+        # Class caps are defined for JOB_MAX_CONCURRENCY slots; scale them to this pool
+        settings = config.JOB_CLASS_SETTINGS[job_class.value]
+        share = settings["max_concurrency"] / max(config.JOB_MAX_CONCURRENCY, 1)
+        return max(1, math.ceil(share * self.processes))
+
+    def _fill(self, pool: ProcessPoolExecutor) -> int:
+        """Claim jobs in weighted-fair order until the pool is full or the queue is empty."""
+        claimed = 0
+        exhausted = set()
+
+        with SessionLocal() as db:
+            while len(self.in_flight) < self.processes:
+                running = {job_class: 0 for job_class in self.job_classes}
+                for _, job_class in self.in_flight.values():
+                    running[job_class] += 1
+
+                candidates = [
+                    job_class for job_class in self.job_classes
+                    if job_class not in exhausted and running[job_class] < self._class_capacity(job_class)
+                ]
+                if not candidates:
+                    break
+
+                job_class = min(candidates, key=lambda candidate: self.virtual_time[candidate])
+                job = processing_job_repository.claim_next(db, job_class, self.worker_id)
+                if not job:
+                    exhausted.add(job_class)
+                    continue
+
+                try:
+                    future = pool.submit(_run_job, str(job.call_id))
+                except BrokenProcessPool:
+                    # The job never started, so its attempt is not counted
+                    processing_job_repository.park(db, job.id, 0, "Worker process pool broken")
+                    self.pool_broken = True
+                    break
+
+                weight = config.JOB_CLASS_SETTINGS[job_class.value]["weight"]
+                self.virtual_time[job_class] += 1.0 / weight
+                self.in_flight[future] = (job.id, job_class)
+                claimed += 1
+
+        return claimed
+
+    def _reap(self, timeout: float):
+        if not self.in_flight:
+            if timeout:
+                time.sleep(timeout)
+            return
+
+        done, _ = wait(list(self.in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            return
+
+        with SessionLocal() as db:
+            for future in done:
+                job_id, job_class = self.in_flight.pop(future)
+                try:
+                    elapsed = future.result()
+                    processing_job_repository.mark_completed(db, job_id)
+                    self.completed += 1
+                    logger.info(f"Job {job_id} ({job_class.value}) completed in {elapsed:.1f}s")
+                except CircuitOpenError as e:
+                    processing_job_repository.park(db, job_id, e.retry_after, str(e))
+                    logger.warning(f"Job {job_id} ({job_class.value}) parked: {str(e)}")
+                except BrokenProcessPool:
+                    # The process running it (or another one) died; run it again on a new pool
+                    processing_job_repository.requeue(db, [job_id], config.WORKER_MAX_ATTEMPTS,
+                                                      "Worker process died")
+                    self.pool_broken = True
+                    logger.warning(f"Job {job_id} ({job_class.value}) requeued: its worker process died")
+                except Exception as e:
+                    processing_job_repository.mark_failed(db, job_id, str(e))
+                    self.failed += 1
+                    logger.error(f"Job {job_id} ({job_class.value}) failed: {str(e)}")
+
+    def _maintain(self, force: bool = False):
+        """Heartbeat running jobs, recover jobs from dead workers, publish health and reload the profile."""
+        if not force and time.monotonic() - self.last_maintenance < config.WORKER_HEARTBEAT_SECONDS:
+            return
+        self.last_maintenance = time.monotonic()
+        profile_service.reload_if_due()
+
+        try:
+            with SessionLocal() as db:
+                processing_job_repository.heartbeat(db, [job_id for job_id, _ in self.in_flight.values()])
+                requeued = processing_job_repository.requeue_stale(
+                    db,
+                    datetime.now(timezone.utc) - timedelta(seconds=config.WORKER_STALE_AFTER_SECONDS),
+                    config.WORKER_MAX_ATTEMPTS
+                )
+                if requeued:
+                    logger.warning(f"Requeued {requeued} jobs from unresponsive workers")
+        except Exception as e:
+            logger.error(f"Worker maintenance failed: {str(e)}")
+
+        self._write_health()
+
+    def _write_health(self):
+        health = {
+            "worker_id": self.worker_id,
+            "status": "stopping" if self.stopping else "running",
+            "processes": self.processes,
+            "in_flight": len(self.in_flight),
+            "in_flight_by_class": {
+                job_class.value: sum(1 for _, running_class in self.in_flight.values() if running_class == job_class)
+                for job_class in self.job_classes
+            },
+            "completed": self.completed,
+            "failed": self.failed,
+            "started_at": self.started_at.isoformat(),
+            "heartbeat_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        try:
+            temp_path = config.WORKER_HEALTH_FILE + ".tmp"
+            with open(temp_path, "w") as health_file:
+                json.dump(health, health_file)
+            os.replace(temp_path, config.WORKER_HEALTH_FILE)
+        except OSError as e:
+            logger.error(f"Could not write worker health file: {str(e)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the call processing worker pool.")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Number of worker processes (default: cores x --per-core)")
+    parser.add_argument("--per-core", type=float, default=config.WORKER_PROCESSES_PER_CORE,
+                        help="Worker processes per CPU core when --processes is not given")
+    parser.add_argument("--classes", default=",".join(job_class.value for job_class in JobClass),
+                        help="Comma-separated job classes to consume")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    processes = args.processes or max(1, int((os.cpu_count() or 1) * args.per_core))
+    job_classes = [JobClass(value.strip()) for value in args.classes.split(",") if value.strip()]
+
+    Worker(processes, job_classes).run()
+
+
+if __name__ == "__main__":
+    main()